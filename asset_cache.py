@@ -0,0 +1,107 @@
+import settings as stgs
+
+import hashlib
+import os
+import struct
+import pygame as pg
+from typing import Final
+
+
+CACHE_PATH: Final[str] = ".asset_cache/"
+CACHE_MAGIC: Final[bytes] = b"SPSHIP01"
+CACHE_HEADER: Final[struct.Struct] = struct.Struct("<8sII")  # magic, width, height
+
+
+def cache_prefix(file_path: str, scale_factor: float) -> str:
+    """
+    Returns the part of the cache file name that only depends on the image path and the scale factor.
+    Args:
+    file_path (str): The path to the source image.
+    scale_factor (float): The factor by which the image is scaled.
+    Returns:
+    str: The cache file prefix.
+    """
+    return hashlib.sha1(f"{os.path.normpath(file_path)}|{scale_factor!r}".encode("utf-8")).hexdigest()[:16]
+
+def cache_file_name(file_path: str, scale_factor: float) -> str:
+    """
+    Returns the cache file name for an image, keyed by path, scale factor, mtime and size of the source.
+    Args:
+    file_path (str): The path to the source image.
+    scale_factor (float): The factor by which the image is scaled.
+    Returns:
+    str: The path to the cache file.
+    """
+    stat = os.stat(file_path)
+    source_hash = hashlib.sha1(f"{stat.st_mtime_ns}|{stat.st_size}".encode("utf-8")).hexdigest()[:16]
+    return CACHE_PATH + cache_prefix(file_path, scale_factor) + "-" + source_hash + ".raw"
+
+def is_cached(file_path: str, scale_factor: float) -> bool:
+    """
+    Checks if there is an up to date cache entry for an image.
+    Args:
+    file_path (str): The path to the source image.
+    scale_factor (float): The factor by which the image is scaled.
+    Returns:
+    bool: Whether the image is cached.
+    """
+    try:
+        return stgs.ASSET_CACHE and os.path.exists(cache_file_name(file_path, scale_factor))
+    except OSError:  # no source image
+        return False
+
+def read_cached_image(file_path: str, scale_factor: float, convert: bool = True) -> pg.Surface | None:
+    """
+    Reads the cached raw RGBA pixels of a scaled image into one buffer and turns them into a surface.
+    Args:
+    file_path (str): The path to the source image.
+    scale_factor (float): The factor by which the image is scaled.
+    convert (bool): Whether to convert the surface to the display format. Defaults to True.
+    Returns:
+    pg.Surface | None: The cached image (without convert it shares the pixels with the read buffer), or None if there is no valid cache entry.
+    """
+    if not stgs.ASSET_CACHE:
+        return None
+    try:
+        with open(cache_file_name(file_path, scale_factor), "rb") as file:
+            data = bytearray(os.fstat(file.fileno()).st_size)
+            if file.readinto(data) != len(data) or len(data) < CACHE_HEADER.size:
+                return None
+        magic, width, height = CACHE_HEADER.unpack_from(data)
+        if magic != CACHE_MAGIC or len(data) != CACHE_HEADER.size + width * height * 4:
+            return None
+        img: pg.Surface = pg.image.frombuffer(memoryview(data)[CACHE_HEADER.size:], (width, height), "RGBA")
+    except (OSError, ValueError, struct.error):  # no entry, or a broken one, e.g. after a crash or a full disk
+        return None
+    return img.convert_alpha() if convert else img
+
+def write_cached_image(file_path: str, scale_factor: float, img: pg.Surface) -> None:
+    """
+    Writes the raw RGBA pixels of a scaled image to the cache and removes outdated entries of the same image.
+    Args:
+    file_path (str): The path to the source image.
+    scale_factor (float): The factor by which the image is scaled.
+    img (pg.Surface): The scaled image.
+    """
+    if not stgs.ASSET_CACHE:
+        return
+    cache_file = cache_file_name(file_path, scale_factor)
+    prefix = cache_prefix(file_path, scale_factor)
+    try:
+        os.makedirs(CACHE_PATH, exist_ok=True)
+        for old_file in os.listdir(CACHE_PATH):
+            if old_file.startswith(prefix) and CACHE_PATH + old_file != cache_file:
+                os.remove(CACHE_PATH + old_file)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "wb") as file:
+            file.write(CACHE_HEADER.pack(CACHE_MAGIC, img.get_width(), img.get_height()))
+            file.write(pg.image.tobytes(img, "RGBA"))
+        os.replace(temp_file, cache_file)  # atomic, so a crashed write never leaves a half entry
+    except OSError:
+        pass  # the cache is only an optimization, the game runs without it
+
+def clear_cache() -> None:
+    """ Removes every file from the asset cache. """
+    if os.path.isdir(CACHE_PATH):
+        for file_name in os.listdir(CACHE_PATH):
+            os.remove(CACHE_PATH + file_name)
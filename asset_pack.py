@@ -0,0 +1,186 @@
+"""
+Builds the release asset pack from settings.ASSETS and reads it at runtime.
+main.spec builds the pack when the game is frozen and the pack is missing or outdated,
+to build it by hand run it from the repository root:  python asset_pack.py
+The frames are stored uncropped, the sprites position and collide by the frame size.
+"""
+import settings as stgs
+from utils import decode_image
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import sys
+import zlib
+import pygame as pg
+from typing import Final
+
+
+PACK_MAGIC: Final[bytes] = b"SPPACK01"
+PACK_VERSION: Final[int] = 2
+
+
+def resource_path(file_name: str) -> str:
+    """
+    Returns the path of a bundled file, inside of a frozen build it is in the unpack directory.
+    Args:
+    file_name (str): The file name.
+    Returns:
+    str: The path to the file.
+    """
+    return os.path.join(getattr(sys, "_MEIPASS", ""), file_name)
+
+def source_stamp(file_path: str) -> list[str | int]:
+    """
+    Returns the path, mtime and size of a source image, used to detect an outdated pack.
+    Args:
+    file_path (str): The path to the source image.
+    Returns:
+    list[str | int]: The path, the mtime in ns and the size.
+    """
+    stat = os.stat(file_path)
+    return [file_path, stat.st_mtime_ns, stat.st_size]
+
+def build_pack(manifest: dict[str, dict], pack_path: str = stgs.ASSET_PACK, manifest_path: str = stgs.ASSET_PACK_MANIFEST) -> dict:
+    """
+    Writes the scaled and deduplicated frames of every manifest entry into one pack file
+    and the index of the pack into a json manifest.
+    Args:
+    manifest (dict[str, dict]): The asset manifest, see settings.ASSETS.
+    pack_path (str): The path of the pack file.
+    manifest_path (str): The path of the json manifest.
+    Returns:
+    dict: The json manifest.
+    """
+    from assets import manifest_files  # assets imports this module
+
+    pack_manifest: dict = {"version": PACK_VERSION, "pack": os.path.basename(pack_path), "assets": {}, "blobs": []}
+    blob_numbers: dict[bytes, int] = {}
+    with open(pack_path, "wb") as pack:
+        pack.write(PACK_MAGIC)
+        for key, entry in manifest.items():
+            frames: list[int] = []
+            sources: list[list[str | int]] = []
+            for file_path in manifest_files(entry):
+                img: pg.Surface = decode_image(file_path, entry["scale"])
+                pixels: bytes = pg.image.tobytes(img, "RGBA")
+                digest: bytes = hashlib.sha1(repr(img.get_size()).encode("utf-8") + pixels).digest()
+                if digest not in blob_numbers:
+                    data: bytes = zlib.compress(pixels, 6)
+                    blob_numbers[digest] = len(pack_manifest["blobs"])
+                    pack_manifest["blobs"].append({"offset": pack.tell(), "length": len(data), "size": list(img.get_size())})
+                    pack.write(data)
+                frames.append(blob_numbers[digest])
+                sources.append(source_stamp(file_path))
+            pack_manifest["assets"][key] = {"path": entry["path"], "file": entry.get("file"), "scale": entry["scale"], "frames": frames, "sources": sources}
+    with open(manifest_path, "w", encoding="utf-8") as file:
+        json.dump(pack_manifest, file, indent=1)
+    return pack_manifest
+
+
+class AssetPack:
+    def __init__(self, manifest_path: str) -> None:
+        """
+        Opens an asset pack for reading, the pack file is memory-mapped.
+        Args:
+        manifest_path (str): The path of the json manifest of the pack.
+        """
+        with open(manifest_path, "r", encoding="utf-8") as file:
+            self.manifest: dict = json.load(file)
+        self.file = open(os.path.join(os.path.dirname(manifest_path), self.manifest["pack"]), "rb")
+        self.data: mmap.mmap = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.manifest["version"] != PACK_VERSION or self.data[:len(PACK_MAGIC)] != PACK_MAGIC:
+            raise ValueError(f"{manifest_path} is not a version {PACK_VERSION} asset pack")
+
+    def matches(self, key: str, entry: dict) -> bool:
+        """
+        Checks if the pack holds an up to date version of a manifest entry.
+        Sources that don't exist (e.g. in a frozen build) count as up to date.
+        Args:
+        key (str): The asset key.
+        entry (dict): The manifest entry.
+        Returns:
+        bool: Whether the entry can be loaded from the pack.
+        """
+        packed: dict | None = self.manifest["assets"].get(key)
+        if packed is None or (packed["path"], packed["file"], packed["scale"]) != (entry["path"], entry.get("file"), entry["scale"]):
+            return False
+        return all(not os.path.exists(file_path) or source_stamp(file_path) == [file_path, mtime, size]
+                   for file_path, mtime, size in packed["sources"])
+
+    def decode(self, key: str) -> list[pg.Surface]:
+        """
+        Decompresses the frames of a key, without converting them, so it can run on a worker thread.
+        Args:
+        key (str): The asset key.
+        Returns:
+        list[pg.Surface]: The frames, they share the pixels with the decompressed data, so they are converted (copied) before anything is drawn on them.
+        """
+        images: list[pg.Surface] = []
+        for blob_number in self.manifest["assets"][key]["frames"]:
+            blob: dict = self.manifest["blobs"][blob_number]
+            pixels: bytes = zlib.decompress(self.data[blob["offset"]:blob["offset"] + blob["length"]])
+            images.append(pg.image.frombuffer(pixels, blob["size"], "RGBA"))
+        return images
+
+    def close(self) -> None:
+        """ Unmaps and closes the pack file. """
+        self.data.close()
+        self.file.close()
+
+
+def open_asset_pack(manifest_path: str = stgs.ASSET_PACK_MANIFEST) -> AssetPack | None:
+    """
+    Opens the asset pack, if there is one.
+    Args:
+    manifest_path (str): The path of the json manifest of the pack.
+    Returns:
+    AssetPack | None: The asset pack, or None if there is no usable pack.
+    """
+    try:
+        return AssetPack(resource_path(manifest_path))
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def pack_is_current(manifest: dict[str, dict], manifest_path: str = stgs.ASSET_PACK_MANIFEST) -> bool:
+    """
+    Checks if the asset pack holds every manifest entry with the current source images (the same files, mtimes and sizes),
+    so it doesn't have to be built again.
+    Args:
+    manifest (dict[str, dict]): The asset manifest, see settings.ASSETS.
+    manifest_path (str): The path of the json manifest of the pack.
+    Returns:
+    bool: Whether the pack is up to date.
+    """
+    from assets import manifest_files  # assets imports this module
+
+    try:
+        pack = AssetPack(manifest_path)
+    except (OSError, ValueError, KeyError):
+        return False
+    try:
+        return all(key in pack.manifest["assets"]
+                   and [file_path for file_path, _, _ in pack.manifest["assets"][key]["sources"]] == manifest_files(entry)
+                   and pack.matches(key, entry) for key, entry in manifest.items())
+    finally:
+        pack.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Builds the release asset pack from settings.ASSETS.")
+    parser.add_argument("--pack", default=stgs.ASSET_PACK, help="the pack file to write")
+    parser.add_argument("--manifest", default=stgs.ASSET_PACK_MANIFEST, help="the json manifest to write")
+    args = parser.parse_args()
+
+    pack_manifest = build_pack(stgs.ASSETS, args.pack, args.manifest)
+    frame_count = sum(len(asset["frames"]) for asset in pack_manifest["assets"].values())
+    raw_size = sum(blob["size"][0] * blob["size"][1] * 4 for blob in pack_manifest["blobs"])
+    print(f"{len(pack_manifest['assets'])} assets, {frame_count} frames, {len(pack_manifest['blobs'])} unique frames")
+    print(f"{args.pack}: {os.path.getsize(args.pack) / 2 ** 20:.1f} MB (scaled raw pixels {raw_size / 2 ** 20:.1f} MB)")
+
+
+if __name__ == "__main__":
+    main()
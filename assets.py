@@ -0,0 +1,365 @@
+import settings as stgs
+from utils import BASE_PATH, Animation, decode_image
+from atlas import AtlasAnimation, build_atlas_animations
+from asset_pack import AssetPack, open_asset_pack
+from asset_cache import is_cached
+from startup_profile import profiler
+
+import os
+import pygame as pg
+from concurrent.futures import Future, ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Iterable
+
+
+asset_pack: AssetPack | None = open_asset_pack()
+
+
+def manifest_files(entry: dict) -> list[str]:
+    """
+    Returns the image files of a manifest entry, in the order the asset uses them.
+    Args:
+    entry (dict): The manifest entry.
+    Returns:
+    list[str]: The paths to the image files.
+    """
+    if "file" in entry:
+        return [BASE_PATH + entry["path"] + "/" + entry["file"]]
+    return [BASE_PATH + entry["path"] + "/" + img_name for img_name in sorted(os.listdir(BASE_PATH + entry["path"]))]  # sorted because of not Windows systems
+
+def decode_entry(entry: dict) -> list[pg.Surface]:
+    """
+    Decodes and scales the images of a manifest entry without converting them, so it can run on a worker thread.
+    Args:
+    entry (dict): The manifest entry.
+    Returns:
+    list[pg.Surface]: The decoded images.
+    """
+    return [decode_image(file_path, entry["scale"]) for file_path in manifest_files(entry)]
+
+def use_asset_pack(key: str, entry: dict) -> bool:
+    """
+    Checks if an asset should be loaded from the asset pack. That is the case if the pack holds an up to date
+    version of it and the images aren't in the (even faster) disk cache already.
+    Args:
+    key (str): The asset key.
+    entry (dict): The manifest entry.
+    Returns:
+    bool: Whether to load the asset from the pack.
+    """
+    if asset_pack is None or not asset_pack.matches(key, entry):
+        return False
+    try:
+        return not all(is_cached(file_path, entry["scale"]) for file_path in manifest_files(entry))
+    except OSError:  # no images directory, e.g. in a frozen build
+        return True
+
+def decode_asset(key: str, entry: dict) -> list[pg.Surface]:
+    """
+    Decodes the images of an asset from the asset pack if it should be used (see use_asset_pack),
+    otherwise from the images directory. Runs on worker threads.
+    Args:
+    key (str): The asset key.
+    entry (dict): The manifest entry.
+    Returns:
+    list[pg.Surface]: The decoded images.
+    """
+    if use_asset_pack(key, entry):
+        return asset_pack.decode(key)
+    return decode_entry(entry)
+
+def asset_bytes(asset: pg.Surface | list[pg.Surface] | Animation) -> int:
+    """
+    Returns the pixel memory of an asset.
+    Args:
+    asset (pg.Surface | list[pg.Surface] | Animation): The asset.
+    Returns:
+    int: The size of the pixels in bytes.
+    """
+    return sum(img.get_bytesize() * img.get_width() * img.get_height() for img in asset_images(asset))
+
+def asset_images(asset: pg.Surface | list[pg.Surface] | Animation) -> list[pg.Surface]:
+    """
+    Returns the images of an asset.
+    Args:
+    asset (pg.Surface | list[pg.Surface] | Animation): The asset.
+    Returns:
+    list[pg.Surface]: The single image, the images of the list or the frames of the animation.
+    """
+    return asset.img_list if isinstance(asset, Animation) else asset if isinstance(asset, list) else [asset]
+
+def build_asset(entry: dict, images: list[pg.Surface]) -> pg.Surface | list[pg.Surface] | Animation:
+    """
+    Turns the loaded images of a manifest entry into the asset the game expects.
+    Args:
+    entry (dict): The manifest entry.
+    images (list[pg.Surface]): The converted images of the entry.
+    Returns:
+    pg.Surface | list[pg.Surface] | Animation: A single image, a list of images or an animation.
+    """
+    if "file" in entry:
+        return images[0]
+    if "animation" in entry:
+        animation_duration, loop = entry["animation"]
+        return Animation(images, animation_duration=animation_duration, loop=loop)
+    return images
+
+def build_assets(manifest: dict[str, dict], images: dict[str, list[pg.Surface]], sheet_size: int = stgs.ATLAS_SHEET_SIZE) -> dict:
+    """
+    Turns the loaded images of several manifest entries into assets,
+    the frames of all their animations are packed into shared atlas sheets.
+    Args:
+    manifest (dict[str, dict]): The manifest entries.
+    images (dict[str, list[pg.Surface]]): The converted images of every entry.
+    sheet_size (int): The maximum width and height of an atlas sheet. Defaults to ATLAS_SHEET_SIZE.
+    Returns:
+    dict: The assets by their key.
+    """
+    assets: dict = {key: build_asset(entry, images[key]) for key, entry in manifest.items() if not (stgs.ATLAS and "animation" in entry)}
+    if stgs.ATLAS:
+        assets.update(build_atlas_animations({key: (images[key], *entry["animation"]) for key, entry in manifest.items() if "animation" in entry},
+                                             sheet_size))
+    return {key: assets[key] for key in manifest}
+
+def prepare_group(manifest: dict[str, dict]) -> dict:
+    """
+    Decodes the keys of a lazy group and builds their assets without touching the display: the frames of all
+    animations of the group are packed into shared sheets and their masks are created. Runs on a worker thread,
+    the images and sheets still have to be converted to the display format, see convert_asset.
+    Args:
+    manifest (dict[str, dict]): The manifest entries of the group.
+    Returns:
+    dict: The unconverted assets by their key.
+    """
+    images: dict[str, list[pg.Surface]] = {key: decode_asset(key, entry) for key, entry in manifest.items()}
+    return build_assets(manifest, images, stgs.ATLAS_LAZY_SHEET_SIZE)
+
+def asset_sheets(asset: pg.Surface | list[pg.Surface] | Animation) -> list[pg.Surface]:
+    """
+    Returns the surfaces of an asset that have to be converted to the display format: the sheets of an atlas animation, otherwise its images.
+    Args:
+    asset (pg.Surface | list[pg.Surface] | Animation): The asset.
+    Returns:
+    list[pg.Surface]: The surfaces, every one only once.
+    """
+    if isinstance(asset, AtlasAnimation):
+        return list(dict.fromkeys(sheet for sheet, _ in asset.sources))
+    return asset_images(asset)
+
+def convert_asset(asset: pg.Surface | list[pg.Surface] | Animation, converted: dict[pg.Surface, pg.Surface]) -> pg.Surface | list[pg.Surface] | Animation:
+    """
+    Puts an asset built by prepare_group onto its converted surfaces, the masks of its animation are kept.
+    Args:
+    asset (pg.Surface | list[pg.Surface] | Animation): The unconverted asset.
+    converted (dict[pg.Surface, pg.Surface]): The converted surface of every surface of asset_sheets.
+    Returns:
+    pg.Surface | list[pg.Surface] | Animation: The converted asset.
+    """
+    if isinstance(asset, AtlasAnimation):
+        return asset.with_sheets(converted)
+    if isinstance(asset, Animation):
+        return Animation([converted[img] for img in asset.img_list], asset.anim_dur, asset.loop, asset.mask_list)
+    if isinstance(asset, list):
+        return [converted[img] for img in asset]
+    return converted[asset]
+
+def decode_job(job: tuple[str, str | None, float]) -> list[pg.Surface]:
+    """
+    Decodes one job of the batch loader: a single image or, if there is no file path, a whole key from the asset pack.
+    Args:
+    job (tuple[str, str | None, float]): The asset key, the image path and the scale factor.
+    Returns:
+    list[pg.Surface]: The decoded images.
+    """
+    key, file_path, scale_factor = job
+    with profiler.phase(f"asset {key}", "asset"):
+        return asset_pack.decode(key) if file_path is None else [decode_image(file_path, scale_factor)]
+
+def convert_decoded(manifest: dict[str, dict], jobs: list[tuple[str, str | None]], decoded: Iterable[list[pg.Surface]]) -> dict[str, list[pg.Surface]]:
+    """
+    Converts the decoded images of the jobs to the display format, on the calling (main) thread.
+    Args:
+    manifest (dict[str, dict]): The asset manifest.
+    jobs (list[tuple[str, str | None]]): The asset key and the image path (None for a whole key from the asset pack) of every job.
+    decoded (Iterable[list[pg.Surface]]): The decoded images of every job, in the order of the jobs.
+    Returns:
+    dict[str, list[pg.Surface]]: The converted images of every key.
+    """
+    images: dict[str, list[pg.Surface]] = {key: [] for key in manifest}
+    for (key, _), imgs in zip(jobs, decoded):
+        with profiler.phase(f"asset {key}", "asset"):
+            images[key] += [img.convert_alpha() for img in imgs]
+    return images
+
+def load_assets(manifest: dict[str, dict], workers: int | None = stgs.ASSET_LOADER_WORKERS) -> dict:
+    """
+    Decodes and scales every image of the manifest on a thread pool (a whole key per job if it comes from the asset pack)
+    and converts the results to the display format on the calling (main) thread.
+    With one worker or one cpu the images are decoded on the calling thread, a pool would only add overhead.
+    Args:
+    manifest (dict[str, dict]): The asset manifest, see settings.ASSETS.
+    workers (int | None): The number of worker threads, None lets the pool decide.
+    Returns:
+    dict: The assets by their key.
+    """
+    packed_keys: set[str] = {key for key, entry in manifest.items() if use_asset_pack(key, entry)}
+    jobs: list[tuple[str, str | None]] = [(key, None) for key in packed_keys]
+    jobs += [(key, file_path) for key, entry in manifest.items() if key not in packed_keys for file_path in manifest_files(entry)]
+    job_args: list[tuple[str, str | None, float]] = [(key, file_path, manifest[key]["scale"]) for key, file_path in jobs]
+    if workers == 1 or (os.cpu_count() or 1) == 1:
+        images = convert_decoded(manifest, jobs, map(decode_job, job_args))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            images = convert_decoded(manifest, jobs, pool.map(decode_job, job_args))
+    with profiler.phase("atlas packing"):
+        return build_assets(manifest, images)
+
+def load_assets_sequential(manifest: dict[str, dict]) -> dict:
+    """
+    Loads the manifest one image at a time on the calling thread, like the game did before the batch loader.
+    Args:
+    manifest (dict[str, dict]): The asset manifest, see settings.ASSETS.
+    Returns:
+    dict: The assets by their key.
+    """
+    return {key: build_asset(entry, [decode_image(file_path, entry["scale"]).convert_alpha() for file_path in manifest_files(entry)])
+            for key, entry in manifest.items()}
+
+
+class AssetRegistry:
+    def __init__(self, manifest: dict[str, dict], lazy_groups: set[str], workers: int | None = stgs.ASSET_LOADER_WORKERS) -> None:
+        """
+        Holds the game assets. Every key outside of the lazy groups is loaded right away,
+        a lazy group (the part of the key before the '/', e.g. 'boss1') is loaded as a whole when it is prefetched or used
+        and can be released again. A worker thread decodes the group and packs its animations into shared sheets,
+        the main thread converts the sheets within a time budget per frame.
+        Args:
+        manifest (dict[str, dict]): The asset manifest, see settings.ASSETS.
+        lazy_groups (set[str]): The groups that are loaded on demand.
+        workers (int | None): The number of worker threads for the start, None lets the pool decide.
+        """
+        self.manifest: dict[str, dict] = manifest
+        self.lazy_keys: set[str] = {key for key in manifest if key.split("/")[0] in lazy_groups}
+        self.assets: dict = load_assets({key: entry for key, entry in manifest.items() if key not in self.lazy_keys}, workers)
+        self.pending: dict[str, Future] = {}  # group -> prepare_group
+        self.converted: dict[str, dict[pg.Surface, pg.Surface]] = {}  # group -> the surfaces converted so far
+        self.prefetch_pool: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=stgs.ASSET_PREFETCH_WORKERS, thread_name_prefix="asset-prefetch")
+        self.prepare: Callable[[Iterable[pg.Surface]], None] | None = None  # called with the images of every lazy group that is loaded later
+
+    def __getitem__(self, key: str) -> pg.Surface | list[pg.Surface] | Animation:
+        """
+        Returns an asset, if its lazy group isn't loaded yet, this waits for the prefetch (started now if it wasn't)
+        and converts the group right away.
+        Args:
+        key (str): The asset key.
+        Returns:
+        pg.Surface | list[pg.Surface] | Animation: The asset.
+        """
+        if key not in self.assets:
+            self.finish(key.split("/")[0])
+        return self.assets[key]
+
+    def __contains__(self, key: str) -> bool:
+        """ Returns whether the key is in the manifest, no matter if it is loaded. """
+        return key in self.manifest
+
+    def group_keys(self, group: str) -> list[str]:
+        """
+        Returns the keys of a group.
+        Args:
+        group (str): The group, e.g. 'boss1'.
+        Returns:
+        list[str]: The keys of the group.
+        """
+        return [key for key in self.manifest if key.split("/")[0] == group]
+
+    def convert_step(self, group: str) -> bool:
+        """
+        Converts the next surface of a prefetched group on the main thread, or adds the group to the assets once all are converted.
+        The prefetch of the group must be started, this waits for it to finish.
+        Args:
+        group (str): The group, e.g. 'boss1'.
+        Returns:
+        bool: Whether the group is loaded.
+        """
+        prepared: dict = self.pending[group].result()
+        converted: dict[pg.Surface, pg.Surface] = self.converted.setdefault(group, {})
+        for asset in prepared.values():
+            for surf in asset_sheets(asset):
+                if surf not in converted:
+                    converted[surf] = surf.convert_alpha()
+                    return False
+        built: dict = {key: convert_asset(asset, converted) for key, asset in prepared.items()}
+        self.assets.update(built)
+        del self.pending[group], self.converted[group]
+        if self.prepare is not None:
+            self.prepare(img for asset in built.values() for img in asset_images(asset))
+        return True
+
+    def finish(self, group: str) -> None:
+        """
+        Loads a lazy group right now: waits for its prefetch (started if it wasn't) and converts it without a time budget.
+        Args:
+        group (str): The group, e.g. 'boss1'.
+        """
+        self.prefetch(group)
+        while group in self.pending and not self.convert_step(group):
+            pass
+
+    def prefetch(self, group: str) -> None:
+        """
+        Starts decoding and packing a lazy group in the background.
+        Args:
+        group (str): The group, e.g. 'boss1'.
+        """
+        keys: list[str] = [key for key in self.group_keys(group) if key in self.lazy_keys]
+        if keys and group not in self.pending and any(key not in self.assets for key in keys):
+            self.pending[group] = self.prefetch_pool.submit(prepare_group, {key: self.manifest[key] for key in keys})
+
+    def release(self, group: str) -> None:
+        """
+        Drops the loaded and the pending images of a lazy group.
+        Args:
+        group (str): The group, e.g. 'boss1'.
+        """
+        for key in self.group_keys(group):
+            if key in self.lazy_keys:
+                self.assets.pop(key, None)
+        future: Future | None = self.pending.pop(group, None)
+        if future is not None:
+            future.cancel()
+        self.converted.pop(group, None)
+
+    def update(self, time_budget: float = stgs.ASSET_PREFETCH_FRAME_BUDGET) -> None:
+        """
+        Converts the finished prefetches on the main thread, one surface after another as long as the time budget of the frame lasts.
+        Args:
+        time_budget (float): The time in seconds the conversion may take per frame.
+        """
+        start: float = perf_counter()
+        for group in [group for group, future in self.pending.items() if future.done()]:
+            while not self.convert_step(group):
+                if perf_counter() - start >= time_budget:
+                    return
+            if perf_counter() - start >= time_budget:
+                return
+
+    def close(self) -> None:
+        """ Stops the prefetch threads, the prefetches that didn't start are cancelled. """
+        self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+
+    def images(self) -> list[pg.Surface]:
+        """
+        Returns the images of the loaded assets.
+        Returns:
+        list[pg.Surface]: The images.
+        """
+        return [img for asset in self.assets.values() for img in asset_images(asset)]
+
+    def resident_bytes(self) -> int:
+        """
+        Returns the pixel memory of the loaded assets.
+        Returns:
+        int: The size of the pixels in bytes.
+        """
+        return sum(asset_bytes(asset) for asset in self.assets.values())
@@ -0,0 +1,139 @@
+import settings as stgs
+from utils import Animation
+
+import pygame as pg
+from typing import TypeVar
+
+Animation_object = TypeVar("Animation_object")
+
+
+def pack_frames(sizes: list[tuple[int, int]], max_size: int = stgs.ATLAS_SHEET_SIZE) -> list[tuple[int, int, int]]:
+    """
+    Packs frames into shelves (rows) of sheets, the tallest frames first.
+    Args:
+    sizes (list[tuple[int, int]]): The sizes of the frames.
+    max_size (int): The maximum width and height of a sheet.
+    Returns:
+    list[tuple[int, int, int]]: The sheet number and the position (x, y) of every frame, in the order of sizes.
+    """
+    placements: list[tuple[int, int, int]] = [(0, 0, 0)] * len(sizes)
+    sheet, x, y, shelf_height = 0, 0, 0, 0
+    for i in sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0])):
+        width, height = sizes[i]
+        if x + width > max_size:  # next shelf
+            x, y, shelf_height = 0, y + shelf_height, 0
+        if y + height > max_size:  # next sheet
+            sheet, x, y, shelf_height = sheet + 1, 0, 0, 0
+        placements[i] = (sheet, x, y)
+        x += width
+        shelf_height = max(shelf_height, height)
+    return placements
+
+def build_sheets(frames: list[pg.Surface], max_size: int = stgs.ATLAS_SHEET_SIZE) -> list[tuple[pg.Surface, pg.Rect]]:
+    """
+    Copies the frames into as few sheets as possible.
+    Args:
+    frames (list[pg.Surface]): The frames, the sheets get the pixel format of the first one.
+    max_size (int): The maximum width and height of a sheet.
+    Returns:
+    list[tuple[pg.Surface, pg.Rect]]: The sheet and the area of every frame, in the order of frames.
+    """
+    placements = pack_frames([frame.get_size() for frame in frames], max_size)
+    rects: list[pg.Rect] = [pg.Rect((x, y), frame.get_size()) for frame, (_, x, y) in zip(frames, placements)]
+    sheet_sizes: dict[int, list[int]] = {}
+    for (sheet, _, _), rect in zip(placements, rects):
+        sheet_size = sheet_sizes.setdefault(sheet, [0, 0])
+        sheet_size[0] = max(sheet_size[0], rect.right)
+        sheet_size[1] = max(sheet_size[1], rect.bottom)  # sheets are only as big as their content
+    masks: tuple[int, int, int, int] = frames[0].get_masks()
+    # the sheets get the exact pixel format of the frames (a template surface doesn't keep e.g. RGBA masks), so the copies below don't convert
+    sheets: dict[int, pg.Surface] = {sheet: pg.Surface(size, pg.SRCALPHA, 32, masks) if masks[3] else pg.Surface(size, pg.SRCALPHA, frames[0])
+                                     for sheet, size in sheet_sizes.items()}
+    for frame, (sheet, _, _), rect in zip(frames, placements, rects):
+        sheets[sheet].blit(frame, rect, special_flags=pg.BLEND_RGBA_MAX)  # copies the pixels onto the empty sheet without blending
+    return [(sheets[sheet], rect) for (sheet, _, _), rect in zip(placements, rects)]
+
+
+class AtlasAnimation(Animation):
+    def __init__(self, sources: list[tuple[pg.Surface, pg.Rect]], animation_duration: int | float, loop: bool = True) -> None:
+        """
+        An animation whose frames are subsurfaces of shared atlas sheets.
+        Args:
+        sources (list[tuple[pg.Surface, pg.Rect]]): The sheet and the area of every frame.
+        animation_duration (int | float): The duration of the animation in seconds.
+        loop (bool): Whether the animation should loop or not. Defaults to True.
+        """
+        self.sources: list[tuple[pg.Surface, pg.Rect]] = list(sources)
+        super().__init__([sheet.subsurface(rect) for sheet, rect in self.sources], animation_duration, loop)
+
+    @classmethod
+    def from_frames(cls, sources: list[tuple[pg.Surface, pg.Rect]], frames: list[pg.Surface], animation_duration: int | float, loop: bool = True,
+                    mask_list: list[pg.mask.Mask] | None = None) -> Animation_object:
+        """
+        Creates an atlas animation that shares already created subsurfaces.
+        Args:
+        sources (list[tuple[pg.Surface, pg.Rect]]): The sheet and the area of every frame.
+        frames (list[pg.Surface]): The subsurfaces of the frames.
+        animation_duration (int | float): The duration of the animation in seconds.
+        loop (bool): Whether the animation should loop or not. Defaults to True.
+        mask_list (list[pg.mask.Mask] | None): The masks of the frames, they are created if not given. Defaults to None.
+        Returns:
+        Animation_object: The atlas animation.
+        """
+        animation = cls.__new__(cls)
+        animation.sources = sources
+        Animation.__init__(animation, frames, animation_duration, loop, mask_list)
+        return animation
+
+    def copy(self) -> Animation_object:
+        """
+        Creates a copy of the animation object, that shares the sheets, frames and masks, and returns it.
+        Returns:
+        Animation_object: The copied animation object.
+        """
+        return AtlasAnimation.from_frames(self.sources, self.img_list, self.anim_dur, self.loop, self.mask_list)
+
+    def with_sheets(self, sheets: dict[pg.Surface, pg.Surface]) -> Animation_object:
+        """
+        Creates an atlas animation with the same frame areas and masks on other sheets, e.g. the sheets converted to the display format.
+        Args:
+        sheets (dict[pg.Surface, pg.Surface]): The new sheet of every sheet of the animation.
+        Returns:
+        Animation_object: The atlas animation on the new sheets.
+        """
+        sources = [(sheets[sheet], rect) for sheet, rect in self.sources]
+        return AtlasAnimation.from_frames(sources, [sheet.subsurface(rect) for sheet, rect in sources], self.anim_dur, self.loop, self.mask_list)
+
+    def get_source(self) -> tuple[pg.Surface, pg.Rect] | None:
+        """
+        Gets the sheet and the area of the current frame, so frames of different animations can be drawn
+        from the same sheet in one Surface.blits call.
+        Returns:
+        tuple[pg.Surface, pg.Rect] | None: The sheet and the area of the current frame, or None if the animation is done.
+        """
+        if 0 <= self.current_frame < len(self.sources):
+            return self.sources[self.current_frame]
+        else:
+            return None
+
+
+def build_atlas_animations(animations: dict[str, tuple[list[pg.Surface], int | float, bool]],
+                           max_size: int = stgs.ATLAS_SHEET_SIZE) -> dict[str, AtlasAnimation]:
+    """
+    Packs the frames of several animations into shared sheets.
+    Args:
+    animations (dict[str, tuple[list[pg.Surface], int | float, bool]]): The frames, the duration and the loop flag of every animation by its key.
+    max_size (int): The maximum width and height of a sheet. Defaults to ATLAS_SHEET_SIZE.
+    Returns:
+    dict[str, AtlasAnimation]: The atlas animations by their key.
+    """
+    frames: list[pg.Surface] = [frame for images, _, _ in animations.values() for frame in images]
+    if not frames:
+        return {}
+    sources = build_sheets(frames, max_size)
+    atlas_animations: dict[str, AtlasAnimation] = {}
+    start: int = 0
+    for key, (images, animation_duration, loop) in animations.items():
+        atlas_animations[key] = AtlasAnimation(sources[start:start + len(images)], animation_duration, loop)
+        start += len(images)
+    return atlas_animations
@@ -0,0 +1,94 @@
+import settings as stgs
+
+import pygame as pg
+from typing import Callable, TypeVar
+
+Background_object = TypeVar("Background_object")
+
+
+class TiledBackground:
+    def __init__(self, load_tile: Callable[[int], pg.Surface], tile_count: int, tile_height: int, loop: bool = False) -> None:
+        """
+        A vertically scrolling background made of horizontal tiles, only the tiles that intersect the viewport are blitted.
+        Args:
+        load_tile (Callable[[int], pg.Surface]): Returns a tile by its index, tile 0 is the top of the background.
+        tile_count (int): The number of tiles.
+        tile_height (int): The height of a tile, the last tile can be lower.
+        loop (bool): Whether the background repeats endlessly in both directions. Defaults to False.
+        """
+        self.load_tile: Callable[[int], pg.Surface] = load_tile
+        self.tile_count: int = tile_count
+        self.tile_height: int = tile_height
+        self.loop: bool = loop
+        self.tiles: dict[int, pg.Surface] = {}
+
+    @classmethod
+    def from_surface(cls, img: pg.Surface, tile_height: int = stgs.BACKGROUND_TILE_HEIGHT, loop: bool = False) -> Background_object:
+        """
+        Splits an image into tiles, they are subsurfaces and share the pixels of the image.
+        Args:
+        img (pg.Surface): The background image.
+        tile_height (int): The height of a tile.
+        loop (bool): Whether the background repeats endlessly. Defaults to False.
+        Returns:
+        Background_object: The background.
+        """
+        width, height = img.get_size()
+        load_tile = lambda index: img.subsurface((0, index * tile_height, width, min(tile_height, height - index * tile_height)))
+        return cls(load_tile, -(-height // tile_height), tile_height, loop)
+
+    def get_height(self) -> int:
+        """
+        Returns the height of the background (one repetition if it loops), like pg.Surface.get_height.
+        Returns:
+        int: The height of the background in pixels.
+        """
+        return (self.tile_count - 1) * self.tile_height + self.get_tile(self.tile_count - 1).get_height()
+
+    def get_tile(self, index: int) -> pg.Surface:
+        """
+        Returns a tile and creates it the first time it is needed.
+        Args:
+        index (int): The index of the tile.
+        Returns:
+        pg.Surface: The tile.
+        """
+        tile: pg.Surface | None = self.tiles.get(index)
+        if tile is None:
+            tile = self.tiles[index] = self.load_tile(index)
+        return tile
+
+    def visible_tiles(self, y: int, area: pg.Rect) -> range:
+        """
+        Returns the positions of the tiles (not wrapped around if the background loops) that intersect an area.
+        Args:
+        y (int): The position of the top of the background on the surface.
+        area (pg.Rect): The area of the surface.
+        Returns:
+        range: The tile positions.
+        """
+        first = (area.top - y) // self.tile_height
+        last = (area.bottom - 1 - y) // self.tile_height
+        if not self.loop:
+            first, last = max(0, first), min(self.tile_count - 1, last)
+        return range(first, last + 1)
+
+    def draw(self, surf: pg.Surface, y: int, area: pg.Rect | None = None) -> None:
+        """
+        Draws the tiles that intersect the area of the surface.
+        Args:
+        surf (pg.Surface): The surface to draw on, e.g. the game window.
+        y (int): The position of the top of the background on the surface.
+        area (pg.Rect | None): The area of the surface to draw, defaults to the whole surface.
+        """
+        area = surf.get_rect() if area is None else area.clip(surf.get_rect())
+        if not area.width or not area.height:
+            return
+        blit_sequence: list[tuple[pg.Surface, tuple[int, int], pg.Rect]] = []
+        for position in self.visible_tiles(y, area):
+            tile = self.get_tile(position % self.tile_count)
+            tile_rect = tile.get_rect(topleft=(0, y + position * self.tile_height))
+            clipped = area.clip(tile_rect)
+            if clipped.width and clipped.height:
+                blit_sequence.append((tile, clipped.topleft, clipped.move(-tile_rect.x, -tile_rect.y)))
+        surf.blits(blit_sequence, doreturn=False)
@@ -0,0 +1,103 @@
+"""
+Compares the projectile vs. enemy collision check of one frame with pg.sprite.spritecollide against the whole group
+and with the SpatialHash broadphase. The sprites are synthetic, so no assets are loaded.
+Run it from the repository root:  python -m benchmarks.bench_collisions [--projectiles 1000 2000 5000] [--enemies 5 20] [--repeat 20]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import settings as stgs
+from spatial_hash import SpatialHash
+
+import argparse
+import random
+import pygame as pg
+from time import perf_counter
+
+
+def create_sprite(group: pg.sprite.Group, size: tuple[int, int], pos: tuple[int, int]) -> pg.sprite.Sprite:
+    """
+    Creates a sprite with an elliptic image and its mask, like a ship or a laser.
+    Args:
+    group (pg.sprite.Group): The group of the sprite.
+    size (tuple[int, int]): The size of the image.
+    pos (tuple[int, int]): The top left position.
+    Returns:
+    pg.sprite.Sprite: The sprite.
+    """
+    sprite = pg.sprite.Sprite(group)
+    sprite.image = pg.Surface(size, pg.SRCALPHA)
+    pg.draw.ellipse(sprite.image, (255, 255, 255), sprite.image.get_rect())
+    sprite.rect = sprite.image.get_rect(topleft=pos)
+    sprite.mask = pg.mask.from_surface(sprite.image)
+    return sprite
+
+def create_scene(projectile_count: int, enemy_count: int, seed: int = 1) -> tuple[pg.sprite.Group, pg.sprite.Group]:
+    """
+    Scatters projectiles and enemies over the game window.
+    Args:
+    projectile_count (int): The number of projectiles.
+    enemy_count (int): The number of enemies.
+    seed (int): The seed of the positions.
+    Returns:
+    tuple[pg.sprite.Group, pg.sprite.Group]: The projectiles and the enemies.
+    """
+    rng = random.Random(seed)
+    width, height = stgs.GAME_WINDOW_RESOLUTION
+    projectiles, enemies = pg.sprite.Group(), pg.sprite.Group()
+    for _ in range(projectile_count):
+        create_sprite(projectiles, (9, 33), (rng.randrange(width), rng.randrange(height)))
+    for _ in range(enemy_count):
+        create_sprite(enemies, (120, 110), (rng.randrange(width - 120), rng.randrange(height - 110)))
+    return projectiles, enemies
+
+def naive_hits(projectiles: pg.sprite.Group, enemies: pg.sprite.Group) -> int:
+    """ The collision check as the game did it before the broadphase. """
+    return sum(len(pg.sprite.spritecollide(projectile, enemies, False, pg.sprite.collide_mask)) for projectile in projectiles)
+
+def grid_hits(projectiles: pg.sprite.Group, enemies: pg.sprite.Group) -> int:
+    """ The collision check with the spatial hash, including building the grid. """
+    enemy_grid = SpatialHash.from_group(enemies)
+    return sum(len(enemy_grid.collide(projectile, pg.sprite.collide_mask)) for projectile in projectiles)
+
+def time_it(function: callable, repeat: int) -> float:
+    """
+    Runs a function a few times and returns the best wall time.
+    Args:
+    function (callable): The function to time.
+    repeat (int): The number of runs.
+    Returns:
+    float: The best time in seconds.
+    """
+    best: float = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Collision broadphase benchmark.")
+    parser.add_argument("--projectiles", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument("--enemies", type=int, nargs="+", default=[5, 20])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pg.init()
+    print(f"cell size {stgs.COLLISION_CELL_SIZE} px, best of {args.repeat} runs")
+    print(f"{'projectiles':>12}{'enemies':>9}{'hits':>7}{'spritecollide ms':>18}{'spatial hash ms':>17}{'speedup':>9}")
+    for projectile_count in args.projectiles:
+        for enemy_count in args.enemies:
+            projectiles, enemies = create_scene(projectile_count, enemy_count)
+            hits = naive_hits(projectiles, enemies)
+            if hits != grid_hits(projectiles, enemies):
+                raise RuntimeError("the spatial hash found other collisions than spritecollide")
+            naive = time_it(lambda: naive_hits(projectiles, enemies), args.repeat)
+            grid = time_it(lambda: grid_hits(projectiles, enemies), args.repeat)
+            print(f"{projectile_count:>12}{enemy_count:>9}{hits:>7}{naive * 1000:>18.2f}{grid * 1000:>17.2f}{naive / grid:>8.1f}x")
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compares the frame time of draw_window in every game state with and without the dirty rectangle renderer.
+The play state runs the real game logic with a sprayer and two drones, the other states only draw.
+Run it from the repository root:  python -m benchmarks.bench_render [--frames 300] [--seed 1] [--render-scale 1]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import settings as stgs
+from main import Game
+
+import argparse
+import pygame as pg
+from time import perf_counter
+
+
+def prepare_state(game: Game, state: str) -> None:
+    """
+    Puts the game into a state.
+    Args:
+    game (Game): The game.
+    state (str): The game state, 'enter name' is the second part of 'game over'.
+    """
+    game.game_state = "game over" if state == "enter name" else state
+    game.game_over_timer = 5 if state == "enter name" else 0
+    if state == "play":
+        game.countdown = False
+        game.spaceship.weapon = "sprayer"
+        game.sprayer_state = 5
+        game.drones_to_get = 2
+        game.add_drones()
+
+def run_frame(game: Game, state: str, frame: int, dt: float) -> None:
+    """
+    Runs the game logic of one frame (only in the play state) and draws it.
+    Args:
+    game (Game): The game.
+    state (str): The game state.
+    frame (int): The number of the frame.
+    dt (float): The time difference between the frames.
+    """
+    if state == "play":
+        game.move_x = [0, 1] if (frame // 50) % 2 else [1, 0]
+        game.update(dt)
+    elif state == "enter name":
+        game.player_name = "abcdefgh"[:frame // 10 % 8 + 1]
+    game.draw_window()
+
+def measure(state: str, dirty_rects: bool, frames: int, seed: int) -> tuple[float, dict[str, float]]:
+    """
+    Runs a game state for a number of frames.
+    Args:
+    state (str): The game state.
+    dirty_rects (bool): Whether the dirty rectangle renderer is used.
+    frames (int): The number of frames.
+    seed (int): The seed of the random streams.
+    Returns:
+    tuple[float, dict[str, float]]: The average frame time in seconds and the statistics of the renderer.
+    """
+    stgs.DIRTY_RECTS = dirty_rects
+    game = Game(seed=seed)
+    game.create_buttons()
+    prepare_state(game, state)
+    dt: float = 1 / 60
+    start = perf_counter()
+    for frame in range(frames):
+        run_frame(game, state, frame, dt)
+    return (perf_counter() - start) / frames, game.renderer.stats()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dirty rectangle renderer benchmark.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--render-scale", type=float, default=stgs.RENDER_SCALE, help="size of the render buffer, e.g. 0.5")
+    args = parser.parse_args()
+    stgs.RENDER_SCALE = args.render_scale
+
+    dirty_rects: bool = stgs.DIRTY_RECTS
+    print(f"{args.frames} frames per state, render scale {args.render_scale}")
+    print(f"{'state':<12}{'full ms':>9}{'dirty ms':>10}{'speedup':>9}{'full frames':>13}{'updated screen':>16}")
+    for state in ["menu", "help", "highscores", "play", "game over", "enter name"]:
+        full, _ = measure(state, False, args.frames, args.seed)
+        dirty, stats = measure(state, True, args.frames, args.seed)
+        print(f"{state:<12}{full * 1000:>9.2f}{dirty * 1000:>10.2f}{full / dirty:>8.1f}x{stats['full frames']:>13.1%}{stats['updated screen']:>16.1%}")
+    stgs.DIRTY_RECTS = dirty_rects
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+"""
+Runs named gameplay scenarios headless, one simulation step and one drawn frame per frame, and reports the percentiles
+of the frame time of the update, the collision checks and the drawing separately. The results are written to a json file,
+compare checks them against a stored baseline and fails if a scenario got slower than a threshold.
+Run it from the repository root:  python -m benchmarks.bench_scenarios run [--frames 600] [--repeat 3] [--scenarios boss1-all ...] [--out FILE]
+                                  python -m benchmarks.bench_scenarios compare BASELINE RESULTS [--threshold 0.15] [--min-delta 0.05]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import settings as stgs
+from main import Game
+
+import argparse
+import json
+import platform
+import sys
+import numpy as np
+import pygame as pg
+from time import perf_counter
+from typing import Final
+
+FIRE_MODES: Final[tuple[str, ...]] = ("all", "spray", "knight_rider")
+SCENARIOS: Final[tuple[str, ...]] = ("phase1-wave", "phase9-dense", *(f"boss{boss}-{mode}" for boss in (1, 2, 3) for mode in FIRE_MODES),
+                                     "boss-death", "sprayer-drones")
+DENSE_WAVE: Final[int] = 12  # the first of the waves with six ships in phase 9
+BOSS_WARMUP_STEPS: Final[int] = 60 * stgs.SIMULATION_HZ  # the boss flies in and opens before the frames are measured
+DEATH_EXPLOSION_INTERVAL: Final[float] = 1 / 23  # the shortest interval of the death explosions, so all 100 fit into the frames
+COLLISION_HANDLERS: Final[tuple[str, ...]] = ("handle_upgrade_collision", "handle_projectile_enemy_collision", "handle_projectile_player_collision",
+                                              "handle_enemy_player_collision", "handle_enemy_drone_collision")
+SECTIONS: Final[tuple[str, ...]] = ("update", "collisions", "draw")
+STATISTICS: Final[tuple[str, ...]] = ("mean", "p50", "p95", "p99", "max")
+COMPARED: Final[tuple[str, ...]] = ("mean", "p95")  # p99 and max of a few hundred frames are too noisy for a gate
+
+
+def find_boss(game: Game) -> pg.sprite.Sprite | None:
+    """
+    Returns the boss of the current wave.
+    Args:
+    game (Game): The game.
+    Returns:
+    pg.sprite.Sprite | None: The boss, None if there is none.
+    """
+    return next((enemy for enemy in game.enemy_group if hasattr(enemy, "fire_mode")), None)
+
+def keep_alive(game: Game) -> None:
+    """ Heals the player, the drones and the boss, so a scenario doesn't change into a respawn, a game over or the next phase. """
+    game.spaceship.health = game.spaceship.max_health
+    for drone in game.drone_group:
+        drone.health = drone.MAX_HEALTH
+    boss = find_boss(game)
+    if boss is not None and not boss.killed:
+        boss.health = boss.max_health
+
+def enter_boss_fight(game: Game, phase: int) -> pg.sprite.Sprite:
+    """
+    Starts the boss wave of a phase and runs the simulation until the boss has flown in and starts to fight.
+    Args:
+    game (Game): The game.
+    phase (int): The phase.
+    Returns:
+    pg.sprite.Sprite: The boss.
+    """
+    game.start_level(phase, len(stgs.enemy_waves[phase]) - 1)
+    for _ in range(BOSS_WARMUP_STEPS):
+        keep_alive(game)
+        game.update(game.simulation_step)
+        boss = find_boss(game)
+        if boss is not None and boss.start_fight:
+            return boss
+    raise RuntimeError(f"the boss of phase {phase} didn't start to fight")
+
+def prepare_scenario(game: Game, scenario: str) -> None:
+    """
+    Puts the game into the state of a scenario.
+    Args:
+    game (Game): The game.
+    scenario (str): The name of the scenario, see SCENARIOS.
+    """
+    game.create_buttons()
+    if scenario == "phase1-wave":
+        game.start_level(1)
+    elif scenario == "phase9-dense":
+        game.start_level(9, DENSE_WAVE)
+    elif scenario == "sprayer-drones":
+        game.start_level(1)
+        game.spaceship.weapon = "sprayer"
+        game.sprayer_state = 5
+        game.drones_to_get = 2
+        game.add_drones()
+    elif scenario == "boss-death":
+        boss = enter_boss_fight(game, 1)
+        boss.take_damage(boss.health)
+    else:
+        enter_boss_fight(game, int(scenario[4]))
+    game.renderer.invalidate()
+
+def drive_scenario(game: Game, scenario: str, frame: int) -> None:
+    """
+    Sets the input of a frame and keeps the scenario in its state: the boss keeps the fire mode of the scenario
+    and the explosions of the boss death follow each other at the shortest interval.
+    Args:
+    game (Game): The game.
+    scenario (str): The name of the scenario.
+    frame (int): The number of the frame.
+    """
+    game.move_x[:] = [0, 1] if (frame // 50) % 2 else [1, 0]
+    keep_alive(game)
+    boss = find_boss(game)
+    if boss is None:
+        return
+    if scenario == "boss-death":
+        boss.explosion_timer = min(boss.explosion_timer, DEATH_EXPLOSION_INTERVAL)
+    elif scenario.startswith("boss") and boss.shooting_state == "not shooting":
+        boss.fire_mode = scenario.split("-", 1)[1]
+        boss.shooting_state = "shooting"
+
+def time_collisions(game: Game) -> list[float]:
+    """
+    Times the collision handlers of a game, they are called by Game.update.
+    Args:
+    game (Game): The game.
+    Returns:
+    list[float]: The accumulated time of the collision handlers in seconds (one element), it can be reset between the frames.
+    """
+    timer: list[float] = [0]
+    for name in COLLISION_HANDLERS:
+        def timed(handler: callable = getattr(game, name)) -> None:
+            start = perf_counter()
+            handler()
+            timer[0] += perf_counter() - start
+        setattr(game, name, timed)
+    return timer
+
+def statistics(times: list[float]) -> dict[str, float]:
+    """
+    Computes the statistics of frame times.
+    Args:
+    times (list[float]): The times in seconds.
+    Returns:
+    dict[str, float]: The mean, the percentiles and the maximum in milliseconds.
+    """
+    ms = np.array(times) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"mean": float(ms.mean()), "p50": float(p50), "p95": float(p95), "p99": float(p99), "max": float(ms.max())}
+
+def run_scenario(scenario: str, frames: int, seed: int) -> dict[str, dict[str, float]]:
+    """
+    Runs a scenario for a number of frames, every frame is one simulation step and one drawn frame.
+    Args:
+    scenario (str): The name of the scenario.
+    frames (int): The number of frames.
+    seed (int): The seed of the random streams.
+    Returns:
+    dict[str, dict[str, float]]: The statistics of the update (without the collisions), the collisions and the drawing.
+    """
+    game = Game(headless=True, seed=seed)
+    prepare_scenario(game, scenario)
+    collisions = time_collisions(game)
+    times: dict[str, list[float]] = {section: [] for section in SECTIONS}
+    for frame in range(frames):
+        drive_scenario(game, scenario, frame)
+        collisions[0] = 0
+        start = perf_counter()
+        game.update(game.simulation_step)
+        updated = perf_counter()
+        game.draw_window()
+        drawn = perf_counter()
+        times["update"].append(updated - start - collisions[0])
+        times["collisions"].append(collisions[0])
+        times["draw"].append(drawn - updated)
+    return {section: statistics(section_times) for section, section_times in times.items()}
+
+def best_of(runs: list[dict[str, dict[str, float]]]) -> dict[str, dict[str, float]]:
+    """
+    Keeps the best value of every statistic of a few runs of a scenario, the runs are identical apart from the noise.
+    Args:
+    runs (list[dict[str, dict[str, float]]]): The statistics of the runs.
+    Returns:
+    dict[str, dict[str, float]]: The best statistics of the update, the collisions and the drawing.
+    """
+    return {section: {name: min(result[section][name] for result in runs) for name in STATISTICS} for section in SECTIONS}
+
+def run(scenarios: list[str], frames: int, seed: int, repeat: int, file_path: str) -> None:
+    """
+    Runs scenarios, prints their statistics and writes them to a json file. The scenarios take turns in the repeated runs,
+    so a slow period of the machine doesn't hit every run of the same scenario.
+    Args:
+    scenarios (list[str]): The names of the scenarios.
+    frames (int): The number of frames per scenario.
+    seed (int): The seed of the random streams.
+    repeat (int): The number of runs per scenario, the best statistics are kept.
+    file_path (str): The path of the json file.
+    """
+    runs: dict[str, list[dict[str, dict[str, float]]]] = {scenario: [] for scenario in scenarios}
+    for _ in range(repeat):
+        for scenario in scenarios:
+            runs[scenario].append(run_scenario(scenario, frames, seed))
+    results: dict[str, dict[str, dict[str, float]]] = {scenario: best_of(scenario_runs) for scenario, scenario_runs in runs.items()}
+    print(f"{frames} frames per scenario, best of {repeat} runs, seed {seed}, render scale {stgs.RENDER_SCALE}, times in ms")
+    print(f"{'scenario':<20}{'section':<12}" + "".join(f"{name:>9}" for name in STATISTICS))
+    for scenario, sections in results.items():
+        for section, values in sections.items():
+            print(f"{scenario:<20}{section:<12}" + "".join(f"{values[name]:>9.3f}" for name in STATISTICS))
+    with open(file_path, "w") as file:
+        json.dump({"frames": frames, "repeat": repeat, "seed": seed, "render scale": stgs.RENDER_SCALE, "platform": platform.platform(),
+                   "scenarios": results}, file, indent=2)
+    print(f"written to {file_path}")
+
+def compare(baseline_path: str, results_path: str, threshold: float, min_delta: float) -> bool:
+    """
+    Compares results with a baseline. A scenario regresses if the mean or the p95 of a section is more than the threshold
+    slower than in the baseline, and at least min_delta milliseconds, so tiny sections don't fail on noise.
+    Args:
+    baseline_path (str): The path of the baseline json file.
+    results_path (str): The path of the results json file.
+    threshold (float): The allowed slowdown, e.g. 0.15 for 15 %.
+    min_delta (float): The smallest slowdown in milliseconds that counts.
+    Returns:
+    bool: Whether no scenario regressed.
+    """
+    with open(baseline_path) as file:
+        baseline = json.load(file)
+    with open(results_path) as file:
+        results = json.load(file)
+    if (baseline["frames"], baseline["seed"]) != (results["frames"], results["seed"]):
+        print(f"warning: the baseline ran {baseline['frames']} frames with seed {baseline['seed']}, "
+              f"the results {results['frames']} frames with seed {results['seed']}")
+    passed: bool = True
+    print(f"{'scenario':<20}{'section':<12}{'value':<7}{'baseline':>10}{'results':>10}{'change':>9}")
+    for scenario, sections in baseline["scenarios"].items():
+        if scenario not in results["scenarios"]:
+            print(f"{scenario:<20}missing in the results")
+            continue
+        for section, values in sections.items():
+            for name in COMPARED:
+                old, new = values[name], results["scenarios"][scenario][section][name]
+                regressed = new > old * (1 + threshold) and new - old >= min_delta
+                passed = passed and not regressed
+                print(f"{scenario:<20}{section:<12}{name:<7}{old:>10.3f}{new:>10.3f}{(new - old) / max(old, 1e-9):>+9.1%}"
+                      + ("  REGRESSION" if regressed else ""))
+    print("passed" if passed else f"failed: slower than the baseline by more than {threshold:.0%}")
+    return passed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gameplay scenario benchmark.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the scenarios and write the results")
+    run_parser.add_argument("--frames", type=int, default=600)
+    run_parser.add_argument("--repeat", type=int, default=3)
+    run_parser.add_argument("--seed", type=int, default=1)
+    run_parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), metavar="SCENARIO",
+                            help=f"the scenarios (default: all), choices: {', '.join(SCENARIOS)}")
+    run_parser.add_argument("--render-scale", type=float, default=stgs.RENDER_SCALE, help="size of the render buffer, e.g. 0.5")
+    run_parser.add_argument("--out", default="bench_scenarios.json", help="the json file of the results (default: bench_scenarios.json)")
+    compare_parser = commands.add_parser("compare", help="compare results with a baseline, exits with 1 if a scenario regressed")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("results")
+    compare_parser.add_argument("--threshold", type=float, default=0.15, help="the allowed slowdown (default: 0.15)")
+    compare_parser.add_argument("--min-delta", type=float, default=0.05, help="the smallest slowdown in ms that counts (default: 0.05)")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        stgs.RENDER_SCALE = args.render_scale
+        run(args.scenarios, args.frames, args.seed, args.repeat, args.out)
+        pg.quit()
+    elif not compare(args.baseline, args.results, args.threshold, args.min_delta):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compares the sequential asset loading path with the thread pool batch loader
+and with the asset registry, which loads the boss animations lazily.
+The cold runs decode every PNG (neither the disk cache nor the asset pack is used), the warm runs read the disk cache.
+Run it from the repository root:  python -m benchmarks.bench_startup [--workers 1 2 4 8] [--repeat 3]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import settings as stgs
+import assets as asset_loader
+from assets import AssetRegistry, asset_bytes, load_assets, load_assets_sequential
+
+import argparse
+import pygame as pg
+from time import perf_counter
+
+
+def time_it(function: callable, repeat: int) -> float:
+    """
+    Runs a function a few times and returns the best wall time.
+    Args:
+    function (callable): The function to time.
+    repeat (int): The number of runs.
+    Returns:
+    float: The best time in seconds.
+    """
+    best: float = float("inf")
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Startup benchmark of the asset loaders.")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pg.init()
+    pg.display.set_mode(stgs.MAIN_WINDOW_RESOLUTION)
+    print(f"{len(stgs.ASSETS)} asset keys, {os.cpu_count()} cpus")
+    if (os.cpu_count() or 1) == 1:
+        print("one cpu: load_assets decodes on the calling thread for every worker count, without a pool")
+    print(f"{'loader':<26}{'cold (PNG) s':>14}{'warm (cache) s':>16}{'resident MB':>13}")
+
+    runs = [("sequential", lambda: load_assets_sequential(stgs.ASSETS))]
+    runs += [(f"pool, {workers} workers", lambda workers=workers: load_assets(stgs.ASSETS, workers)) for workers in sorted(set(args.workers))]
+    runs += [("registry, lazy bosses", lambda: AssetRegistry(stgs.ASSETS, lazy_groups=set(stgs.BOSS_ASSETS.values())))]
+    pack = asset_loader.asset_pack
+    for name, loader in runs:
+        stgs.ASSET_CACHE, asset_loader.asset_pack = False, None  # cold: the images are decoded from their PNGs
+        cold = time_it(loader, args.repeat)
+        stgs.ASSET_CACHE, asset_loader.asset_pack = True, pack
+        assets = loader()  # fills the cache
+        warm = time_it(loader, args.repeat)
+        resident = assets.resident_bytes() if isinstance(assets, AssetRegistry) else sum(asset_bytes(asset) for asset in assets.values())
+        print(f"{name:<26}{cold:>14.3f}{warm:>16.3f}{resident / 2 ** 20:>13.1f}")
+    pg.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -24,20 +24,25 @@ class Button:
         self.text: str = text
         self.pos: list[int] = list(pos)        
         self.font: pg.font.Font = pg.font.SysFont('comicsans', 32)
+        self.label: pg.Surface = self.font.render(self.text, True, self.BUTTON_SHADOW_COLOR)  # rendered once, the text doesn't change
         self.button_top_rect: pg.Rect = pg.Rect(self.pos[0] - self.BUTTON_SIZE[0] // 2, self.pos[1] - self.BUTTON_SIZE[1] // 2 - self.BUTTON_OFFSET, self.BUTTON_SIZE[0], self.BUTTON_SIZE[1])
         self.button_bottom_rect: pg.Rect = pg.Rect(self.pos[0] - self.BUTTON_SIZE[0] // 2, self.pos[1] - self.BUTTON_SIZE[1] // 2, self.BUTTON_SIZE[0], self.BUTTON_SIZE[1])       
         self.clicked: bool = False
         self.button_color: tuple[int] = self.BUTTON_TOP_COLOR
         self.offset: int = self.BUTTON_OFFSET
 
-    def render(self) -> None:
-        """ Renders the button on the screen. """
-        pg.draw.rect(self.surface, self.BUTTON_SHADOW_COLOR, (self.button_bottom_rect[0] - 2, self.button_bottom_rect[1] - 2, self.BUTTON_SIZE[0] + 4, self.BUTTON_SIZE[1] + 4), border_radius=5)
-        pg.draw.rect(self.surface, self.BUTTON_BOTTOM_COLOR, self.button_bottom_rect, border_radius=5)
-        pg.draw.rect(self.surface, self.BUTTON_TOP_COLOR, (self.pos[0] - self.BUTTON_SIZE[0] // 2, self.pos[1] - self.BUTTON_SIZE[1] // 2 - self.BUTTON_OFFSET, self.BUTTON_SIZE[0], self.BUTTON_SIZE[1]), border_radius=5)
-        pg.draw.rect(self.surface, self.BUTTON_SHADOW_COLOR, self.button_top_rect, border_radius=5, width=2)
-        button_label: pg.Surface = self.font.render(self.text, True, self.BUTTON_SHADOW_COLOR)
-        self.surface.blit(button_label, (self.pos[0] - button_label.get_width() // 2, self.pos[1] - button_label.get_height() // 2 - self.BUTTON_OFFSET))
+    def render(self, surf: pg.Surface | None = None) -> None:
+        """
+        Renders the button on the screen.
+        Args:
+        surf (pg.Surface | None): The surface to render the button on, e.g. a cached layer. Defaults to the surface of the button.
+        """
+        surf = self.surface if surf is None else surf
+        pg.draw.rect(surf, self.BUTTON_SHADOW_COLOR, (self.button_bottom_rect[0] - 2, self.button_bottom_rect[1] - 2, self.BUTTON_SIZE[0] + 4, self.BUTTON_SIZE[1] + 4), border_radius=5)
+        pg.draw.rect(surf, self.BUTTON_BOTTOM_COLOR, self.button_bottom_rect, border_radius=5)
+        pg.draw.rect(surf, self.BUTTON_TOP_COLOR, (self.pos[0] - self.BUTTON_SIZE[0] // 2, self.pos[1] - self.BUTTON_SIZE[1] // 2 - self.BUTTON_OFFSET, self.BUTTON_SIZE[0], self.BUTTON_SIZE[1]), border_radius=5)
+        pg.draw.rect(surf, self.BUTTON_SHADOW_COLOR, self.button_top_rect, border_radius=5, width=2)
+        surf.blit(self.label, (self.pos[0] - self.label.get_width() // 2, self.pos[1] - self.label.get_height() // 2 - self.BUTTON_OFFSET))
 
     def check_button_collision(self) -> bool:
         """ Checks if the mouse is colliding with the button and if the left mouse button is clicked on it. """
@@ -1,5 +1,6 @@
 from projectile import PlayerProjectile
 from healthbar import Healthbar
+from utils import get_mask, get_transformed
 
 import pygame as pg
 from typing import Final, TypeVar
@@ -30,7 +31,7 @@ class Drone(pg.sprite.Sprite):
         self.x_pos: int = self.game.spaceship.image.get_width() // 2 if self.side < 0 else round(self.game.spaceship.image.get_width() * 1.5) - self.image.get_width()
         self.pos: pg.Vector2 = pg.Vector2(self.game.spaceship.pos.x + (self.x_pos * self.side), self.game.spaceship.pos.y + (self.game.spaceship.image.get_height() // 2))
         self.rect: pg.Rect = self.image.get_rect(center = self.pos)
-        self.drone_mask: pg.mask = pg.mask.from_surface(self.image)
+        self.mask: pg.mask.Mask = self.animation.get_mask()
         
         self.direction: pg.Vector2 = pg.Vector2()
         self.flip_image: bool = False
@@ -39,7 +40,7 @@ class Drone(pg.sprite.Sprite):
         self.laser_damage: int = 5
         self.auto_fire: bool = True
         self.health: int | float = 50    
-        self.healthbar = Healthbar(self.game, self.MAX_HEALTH, self.health, self.image.get_width(), self.pos, self.image.get_height())
+        self.healthbar = Healthbar(self.game, self.MAX_HEALTH, self.health, self.image.get_width(), self.pos, self.image.get_height(), owner=self)
 
     def take_damage(self, damage: int | float) -> None:
         """
@@ -51,7 +52,7 @@ class Drone(pg.sprite.Sprite):
         self.health -= damage
         self.healthbar.update(self.health, self.pos)
         if self.health <= 0:
-            self.game.healthbars.remove(self.healthbar)
+            self.healthbar.remove()
             if self.side < 0 or self.game.drones[0] == 0:              
                 self.kill()
                 self.game.drones[0] = 0
@@ -61,8 +62,8 @@ class Drone(pg.sprite.Sprite):
                 self.game.drones[1] = 0
                 
     def create_mask(self) -> None:
-        """ Creates the mask for the drone. """
-        self.drone_mask = pg.mask.from_surface(self.image)
+        """ Sets the mask of the current (maybe flipped) animation frame, the masks are created only once per frame. """
+        self.mask = self.animation.get_mask(self.flip_image)
 
     def handle_animation(self, dt: float, move_x: list[int]) -> None:
         """
@@ -80,14 +81,26 @@ class Drone(pg.sprite.Sprite):
         if old_state != self.state:
             self.animation = self.game.assets["drone/" + self.state].copy()
             self.rect = self.image.get_rect(center = self.pos)
-            self.create_mask()
 
         self.flip_image = True if (move_x[1] - move_x[0]) > 0 else False
         if self.auto_fire:
             self.fire_weapon(dt)
         self.animation.update(dt)
 
-        self.image = pg.transform.flip(self.animation.get_img(), self.flip_image, False)
+        self.image = get_transformed(self.animation.get_img(), flip_x=self.flip_image)
+        self.create_mask()
+
+    @staticmethod
+    def prewarm_frames(assets: dict) -> None:
+        """
+        Creates the flipped frames and their masks for every state, so the drone only points at cached surfaces while the game runs.
+        Args:
+        assets (dict): The game assets.
+        """
+        for state in ("idle", "curve"):
+            for img in assets["drone/" + state].img_list:
+                get_transformed(img, flip_x=True)
+                get_mask(img, flip_x=True)
 
     def update(self, dt: float, move_x: list[int] = [0, 0]) -> None:
         """
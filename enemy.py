@@ -5,7 +5,6 @@ from explosion import ShipExplosion, BiggerExplosion
 from upgrades import Upgrade
 
 import pygame as pg
-from random import randint, choice
 from typing import TypeVar
 
 Game = TypeVar("Game")
@@ -29,7 +28,7 @@ class Enemy(pg.sprite.Sprite):
         self.animation: Animation = self.game.assets[ship_path + "/idle"].copy()
         self.image: pg.Surface = self.animation.get_img()
         self.rect: pg.Rect = self.image.get_rect(center = pos)
-        self.enemy_mask: pg.mask = pg.mask.from_surface(self.image)
+        self.mask: pg.mask.Mask = self.animation.get_mask()
         self.multiplicand: int = multiplicand
         self.health: int | float = enemy_number * 50 * self.multiplicand
         self.max_health: int = self.health
@@ -40,7 +39,7 @@ class Enemy(pg.sprite.Sprite):
         self.speed_y: int = 100
         self.killed: bool = False
 
-        self.healthbar = Healthbar(game=self.game, max_health=self.max_health, current_health=self.health, image_width=self.image.get_width(), sprite_pos=self.pos)
+        self.healthbar = Healthbar(game=self.game, max_health=self.max_health, current_health=self.health, image_width=self.image.get_width(), sprite_pos=self.pos, owner=self)
 
     def take_damage(self, damage: int | float) -> bool:
         """
@@ -62,8 +61,8 @@ class Enemy(pg.sprite.Sprite):
         return self.killed
 
     def create_mask(self) -> None:
-        """ Creates the mask for the enemy ship. """
-        self.enemy_mask = pg.mask.from_surface(self.image)
+        """ Sets the mask of the current animation frame, the masks are created when the assets are loaded. """
+        self.mask = self.animation.get_mask()
 
     def update(self, dt: float) -> None:
         """
@@ -73,6 +72,7 @@ class Enemy(pg.sprite.Sprite):
         """
         self.animation.update(dt)
         self.image = self.animation.get_img()
+        self.create_mask()
 
         self.direction.y = 1
         self.pos.y += self.direction.y * self.speed_y * dt
@@ -120,7 +120,7 @@ class EnemyShip1(Enemy):
         self.timer -= dt
         if self.timer <= 0:
             self.timer = self.shooting_timer
-            if randint(1, 100) > 80 / self.multiplicand:
+            if self.game.rng.enemy_fire.randint(1, 100) > 80 / self.multiplicand:
                 EnemyProjectile(game=self.game, projectile_type="laser", damage=self.laser_damage, pos=(self.pos.x + self.image.get_width() // 2, self.pos.y + self.image.get_height() + 10), laser_color="red")
 
 
@@ -159,7 +159,7 @@ class EnemyShip2(Enemy):
         self.timer -= dt
         if self.timer <= 0:
             self.timer = self.shooting_timer
-            if randint(1, 100) > 80 / self.multiplicand:
+            if self.game.rng.enemy_fire.randint(1, 100) > 80 / self.multiplicand:
                 EnemyProjectile(game=self.game, projectile_type="laser", damage=self.laser_damage, pos=(self.pos.x + self.image.get_width() // 2 - 10, self.pos.y + self.image.get_height() + 10), laser_color="green")
                 EnemyProjectile(game=self.game, projectile_type="laser", damage=self.laser_damage, pos=(self.pos.x + self.image.get_width() // 2 + 10, self.pos.y + self.image.get_height() + 10), laser_color="green")
 
@@ -199,7 +199,7 @@ class EnemyShip3(Enemy):
         self.timer -= dt
         if self.timer <= 0:
             self.timer = self.shooting_timer
-            if randint(1, 100) > 80 / self.multiplicand:
+            if self.game.rng.enemy_fire.randint(1, 100) > 80 / self.multiplicand:
                 EnemyProjectile(game=self.game, projectile_type="rocket1", damage=self.rocket_damage, pos=(self.pos.x + self.image.get_width() // 2 + 10, self.pos.y + self.image.get_height() + 10), laser_color="green")
 
 
@@ -217,14 +217,14 @@ class Boss1(Enemy):
         super().__init__(game, "boss1", enemy_number, enemy_group, pos, multiplicand)
         self.game = game
         self.state = "flight"
-        self.state_hold_time = randint(1, (20 // self.multiplicand))
+        self.state_hold_time = self.game.rng.boss_ai.randint(1, (20 // self.multiplicand))
         self.state_timer = 0
         self.speed_x = 50
 
         self.animation = self.game.assets["boss1/" + self.state].copy()
         self.rect = self.image.get_rect(center = self.pos)
 
-        self.hold_fire = randint(1, (10 // self.multiplicand))
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, (10 // self.multiplicand))
         self.shoot_timer = 0 
         self.laser_damage = 10 * self.multiplicand
         self.rocket_damage = 40 * self.multiplicand
@@ -243,7 +243,7 @@ class Boss1(Enemy):
 
         self.kill_projectiles()
         self.explosion_counter = 0
-        self.explosion_timer = 1 / randint(3, 9)
+        self.explosion_timer = 1 / self.game.rng.boss_ai.randint(3, 9)
 
     def start_autofire(self) -> None:
         """ Starts the autofire of the player. """
@@ -290,20 +290,20 @@ class Boss1(Enemy):
         dt (float): The time since the last frame.
         """
         self.stop_autofire()
-        mask_width, mask_height = self.enemy_mask.get_size()
+        mask_width, mask_height = self.mask.get_size()
         if self.explosion_counter <= 100:
             self.explosion_timer -= dt
             if self.explosion_timer <= 0:
                 while True:              
-                    rand_x = randint(self.rect.left, self.rect.right)
-                    rand_y = randint(self.rect.top, self.rect.bottom)
+                    rand_x = self.game.rng.fx.randint(self.rect.left, self.rect.right)
+                    rand_y = self.game.rng.fx.randint(self.rect.top, self.rect.bottom)
                     adjusted_x = rand_x - self.rect.left
                     adjusted_y = rand_y - self.rect.top 
                     if 0 <= adjusted_x < mask_width and 0 <= adjusted_y < mask_height:
                         if self.mask.get_at((rand_x - self.rect.left, rand_y - self.rect.top)):
                             explosion = BiggerExplosion(self.game, (rand_x, rand_y))
                             self.game.fx_list.append(explosion)
-                            self.explosion_timer = 1 / randint(5, 23)
+                            self.explosion_timer = 1 / self.game.rng.boss_ai.randint(5, 23)
                             self.explosion_counter += 1
                             break
 
@@ -314,10 +314,6 @@ class Boss1(Enemy):
             self.start_autofire()
             getattr(self.game, "proceed_level")()
 
-    def create_mask(self) -> None:
-        """ Creates a mask for the boss. """
-        self.mask = pg.mask.from_surface(self.image)    
-
     def set_x_direction(self) -> None:
         """ Sets the x direction of the boss. """
         if self.state == "left":
@@ -336,8 +332,8 @@ class Boss1(Enemy):
         self.state_timer += dt
         if self.state_timer >= self.state_hold_time:
             old_state = self.state
-            self.state = choice(["left", "right", "idle"])
-            self.state_hold_time = randint(1, 15)
+            self.state = self.game.rng.boss_ai.choice(["left", "right", "idle"])
+            self.state_hold_time = self.game.rng.boss_ai.randint(1, 15)
             self.state_timer = 0
             if old_state != self.state:
                 self.handle_image_and_mask()
@@ -359,6 +355,7 @@ class Boss1(Enemy):
             if self.state != "open":
                 self.animation.update(dt)
                 self.image = self.animation.get_img()
+                self.create_mask()
 
             if self.pos.y < 10:
                 self.direction.y = 1
@@ -372,6 +369,7 @@ class Boss1(Enemy):
                     self.state = "open"
                     self.animation = self.game.assets["boss1/" + self.state].copy()
                 self.image = self.animation.get_img()
+                self.create_mask()
                 self.animation.update(dt)
 
                 if self.animation.done:
@@ -419,14 +417,14 @@ class Boss1(Enemy):
         """
         self.shoot_timer += dt
         if self.shoot_timer >= self.hold_fire:
-            self.fire_mode = choice(["all", "cylone", "knight_rider", "laola", "random", "rocket"])
+            self.fire_mode = self.game.rng.enemy_fire.choice(["all", "cylone", "knight_rider", "laola", "random", "rocket"])
             self.shooting_state = "shooting"
 
     def reset_shooting(self) -> None:
         """ Resets the shooting of the boss. """
         self.shooting_state = "not shooting"
         self.shoot_timer = 0
-        self.hold_fire = randint(1, 10)
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, 10)
         self.shot_counter = 0
 
     def handle_fire_modi(self, dt: float) -> None:
@@ -505,7 +503,7 @@ class Boss1(Enemy):
 
             elif self.fire_mode == "random":
                 if self.projectile_interval_timer >= 0.5:
-                    laser_number = randint(1, 10)
+                    laser_number = self.game.rng.enemy_fire.randint(1, 10)
                     self.fire_weapon(laser_number)
                     self.shot_counter += 1
                     self.projectile_interval_timer = 0
@@ -583,14 +581,14 @@ class Boss2(Enemy):
         super().__init__(game, "boss2", enemy_number, enemy_group, pos, multiplicand)
         self.game = game
         self.state = "flight"
-        self.state_hold_time = randint(1, (20 // self.multiplicand))
+        self.state_hold_time = self.game.rng.boss_ai.randint(1, (20 // self.multiplicand))
         self.state_timer = 0
         self.speed_x = 50
 
         self.animation = self.game.assets["boss2/" + self.state].copy()
         self.rect = self.image.get_rect(center = self.pos)
 
-        self.hold_fire = randint(1, (10 // self.multiplicand))
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, (10 // self.multiplicand))
         self.shoot_timer = 0 
         self.laser_damage = 15 * self.multiplicand
         self.rocket_damage = 50 * self.multiplicand
@@ -609,7 +607,7 @@ class Boss2(Enemy):
 
         self.kill_projectiles()
         self.explosion_counter = 0
-        self.explosion_timer = 1 / randint(3, 9)
+        self.explosion_timer = 1 / self.game.rng.boss_ai.randint(3, 9)
 
     def start_autofire(self) -> None:
         """ Starts the autofire of the player. """
@@ -656,20 +654,20 @@ class Boss2(Enemy):
         dt (float): The time since the last frame.
         """
         self.stop_autofire()
-        mask_width, mask_height = self.enemy_mask.get_size()
+        mask_width, mask_height = self.mask.get_size()
         if self.explosion_counter <= 100:
             self.explosion_timer -= dt
             if self.explosion_timer <= 0:
                 while True:              
-                    rand_x = randint(self.rect.left, self.rect.right)
-                    rand_y = randint(self.rect.top, self.rect.bottom)
+                    rand_x = self.game.rng.fx.randint(self.rect.left, self.rect.right)
+                    rand_y = self.game.rng.fx.randint(self.rect.top, self.rect.bottom)
                     adjusted_x = rand_x - self.rect.left
                     adjusted_y = rand_y - self.rect.top 
                     if 0 <= adjusted_x < mask_width and 0 <= adjusted_y < mask_height:
                         if self.mask.get_at((rand_x - self.rect.left, rand_y - self.rect.top)):
                             explosion = BiggerExplosion(self.game, (rand_x, rand_y))
                             self.game.fx_list.append(explosion)
-                            self.explosion_timer = 1 / randint(5, 23)
+                            self.explosion_timer = 1 / self.game.rng.boss_ai.randint(5, 23)
                             self.explosion_counter += 1
                             break
 
@@ -680,10 +678,6 @@ class Boss2(Enemy):
             self.start_autofire()
             getattr(self.game, "proceed_level")()
 
-    def create_mask(self) -> None:
-        """ Creates a mask for the boss. """
-        self.mask = pg.mask.from_surface(self.image)    
-
     def set_x_direction(self) -> None:
         """ Sets the x direction of the boss. """
         if self.state == "left":
@@ -702,8 +696,8 @@ class Boss2(Enemy):
         self.state_timer += dt
         if self.state_timer >= self.state_hold_time:
             old_state = self.state
-            self.state = choice(["left", "right", "idle"])
-            self.state_hold_time = randint(1, 15)
+            self.state = self.game.rng.boss_ai.choice(["left", "right", "idle"])
+            self.state_hold_time = self.game.rng.boss_ai.randint(1, 15)
             self.state_timer = 0
             if old_state != self.state:
                 self.handle_image_and_mask()
@@ -725,6 +719,7 @@ class Boss2(Enemy):
             if self.state != "open":
                 self.animation.update(dt)
                 self.image = self.animation.get_img()
+                self.create_mask()
 
             if self.pos.y < 10:
                 self.direction.y = 1
@@ -738,6 +733,7 @@ class Boss2(Enemy):
                     self.state = "open"
                     self.animation = self.game.assets["boss2/" + self.state].copy()
                 self.image = self.animation.get_img()
+                self.create_mask()
                 self.animation.update(dt)
 
                 if self.animation.done:
@@ -789,14 +785,14 @@ class Boss2(Enemy):
         """
         self.shoot_timer += dt
         if self.shoot_timer >= self.hold_fire:
-            self.fire_mode = choice(["all", "cylone", "knight_rider", "laola", "random", "rocket", "spray"])
+            self.fire_mode = self.game.rng.enemy_fire.choice(["all", "cylone", "knight_rider", "laola", "random", "rocket", "spray"])
             self.shooting_state = "shooting"
 
     def reset_shooting(self) -> None:
         """ Resets the shooting of the boss. """
         self.shooting_state = "not shooting"
         self.shoot_timer = 0
-        self.hold_fire = randint(1, 10)
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, 10)
         self.shot_counter = 0
 
     def handle_fire_modi(self, dt: float) -> None:
@@ -875,7 +871,7 @@ class Boss2(Enemy):
 
             elif self.fire_mode == "random":
                 if self.projectile_interval_timer >= 0.5:
-                    laser_number = randint(1, 10)
+                    laser_number = self.game.rng.enemy_fire.randint(1, 10)
                     self.fire_weapon(laser_number)
                     self.shot_counter += 1
                     self.projectile_interval_timer = 0
@@ -953,14 +949,14 @@ class Boss3(Enemy):
         super().__init__(game, "boss3", enemy_number, enemy_group, pos, multiplicand)
         self.game: Game = game
         self.state = "flight"
-        self.state_hold_time = randint(1, (20 // self.multiplicand))
+        self.state_hold_time = self.game.rng.boss_ai.randint(1, (20 // self.multiplicand))
         self.state_timer = 0
         self.speed_x = 50
 
         self.animation = self.game.assets["boss3/" + self.state].copy()
         self.rect = self.image.get_rect(center = self.pos)
 
-        self.hold_fire = randint(1, (10 // self.multiplicand))
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, (10 // self.multiplicand))
         self.shoot_timer = 0 
         self.laser_damage = 20
         self.rocket_damage = 80
@@ -979,7 +975,7 @@ class Boss3(Enemy):
 
         self.kill_projectiles()
         self.explosion_counter = 0
-        self.explosion_timer = 1 / randint(3, 9)
+        self.explosion_timer = 1 / self.game.rng.boss_ai.randint(3, 9)
 
     def start_autofire(self) -> None:
         """ Starts the autofire of the player. """
@@ -1026,20 +1022,20 @@ class Boss3(Enemy):
         dt (float): The time since the last frame.
         """
         self.stop_autofire()
-        mask_width, mask_height = self.enemy_mask.get_size()
+        mask_width, mask_height = self.mask.get_size()
         if self.explosion_counter <= 100:
             self.explosion_timer -= dt
             if self.explosion_timer <= 0:
                 while True:              
-                    rand_x = randint(self.rect.left, self.rect.right)
-                    rand_y = randint(self.rect.top, self.rect.bottom)
+                    rand_x = self.game.rng.fx.randint(self.rect.left, self.rect.right)
+                    rand_y = self.game.rng.fx.randint(self.rect.top, self.rect.bottom)
                     adjusted_x = rand_x - self.rect.left
                     adjusted_y = rand_y - self.rect.top 
                     if 0 <= adjusted_x < mask_width and 0 <= adjusted_y < mask_height:
                         if self.mask.get_at((rand_x - self.rect.left, rand_y - self.rect.top)):
                             explosion = BiggerExplosion(self.game, (rand_x, rand_y))
                             self.game.fx_list.append(explosion)
-                            self.explosion_timer = 1 / randint(5, 23)
+                            self.explosion_timer = 1 / self.game.rng.boss_ai.randint(5, 23)
                             self.explosion_counter += 1
                             break
 
@@ -1050,10 +1046,6 @@ class Boss3(Enemy):
             self.start_autofire()
             getattr(self.game, "proceed_level")()
 
-    def create_mask(self) -> None:
-        """ Creates a mask for the boss. """
-        self.mask = pg.mask.from_surface(self.image)    
-
     def set_x_direction(self) -> None:
         """ Sets the x direction of the boss. """
         if self.state == "left":
@@ -1072,8 +1064,8 @@ class Boss3(Enemy):
         self.state_timer += dt
         if self.state_timer >= self.state_hold_time:
             old_state = self.state
-            self.state = choice(["left", "right", "idle"])
-            self.state_hold_time = randint(1, 15)
+            self.state = self.game.rng.boss_ai.choice(["left", "right", "idle"])
+            self.state_hold_time = self.game.rng.boss_ai.randint(1, 15)
             self.state_timer = 0
             if old_state != self.state:
                 self.handle_image_and_mask()
@@ -1095,6 +1087,7 @@ class Boss3(Enemy):
             if self.state != "open":
                 self.animation.update(dt)
                 self.image = self.animation.get_img()
+                self.create_mask()
 
             if self.pos.y < 10:
                 self.direction.y = 1
@@ -1108,6 +1101,7 @@ class Boss3(Enemy):
                     self.state = "open"
                     self.animation = self.game.assets["boss3/" + self.state].copy()
                 self.image = self.animation.get_img()
+                self.create_mask()
                 self.animation.update(dt)
 
                 if self.animation.done:
@@ -1159,14 +1153,14 @@ class Boss3(Enemy):
         """
         self.shoot_timer += dt
         if self.shoot_timer >= self.hold_fire:
-            self.fire_mode = choice(["all", "cylone", "knight_rider", "laola", "random", "rocket", "spray"])
+            self.fire_mode = self.game.rng.enemy_fire.choice(["all", "cylone", "knight_rider", "laola", "random", "rocket", "spray"])
             self.shooting_state = "shooting"
 
     def reset_shooting(self) -> None:
         """ Resets the shooting of the boss. """
         self.shooting_state = "not shooting"
         self.shoot_timer = 0
-        self.hold_fire = randint(1, 10)
+        self.hold_fire = self.game.rng.enemy_fire.randint(1, 10)
         self.shot_counter = 0
 
     def handle_fire_modi(self, dt: float) -> None:
@@ -1245,7 +1239,7 @@ class Boss3(Enemy):
 
             elif self.fire_mode == "random":
                 if self.projectile_interval_timer >= 0.1:
-                    laser_number = randint(1, 24)
+                    laser_number = self.game.rng.enemy_fire.randint(1, 24)
                     self.fire_weapon(laser_number)
                     self.shot_counter += 1
                     self.projectile_interval_timer = 0
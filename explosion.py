@@ -1,10 +1,31 @@
+from pool import Pooled
+from utils import get_transformed
+from render_scale import RenderScale
+
 import pygame as pg
 from typing import TypeVar
 
 Game = TypeVar("Game")
 Animation = TypeVar("Animation")
+Effect = TypeVar("Effect")
+
+
+def draw_effects(surf: pg.Surface, effects: list[Effect], render_scale: RenderScale | None = None) -> list[pg.Rect]:
+    """
+    Draws the explosions with one Surface.blits call, the frames are blitted from their atlas sheets with the area of the frame.
+    Args:
+    surf (pg.Surface): The surface to draw on.
+    effects (list[Effect]): The explosions.
+    render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+    Returns:
+    list[pg.Rect]: The drawn areas.
+    """
+    if render_scale is not None and render_scale.scale != 1:  # the downscaled variants are separate images
+        return [effect.draw(surf, render_scale) for effect in effects]
+    return surf.blits([item for item in (effect.blit_item() for effect in effects) if item != None])
+
 
-class ShipExplosion:
+class ShipExplosion(Pooled):
     def __init__(self, game: Game, pos: tuple[int], rotate: int = 180) -> None:
         """
         Initialize the ShipExplosion object.
@@ -15,7 +36,7 @@ class ShipExplosion:
         """
         self.rotate: int = rotate
         self.animation: Animation = game.assets["explosion"].copy()
-        self.image: pg.Surface = pg.transform.rotate(self.animation.get_img(), self.rotate)
+        self.image: pg.Surface = get_transformed(self.animation.get_img(), angle=self.rotate)
         self.rect: pg.Rect = self.image.get_rect(center = pos)
         self.pos: pg.Vector2 = pg.Vector2(self.rect.topleft)
         self.speed: int = 50
@@ -38,21 +59,46 @@ class ShipExplosion:
         self.animation.update(dt)
         self.image = self.animation.get_img()
         if self.image != None:
-            self.image = pg.transform.rotate(self.image, self.rotate)
+            self.image = get_transformed(self.image, angle=self.rotate)
 
         return self.remove_explosion
+
+    @staticmethod
+    def prewarm_frames(assets: dict, rotate: int = 180) -> None:
+        """
+        Creates the rotated frames of the explosion, so they don't have to be rotated while the game runs.
+        Args:
+        assets (dict): The game assets.
+        rotate (int): The rotation of the explosion. Defaults to 180.
+        """
+        for img in assets["explosion"].img_list:
+            get_transformed(img, angle=rotate)
     
-    def draw(self, surf: pg.Surface) -> None:
+    def blit_item(self) -> tuple[pg.Surface, tuple[int, int], pg.Rect] | None:
+        """
+        Returns the source, the position and the area of the explosion for a batched Surface.blits call.
+        Returns:
+        tuple[pg.Surface, tuple[int, int], pg.Rect] | None: The rotated frame and its whole area, None if the animation is done.
+        """
+        if self.image != None:
+            return self.image, self.rect.topleft, self.image.get_rect()
+        return None
+
+    def draw(self, surf: pg.Surface, render_scale: RenderScale | None = None) -> pg.Rect:
         """
         Draw the explosion animation on the given surface.
         Args:
         surf (pg.Surface): The surface to draw on.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        pg.Rect: The drawn area.
         """
         if self.image != None:
-            surf.blit(self.image, self.rect)
+            return surf.blit(self.image, self.rect) if render_scale is None else render_scale.blit(surf, self.image, self.rect.topleft)
+        return pg.Rect(self.rect.topleft, (0, 0))
     
 
-class SmallExplosion:
+class SmallExplosion(Pooled):
     def __init__(self, game: Game, pos: tuple[int]) -> None:
         """
         Initialize the SmallExplosion object.
@@ -82,17 +128,32 @@ class SmallExplosion:
 
         return self.remove_hit
     
-    def draw(self, surf: pg.Surface) -> None:
+    def blit_item(self) -> tuple[pg.Surface, tuple[int, int], pg.Rect] | None:
+        """
+        Returns the source, the position and the area of the explosion for a batched Surface.blits call.
+        Returns:
+        tuple[pg.Surface, tuple[int, int], pg.Rect] | None: The atlas sheet and the area of the current frame, None if the animation is done.
+        """
+        source = self.animation.get_source()
+        if source != None:
+            return source[0], self.rect.topleft, source[1]
+        return None
+
+    def draw(self, surf: pg.Surface, render_scale: RenderScale | None = None) -> pg.Rect:
         """
         Draw the explosion animation on the given surface.
         Args:
         surf (pg.Surface): The surface to draw on.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        pg.Rect: The drawn area.
         """
         if self.image != None:
-            surf.blit(self.image, self.rect)
+            return surf.blit(self.image, self.rect) if render_scale is None else render_scale.blit(surf, self.image, self.rect.topleft)
+        return pg.Rect(self.rect.topleft, (0, 0))
 
 
-class BiggerExplosion:
+class BiggerExplosion(Pooled):
     def __init__(self, game: Game, pos: tuple[int]) -> None:
         """
         Initialize the BiggerExplosion object.
@@ -122,11 +183,26 @@ class BiggerExplosion:
 
         return self.remove_hit
     
-    def draw(self, surf: pg.Surface) -> None:
+    def blit_item(self) -> tuple[pg.Surface, tuple[int, int], pg.Rect] | None:
+        """
+        Returns the source, the position and the area of the explosion for a batched Surface.blits call.
+        Returns:
+        tuple[pg.Surface, tuple[int, int], pg.Rect] | None: The atlas sheet and the area of the current frame, None if the animation is done.
+        """
+        source = self.animation.get_source()
+        if source != None:
+            return source[0], self.rect.topleft, source[1]
+        return None
+
+    def draw(self, surf: pg.Surface, render_scale: RenderScale | None = None) -> pg.Rect:
         """
         Draw the explosion animation on the given surface.
         Args:
         surf (pg.Surface): The surface to draw on.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        pg.Rect: The drawn area.
         """
         if self.image != None:
-            surf.blit(self.image, self.rect)
\ No newline at end of file
+            return surf.blit(self.image, self.rect) if render_scale is None else render_scale.blit(surf, self.image, self.rect.topleft)
+        return pg.Rect(self.rect.topleft, (0, 0))
\ No newline at end of file
@@ -0,0 +1,40 @@
+import settings as stgs
+
+from time import perf_counter, sleep
+
+
+class FrameLimiter:
+    def __init__(self, fps_cap: int | None = stgs.FPS_CAP, spin_time: float = stgs.FRAME_SPIN_TIME) -> None:
+        """
+        Paces the frames to a maximum frame rate. It sleeps for the most of the remaining frame time and
+        busy-waits for the rest, because sleep can wake up a few milliseconds late.
+        Args:
+        fps_cap (int | None): The maximum number of frames per second, None doesn't limit the frame rate.
+        spin_time (float): The part of the remaining frame time in seconds that is busy-waited instead of slept.
+        """
+        self.frame_duration: float = 0 if fps_cap is None else 1 / fps_cap
+        self.spin_time: float = spin_time
+        self.last_tick: float = perf_counter()
+        self.deadline: float = self.last_tick
+
+    def tick(self) -> float:
+        """
+        Waits until the next frame is due.
+        Returns:
+        float: The time since the last tick in seconds.
+        """
+        self.deadline += self.frame_duration
+        remaining = self.deadline - perf_counter()
+        if remaining > self.spin_time:
+            sleep(remaining - self.spin_time)
+        while perf_counter() < self.deadline:
+            pass
+        now = perf_counter()
+        if now - self.deadline > self.frame_duration:
+            self.deadline = now  # too late for the schedule, e.g. after a long frame, don't rush the following frames
+        frame_time, self.last_tick = now - self.last_tick, now
+        return frame_time
+
+    def reset(self) -> None:
+        """ Starts the time of the next frame now, e.g. after the game was paused, so the pause doesn't count as frame time. """
+        self.last_tick = self.deadline = perf_counter()
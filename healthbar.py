@@ -1,19 +1,191 @@
+import settings as stgs
+from render_scale import RenderScale
+
 import pygame as pg
+import numpy as np
 
 from typing import Final, TypeVar
 
 Game = TypeVar("Game")
+Healthbar_object = TypeVar("Healthbar_object")
 
 
-class Healthbar:
+class HealthbarManager:
     DARK_ORANGE: Final[tuple[int]] = (238, 106, 80)
     RED: Final[tuple[int]] = (247, 0, 0)
     GREEN: Final[tuple[int]] = (0, 247, 0)
     HEALTHBAR_HEIGHT: Final[int] = 6
-    
-    def __init__(self, game: Game, max_health: int, current_health: int, image_width: int, sprite_pos: tuple[int], image_height: int = 0) -> None:
+
+    def __init__(self, capacity: int = stgs.HEALTHBAR_CAPACITY) -> None:
+        """
+        Owns the data of all healthbars in compact arrays (one row per bar, in the order the bars were added)
+        and draws them in one batched blit. The Healthbar objects are only handles to their row.
+        A bar is dropped when its health is used up, when its owner sprite is killed or when it is removed.
+        Args:
+        capacity (int): The number of rows to start with, the arrays grow if they are full.
+        """
+        self.capacity: int = 0
+        self.size: int = 0
+        self.left: np.ndarray = np.zeros(0)  # not rounded, pygame truncates the positions of the background and the fill on its own
+        self.top: np.ndarray = np.zeros(0)
+        self.previous_left: np.ndarray = np.zeros(0)  # at the last snapshot, for the interpolation
+        self.previous_top: np.ndarray = np.zeros(0)
+        self.fresh: np.ndarray = np.zeros(0, bool)  # added since the last snapshot
+        self.width: np.ndarray = np.zeros(0, np.int32)
+        self.length: np.ndarray = np.zeros(0, np.int32)  # of the green fill
+        self.health: np.ndarray = np.zeros(0)
+        self.dropped: np.ndarray = np.zeros(0, bool)
+        self.bars: list[Healthbar_object] = []
+        self.owners: list[pg.sprite.Sprite | None] = []
+        self.strips: dict[int, tuple[pg.Surface, pg.Surface]] = {}  # bar width -> (background strip, fill strip)
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        """
+        Resizes the arrays, the data of the used rows is kept.
+        Args:
+        capacity (int): The new number of rows.
+        """
+        for name in ("left", "top", "previous_left", "previous_top", "fresh", "width", "length", "health", "dropped"):
+            old: np.ndarray = getattr(self, name)
+            new: np.ndarray = np.zeros(capacity, old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def __len__(self) -> int:
+        """ Returns the number of bars that are not dropped. """
+        return int(np.count_nonzero(~self.dropped[:self.size]))
+
+    def add(self, bar: Healthbar_object, owner: pg.sprite.Sprite | None = None) -> int:
+        """
+        Adds a bar in a new row.
+        Args:
+        bar (Healthbar_object): The bar.
+        owner (pg.sprite.Sprite | None): The sprite the bar belongs to, the bar is dropped when it is killed. Defaults to None.
+        Returns:
+        int: The row.
+        """
+        if self.size == self.capacity:
+            self.grow(self.capacity * 2)
+        row = self.size
+        self.size += 1
+        self.width[row] = bar.healthbar_width
+        self.dropped[row] = False
+        self.fresh[row] = True
+        self.bars.append(bar)
+        self.owners.append(owner)
+        return row
+
+    def set(self, row: int, center_pos: list[int], length: int, health: int | float) -> None:
+        """
+        Sets the position, the fill length and the health of a bar.
+        Args:
+        row (int): The row of the bar.
+        center_pos (list[int]): The center of the bar.
+        length (int): The length of the green fill.
+        health (int | float): The current health.
+        """
+        self.left[row] = center_pos[0] - self.width[row] // 2
+        self.top[row] = center_pos[1] - self.HEALTHBAR_HEIGHT // 2
+        self.length[row] = max(0, length)  # pg.draw.rect draws nothing for a negative width
+        self.health[row] = health
+        if self.fresh[row]:
+            self.previous_left[row], self.previous_top[row] = self.left[row], self.top[row]
+
+    def snapshot(self) -> None:
+        """ Keeps the current positions of the bars, they are interpolated from there to the next positions. """
+        used = slice(0, self.size)
+        self.previous_left[used] = self.left[used]
+        self.previous_top[used] = self.top[used]
+        self.fresh[used] = False
+
+    def remove(self, bar: Healthbar_object) -> None:
+        """
+        Drops a bar, it isn't drawn anymore and its row is freed with the next sweep.
+        Args:
+        bar (Healthbar_object): The bar.
+        """
+        if bar.row is not None:
+            self.dropped[bar.row] = True
+
+    def sweep(self) -> None:
+        """ Drops the bars whose health is used up or whose owner was killed and closes the gaps, the order of the bars is kept. """
+        used = slice(0, self.size)
+        self.dropped[used] |= self.health[used] <= 0
+        for row, owner in enumerate(self.owners):
+            if owner is not None and not owner.alive():
+                self.dropped[row] = True
+        if not self.dropped[used].any():
+            return
+        keep: np.ndarray = ~self.dropped[used]
+        for name in ("left", "top", "previous_left", "previous_top", "fresh", "width", "length", "health", "dropped"):
+            array: np.ndarray = getattr(self, name)
+            kept: np.ndarray = array[used][keep]
+            array[:len(kept)] = kept
+        for bar, kept_bar in zip(self.bars, keep.tolist()):
+            if not kept_bar:
+                bar.row = None
+        self.bars = [bar for bar, kept_bar in zip(self.bars, keep.tolist()) if kept_bar]
+        self.owners = [owner for owner, kept_bar in zip(self.owners, keep.tolist()) if kept_bar]
+        self.size = len(self.bars)
+        for row, bar in enumerate(self.bars):
+            bar.row = row
+
+    def get_strips(self, width: int) -> tuple[pg.Surface, pg.Surface]:
+        """
+        Returns the background strip (dark orange frame, red inside) and the green fill strip of a bar width, they are created once per width.
+        Args:
+        width (int): The width of the bar.
+        Returns:
+        tuple[pg.Surface, pg.Surface]: The background strip and the fill strip.
+        """
+        strips: tuple[pg.Surface, pg.Surface] | None = self.strips.get(width)
+        if strips is None:
+            background = pg.Surface((width, self.HEALTHBAR_HEIGHT))
+            background.fill(self.DARK_ORANGE)
+            background.fill(self.RED, (1, 1, width - 2, self.HEALTHBAR_HEIGHT - 2))
+            fill = pg.Surface((max(0, width - 2), self.HEALTHBAR_HEIGHT - 2))
+            fill.fill(self.GREEN)
+            strips = self.strips[width] = (background, fill)
+        return strips
+
+    def draw(self, surf: pg.Surface, alpha: float = 1, render_scale: RenderScale | None = None) -> list[pg.Rect]:
+        """
+        Draws every bar that is not dropped with one batched blit.
+        Args:
+        surf (pg.Surface): The surface to draw on.
+        alpha (float): Where to draw between the positions of the last snapshot (0) and the current positions (1). Defaults to 1.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        list[pg.Rect]: The drawn areas of the bars.
         """
-        Initialize the healthbar object.
+        rows: np.ndarray = np.flatnonzero(~self.dropped[:self.size])
+        if not len(rows):
+            return []
+        left, top = self.left[rows], self.top[rows]
+        if alpha < 1:
+            left = self.previous_left[rows] + (left - self.previous_left[rows]) * alpha
+            top = self.previous_top[rows] + (top - self.previous_top[rows]) * alpha
+        blit_sequence: list[tuple] = []
+        for background_pos, fill_pos, width, length in zip(np.stack((left, top), 1).astype(np.int64).tolist(), np.stack((left + 1, top + 1), 1).astype(np.int64).tolist(),
+                                                           self.width[rows].tolist(), self.length[rows].tolist()):
+            background, fill = self.get_strips(width)
+            if render_scale is not None and render_scale.scale != 1:
+                background, fill = render_scale.image(background), render_scale.image(fill)
+                background_pos, fill_pos, length = render_scale.pos(background_pos), render_scale.pos(fill_pos), render_scale.length(length)
+            blit_sequence.append((background, background_pos))
+            blit_sequence.append((fill, fill_pos, (0, 0, length, fill.get_height())))
+        return surf.blits(blit_sequence)[::2]  # the fills are inside of the backgrounds
+
+
+class Healthbar:
+    HEALTHBAR_HEIGHT: Final[int] = HealthbarManager.HEALTHBAR_HEIGHT
+
+    def __init__(self, game: Game, max_health: int, current_health: int, image_width: int, sprite_pos: tuple[int], image_height: int = 0,
+                 owner: pg.sprite.Sprite | None = None) -> None:
+        """
+        Initialize the healthbar object, it is a handle to its row in the healthbar manager of the game.
         Args:
         game (Game): The game object.
         max_health (int): The maximum health of the object.
@@ -21,21 +193,19 @@ class Healthbar:
         image_width (int): The width of the image.
         sprite_pos (tuple[int]): The position of the sprite.
         image_height (int): The height of the image. Defaults to 0.
+        owner (pg.sprite.Sprite | None): The sprite of the healthbar, the bar is dropped when it is killed. Defaults to None.
         """
         self.game: Game = game
+        self.manager: HealthbarManager = game.healthbars
         self.max_health: int = max_health
-        self.current_health: int = current_health
         self.img_width: int = image_width
         self.img_height: int = image_height
         self.healthbar_width: int = int(self.img_width * 0.9)
         self.healthbar_height_offset: int = self.HEALTHBAR_HEIGHT if self.img_height == 0 else -20
         self.side_picker: int = -1 if self.img_height == 0 else 1
         self.center_pos: list[int] = [0, 0]
-        self.center_pos[0] = sprite_pos[0] + (self.img_width // 2)
-        self.center_pos[1] = sprite_pos[1] + (self.side_picker * self.img_height) + 10 + self.healthbar_height_offset
-        self.health_percent: float = self.current_health * 100 / self.max_health
-        self.healthbar_length: int = round(self.health_percent * (self.healthbar_width - 2) / 100)
-        self.game.healthbars.append(self)
+        self.row: int | None = self.manager.add(self, owner)
+        self.update(current_health, sprite_pos)
 
     def update(self, current_health: int | float, sprite_pos: tuple[int]) -> None:
         """
@@ -49,13 +219,9 @@ class Healthbar:
         self.center_pos[1] = sprite_pos[1] + (self.side_picker * self.img_height) + 10 + self.healthbar_height_offset
         self.health_percent = self.current_health * 100 / self.max_health
         self.healthbar_length = round(self.health_percent * (self.healthbar_width - 2) / 100)
+        if self.row is not None:
+            self.manager.set(self.row, self.center_pos, self.healthbar_length, self.current_health)
 
-    def draw(self, surf: pg.Surface) -> None:
-        """
-        Draws the healthbar on the given surface.
-        Args:
-        surf (pg.Surface): The surface to draw on.
-        """
-        pg.draw.rect(surf, self.DARK_ORANGE, (self.center_pos[0] - self.healthbar_width // 2, self.center_pos[1] - self.HEALTHBAR_HEIGHT // 2, self.healthbar_width, self.HEALTHBAR_HEIGHT))
-        pg.draw.rect(surf, self.RED, (self.center_pos[0] - self.healthbar_width // 2 + 1, self.center_pos[1] - self.HEALTHBAR_HEIGHT // 2 + 1, self.healthbar_width - 2, self.HEALTHBAR_HEIGHT - 2))
-        pg.draw.rect(surf, self.GREEN, (self.center_pos[0] - self.healthbar_width // 2 + 1, self.center_pos[1] - self.HEALTHBAR_HEIGHT // 2 + 1, self.healthbar_length, self.HEALTHBAR_HEIGHT - 2))
\ No newline at end of file
+    def remove(self) -> None:
+        """ Removes the healthbar from the manager. """
+        self.manager.remove(self)
@@ -0,0 +1,49 @@
+from render_scale import RenderScale
+
+import pygame as pg
+
+
+class Interpolator:
+    def __init__(self) -> None:
+        """
+        Keeps the positions of the sprites before the last simulation step, so a rendered frame
+        can show them between their previous and their current position.
+        """
+        # sprite -> (pool generation, position), a pooled sprite that was reused since the snapshot has a new generation
+        self.previous_pos: dict[pg.sprite.Sprite, tuple[int, tuple[int, int]]] = {}
+
+    def snapshot(self, groups: list[pg.sprite.Group]) -> None:
+        """
+        Keeps the current positions of the sprites, they are interpolated from there to the next positions.
+        Args:
+        groups (list[pg.sprite.Group]): The groups of the sprites.
+        """
+        self.previous_pos = {sprite: (getattr(sprite, "pool_generation", 0), sprite.rect.topleft) for group in groups for sprite in group}
+
+    def draw(self, surf: pg.Surface, group: pg.sprite.Group, alpha: float = 1, render_scale: RenderScale | None = None) -> list[pg.Rect]:
+        """
+        Draws the sprites of a group, like pg.sprite.Group.draw. Sprites that were added since the last snapshot
+        (including pooled sprites that were reused) are drawn at their current position.
+        Args:
+        surf (pg.Surface): The surface to draw on.
+        group (pg.sprite.Group): The group of the sprites.
+        alpha (float): Where to draw between the position of the last snapshot (0) and the current position (1). Defaults to 1.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        list[pg.Rect]: The drawn areas of the sprites.
+        """
+        scaled = render_scale is not None and render_scale.scale != 1
+        if alpha >= 1 and not scaled:
+            group.draw(surf)
+            return list(group.spritedict.values())
+        blit_sequence: list[tuple[pg.Surface, tuple[int, int]]] = []
+        for sprite in group:
+            x, y = sprite.rect.topleft
+            generation, previous = self.previous_pos.get(sprite, (None, (x, y)))
+            previous_x, previous_y = previous if generation == getattr(sprite, "pool_generation", 0) else (x, y)
+            pos = (x, y) if alpha >= 1 else (previous_x + (x - previous_x) * alpha, previous_y + (y - previous_y) * alpha)
+            if scaled:
+                blit_sequence.append((render_scale.image(sprite.image), render_scale.pos(pos)))
+            else:
+                blit_sequence.append((sprite.image, (round(pos[0]), round(pos[1]))))
+        return surf.blits(blit_sequence)
@@ -0,0 +1,66 @@
+import settings as stgs
+
+import pygame as pg
+from typing import Callable, Hashable, TypeVar
+
+AssetRegistry = TypeVar("AssetRegistry")
+
+
+class LayerCache:
+    def __init__(self, assets: AssetRegistry) -> None:
+        """
+        Keeps scaled copies of images and retained surfaces (layers) of static screen content,
+        so they aren't scaled or composited every frame.
+        Args:
+        assets (AssetRegistry): The game assets.
+        """
+        self.assets: AssetRegistry = assets
+        self.scaled_images: dict[tuple[str, tuple[int, int]], pg.Surface] = {}
+        self.layers: dict[str, tuple[Hashable, pg.Surface]] = {}  # name -> (inputs, surface)
+        self.builds: int = 0
+
+    def scaled(self, key: str, size: tuple[int, int]) -> pg.Surface:
+        """
+        Returns an image asset scaled to a size, it is only scaled once per size.
+        Args:
+        key (str): The asset key.
+        size (tuple[int, int]): The size of the image.
+        Returns:
+        pg.Surface: The scaled image.
+        """
+        img: pg.Surface | None = self.scaled_images.get((key, size))
+        if img is None:
+            img = self.scaled_images[(key, size)] = pg.transform.scale(self.assets[key], size)
+        return img
+
+    def get(self, name: str, inputs: Hashable, build: Callable[[pg.Surface], None], size: tuple[int, int] = stgs.MAIN_WINDOW_RESOLUTION) -> pg.Surface:
+        """
+        Returns a layer, it is only built again if its inputs or its size changed.
+        Args:
+        name (str): The name of the layer, e.g. 'menu'.
+        inputs (Hashable): Everything the content of the layer depends on, e.g. the highscores surface.
+        build (Callable[[pg.Surface], None]): Draws the content on a new (opaque) layer surface.
+        size (tuple[int, int]): The size of the layer. Defaults to the main window resolution.
+        Returns:
+        pg.Surface: The layer.
+        """
+        cached: tuple[Hashable, pg.Surface] | None = self.layers.get(name)
+        if cached is not None and cached[0] == (inputs, size):
+            return cached[1]
+        layer = pg.Surface(size)
+        build(layer)
+        self.layers[name] = ((inputs, size), layer)
+        self.builds += 1
+        return layer
+
+    def invalidate(self, name: str | None = None) -> None:
+        """
+        Drops a layer, or every layer and scaled image if no name is given, so they are built again when they are used.
+        Args:
+        name (str | None): The name of the layer. Defaults to None.
+        """
+        if name is None:
+            self.layers.clear()
+            self.scaled_images.clear()
+        else:
+            self.layers.pop(name, None)
@@ -1,12 +1,32 @@
+from startup_profile import profiler  # first, so it can time the other imports
 import settings as stgs
 from spaceship import Spaceship
-from explosion import SmallExplosion
+from projectile import ProjectileEngine, PLAYER, ENEMY, prewarm_frames
+from explosion import SmallExplosion, ShipExplosion, draw_effects
+from healthbar import HealthbarManager
+from background import TiledBackground
 from drone import Drone
 from enemy_creator import enemy_creator
-from utils import load_image, load_images, create_highscores_screen, sort_and_write_highscores, Animation, Helpsite
+from utils import create_highscores_screen, sort_and_write_highscores, coalesce_mouse_motion, cached_variants, Helpsite
+from assets import AssetRegistry
+from asset_cache import clear_cache
+from spatial_hash import SpatialHash
 from button import Button
-
-from time import time
+from renderer import DirtyRectRenderer
+from layers import LayerCache
+from text_cache import TextCache, GlyphAtlas
+from interpolation import Interpolator
+from frame_limiter import FrameLimiter
+from render_scale import RenderScale
+from rng import RandomStreams
+from pool import pool_report
+from replay import InputRecorder, InputReplay
+
+import argparse
+import math
+import os
+import sys
+from time import perf_counter
 import pygame as pg
 from typing import Final
 
@@ -14,11 +34,28 @@ from typing import Final
 class Game:
     WHITE: Final[tuple[int]] = (247, 247, 247)
 
-    def __init__(self) -> None:
-        """ Initializes the game. """
+    def __init__(self, headless: bool = False, seed: int | None = None) -> None:
+        """
+        Initializes the game.
+        Args:
+        headless (bool): Whether to run without a window (SDL dummy video driver) and without updating the display. Defaults to False.
+        seed (int | None): The seed of the random streams, None uses RNG_SEED. Defaults to None.
+        """
+        profiler.start_laps()
+        self.headless: bool = headless
+        self.rng: RandomStreams = RandomStreams(stgs.RNG_SEED if seed is None else seed)
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pg.init()
+        profiler.lap("pg.init")
         self.main_window: pg.display = pg.display.set_mode(stgs.MAIN_WINDOW_RESOLUTION)
-        self.game_window: pg.Surface = pg.Surface(stgs.GAME_WINDOW_RESOLUTION)
+        profiler.lap("pg.display.set_mode")
+        self.render_scale: RenderScale = RenderScale(stgs.RENDER_SCALE)
+        play_area = pg.Rect((195, 95), stgs.GAME_WINDOW_RESOLUTION)
+        # the game is drawn in place on the screen, or into a smaller render buffer that is upscaled, it is simulated in GAME_WINDOW_RESOLUTION
+        self.game_window: pg.Surface = (self.main_window.subsurface(play_area) if self.render_scale.scale == 1
+                                        else pg.Surface(self.render_scale.size))
+        self.renderer: DirtyRectRenderer = DirtyRectRenderer(self.main_window, play_area, present=not headless)
         self.fps: int = 0
 
         self.player_group: pg.sprite.Group = pg.sprite.Group()
@@ -26,57 +63,33 @@ class Game:
         self.player_projectile_group: pg.sprite.Group = pg.sprite.Group()
         self.enemy_group: pg.sprite.Group = pg.sprite.Group()
         self.enemy_projectile_group: pg.sprite.Group = pg.sprite.Group()
+        self.projectiles: ProjectileEngine = ProjectileEngine()
         self.upgrade_group: pg.sprite.Group = pg.sprite.Group()
         self.fx_list: list[object] = []
-        self.healthbars: list[object] = []
-
-        self.assets: dict[function | object] = {
-            "background": load_image("backgrounds", "00.png", 1),
-            "title": load_image("", "title.png", 1),
-            "logo": load_image("", "logo.png", 1),
-            "live_image": load_image("", "spaceship.png", 1),
-            "ship/idle": Animation(load_images("ship/idle", scale_factor=0.25), animation_duration=0.5, loop=True),
-            "ship/curve": Animation(load_images("ship/curve", scale_factor=0.25), animation_duration=0.5, loop=True),
-            "laser/idle": load_image("ship/weapons", "laser idle.png", 0.25),
-            "laser/curve": load_image("ship/weapons", "laser curve.png", 0.25),
-            "rocket_launcher/idle": load_image("ship/weapons", "rocketlauncher idle.png", 0.25),
-            "rocket_launcher/curve": load_image("ship/weapons", "rocketlauncher curve.png", 0.25),
-            "sprayer/idle": load_image("ship/weapons", "sprayer idle.png", 0.25),
-            "sprayer/curve": load_image("ship/weapons", "sprayer curve.png", 0.25),
-            "drone/idle": Animation(load_images("drone/idle", scale_factor=0.3), animation_duration=0.5, loop=True),
-            "drone/curve": Animation(load_images("drone/curve", scale_factor=0.3), animation_duration=0.5, loop=True),
-            "enemy1/idle": Animation(load_images("enemies/ship1/idle", scale_factor=0.25), animation_duration=0.5, loop=True),
-            "enemy2/idle": Animation(load_images("enemies/ship2/idle", scale_factor=0.25), animation_duration=0.5, loop=True),
-            "enemy3/idle": Animation(load_images("enemies/ship3/idle", scale_factor=0.25), animation_duration=0.5, loop=True),
-            "boss1/idle": Animation(load_images("enemies/boss1/idle", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss1/left": Animation(load_images("enemies/boss1/left(right)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss1/right": Animation(load_images("enemies/boss1/right(left)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss1/flight": Animation(load_images("enemies/boss1/flight", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss1/open": Animation(load_images("enemies/boss1/open", scale_factor=0.75), animation_duration=2, loop=False),
-            "boss2/idle": Animation(load_images("enemies/boss2/idle", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss2/left": Animation(load_images("enemies/boss2/left(right)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss2/right": Animation(load_images("enemies/boss2/right(left)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss2/flight": Animation(load_images("enemies/boss2/flight", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss2/open": Animation(load_images("enemies/boss2/open", scale_factor=0.75), animation_duration=2, loop=False),
-            "boss3/idle": Animation(load_images("enemies/boss3/idle", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss3/left": Animation(load_images("enemies/boss3/left(right)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss3/right": Animation(load_images("enemies/boss3/right(left)", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss3/flight": Animation(load_images("enemies/boss3/flight", scale_factor=0.75), animation_duration=0.5, loop=True),
-            "boss3/open": Animation(load_images("enemies/boss3/open", scale_factor=0.75), animation_duration=2, loop=False),
-            "laser": load_images("ammo/lasers", scale_factor=0.5),
-            "rocket1": Animation(load_images("ammo/rockets/rocket1", scale_factor=0.25), animation_duration=2, loop=True),
-            "upgrade/background": load_images("upgrades/backgrounds", scale_factor=0.5),
-            "upgrade/image": load_images("upgrades/images", scale_factor=0.5),
-            "explosion": Animation(load_images("fx/ship explosion", scale_factor=0.5), animation_duration=1, loop=False),
-            "projectile_hit": Animation(load_images("fx/small explosion", scale_factor=0.5), animation_duration=0.5, loop=False),
-            "bigger_explosion": Animation(load_images("fx/small explosion", scale_factor=1), animation_duration=0.5, loop=False),
-        }
+        self.healthbars: HealthbarManager = HealthbarManager()
+        self.interpolator: Interpolator = Interpolator()
+
+        self.assets: AssetRegistry = AssetRegistry(stgs.ASSETS, lazy_groups=set(stgs.BOSS_ASSETS.values()))
+        profiler.lap("assets (wall time)")
+        self.layers: LayerCache = LayerCache(self.assets)
+        # opaque, so a redrawn region doesn't blend with the previous frame where the image isn't fully opaque
+        self.background: TiledBackground = TiledBackground.from_surface(self.render_scale.image(self.assets["background"]).convert())
+        prewarm_frames(self.projectiles, self.assets)
+        ShipExplosion.prewarm_frames(self.assets)
+        Spaceship.prewarm_frames(self.assets)
+        Drone.prewarm_frames(self.assets)
+        self.render_scale.prewarm(self.projectiles.images)
+        if self.render_scale.scale != 1:
+            # the downscaled variants of every image are built now (and when a boss is loaded), not on their first draw
+            self.render_scale.prewarm(self.assets.images() + cached_variants())
+            self.assets.prepare = self.render_scale.prewarm
+        profiler.lap("prewarm transforms")
         
         self.player_pos: tuple[int] = (stgs.GAME_WINDOW_RESOLUTION[0] // 2, stgs.GAME_WINDOW_RESOLUTION[1] // 5 * 4)
         self.spaceship = Spaceship(self, self.player_group, self.player_projectile_group, self.player_pos)
         self.move_x: list[int] = [0, 0]
         self.move_y: list[int] = [0, 0]
-
+        profiler.lap("spaceship")
         
         self.score_font: pg.font.Font = pg.font.SysFont("comicsans", 42)
         self.highscores_font: pg.font.Font = pg.font.SysFont("comicsans", 52)
@@ -85,6 +98,10 @@ class Game:
         self.start_text: pg.Surface = self.score_font.render("START!", True, self.WHITE)
         self.game_over_text: pg.Surface = self.highscores_font.render("GAME OVER!", True, self.WHITE)
         self.enter_name_text: pg.Surface = self.highscores_font.render("Enter your name.", True, self.WHITE)
+        self.score_texts: TextCache = TextCache(self.score_font, self.WHITE)
+        self.score_glyphs: GlyphAtlas = GlyphAtlas(self.score_font, self.WHITE, self.score_texts)
+        self.highscores_texts: TextCache = TextCache(self.highscores_font, self.WHITE)
+        profiler.lap("fonts (pg.font.SysFont) and texts")
         self.player_name: str = ""
 
         self.background_start_y: int = -2000
@@ -106,9 +123,46 @@ class Game:
         self.enemy_appearance_timer: int | float = 10
 
         self.game_state: str = "menu"
+        self.simulation_speed: float = stgs.SIMULATION_SPEED
+        self.simulation_step: float = 1 / stgs.SIMULATION_HZ
+        self.accumulator: float = 0  # simulation time that is not stepped yet
+        self.steps: int = 0
+        self.paused: bool = False
+        self.recorder: InputRecorder | None = None  # records the input of the simulation steps
+        self.replay: InputReplay | None = None  # feeds recorded input into the simulation steps instead of the events
         self.game_over_timer: int | float = 0
         self.help_site = Helpsite(self)
+        profiler.lap("Helpsite")
         self.highscores_site, self.highscores_list = create_highscores_screen(self.highscores_font)
+        profiler.lap("create_highscores_screen")
+        self.plan_boss_assets()
+        profiler.lap("plan_boss_assets")
+
+    def boss_asset_group(self, phase: int) -> str | None:
+        """
+        Returns the asset group of the boss at the end of a phase.
+        Args:
+        phase (int): The phase.
+        Returns:
+        str | None: The asset group, or None if the phase has no boss.
+        """
+        for wave in stgs.enemy_waves.get(phase, []):
+            for enemy_number in wave:
+                if enemy_number in stgs.BOSS_ASSETS:
+                    return stgs.BOSS_ASSETS[enemy_number]
+        return None
+
+    def plan_boss_assets(self) -> None:
+        """
+        Starts prefetching the boss of the current phase in the background
+        and releases the boss animations the current and the next phase don't need.
+        """
+        needed_groups = {self.boss_asset_group(self.phase), self.boss_asset_group(self.phase + 1)}
+        for group in set(stgs.BOSS_ASSETS.values()) - needed_groups:
+            self.assets.release(group)
+        current_group = self.boss_asset_group(self.phase)
+        if current_group is not None:
+            self.assets.prefetch(current_group)
 
     def add_drones(self) -> None:
         """ Add drones to the sides of the player. (One at a time) """
@@ -120,8 +174,9 @@ class Game:
 
     def handle_upgrade_collision(self) -> None:
         """ Handle collision with upgrade items. """
+        player_grid = SpatialHash.from_group(self.player_group)
         for upgrade in self.upgrade_group:
-            if pg.sprite.spritecollide(upgrade, self.player_group, False, pg.sprite.collide_mask):
+            if player_grid.collide(upgrade, pg.sprite.collide_mask):
                 self.score += 5
                 if upgrade.upgrade_number == 0:
                     self.drones_to_get = min(self.drones_to_get + 1, self.drones_max)  # drone/s
@@ -177,11 +232,13 @@ class Game:
             self.multiplicand = 2
         elif self.phase > 6:
             self.multiplicand = 3
+        self.plan_boss_assets()
 
     def handle_enemy_drone_collision(self) -> None:
         """ Handle collision with the enemy and the drones. """
+        drone_grid = SpatialHash.from_group(self.drone_group)
         for enemy in self.enemy_group:
-            overlap = pg.sprite.spritecollide(enemy, self.drone_group, False, pg.sprite.collide_mask)
+            overlap = drone_grid.collide(enemy, pg.sprite.collide_mask)
             if overlap:
                 print("test")
                 for collided_drone in overlap:
@@ -190,15 +247,22 @@ class Game:
 
     def handle_enemy_player_collision(self) -> None:
         """ Handle collision with the enemy and the player. """
+        player_grid = SpatialHash.from_group(self.player_group)
         for enemy in self.enemy_group:
-            if pg.sprite.spritecollide(enemy, self.player_group, False, pg.sprite.collide_mask):
+            if player_grid.collide(enemy, pg.sprite.collide_mask):
                 self.spaceship.take_damage(min(enemy.health, 50))
                 enemy.take_damage(150 * self.multiplicand)
 
     def handle_projectile_player_collision(self) -> None:
         """ Handle collision with the enemy projectiles and the player. """
+        near_slots = self.projectiles.overlapping(ENEMY, [sprite.rect for sprite in self.player_group])
+        if not near_slots:
+            return
+        player_grid = SpatialHash.from_group(self.player_group)
         for projectile in self.enemy_projectile_group:
-            overlap_sprites = pg.sprite.spritecollide(projectile, self.player_group, False, pg.sprite.collide_mask)
+            if projectile.slot not in near_slots:  # far from the player, or killed earlier in this loop, e.g. by a dying boss
+                continue
+            overlap_sprites = player_grid.collide(projectile, pg.sprite.collide_mask)
             if overlap_sprites:
                 for sprite in overlap_sprites:
                     self.fx_list.append(SmallExplosion(self, (projectile.pos.x, projectile.pos.y)))
@@ -207,8 +271,14 @@ class Game:
 
     def handle_projectile_enemy_collision(self) -> None:
         """ Handle collision with the player projectiles and the enemy. """
+        near_slots = self.projectiles.overlapping(PLAYER, [sprite.rect for sprite in self.enemy_group])
+        if not near_slots:
+            return
+        enemy_grid = SpatialHash.from_group(self.enemy_group)
         for projectile in self.player_projectile_group:
-            overlap_sprites = pg.sprite.spritecollide(projectile, self.enemy_group, False, pg.sprite.collide_mask)
+            if projectile.slot not in near_slots:  # far from every enemy, or killed earlier in this loop, e.g. by a dying boss
+                continue
+            overlap_sprites = enemy_grid.collide(projectile, pg.sprite.collide_mask)
             if overlap_sprites:
                 for sprite in overlap_sprites:
                     sprite.take_damage(projectile.damage)
@@ -234,12 +304,48 @@ class Game:
         else:
             self.game_state = "highscores"
 
-    def handle_events(self) -> None:
-        """ Handle events such as closing the game window, quitting the game, steering the spaceship, etc. """
-        for event in pg.event.get():
+    def is_idle(self) -> bool:
+        """
+        Returns whether nothing moves in the current state, so the game loop can wait for events instead of drawing frames.
+        Returns:
+        bool: Whether the state is static.
+        """
+        return self.game_state in ("menu", "help", "highscores") or (self.game_state == "game over" and self.game_over_timer >= 5)
+
+    def get_events(self, wait: float | None = 0) -> list[pg.event.Event]:
+        """
+        Returns the pending events, if there are none it waits for the next event. The mouse motions are coalesced.
+        Args:
+        wait (float | None): How long to wait for an event in seconds, None waits until there is one. Defaults to 0 (don't wait).
+        Returns:
+        list[pg.event.Event]: The events.
+        """
+        events = pg.event.get()
+        if not events and wait != 0:
+            event = pg.event.wait() if wait is None else pg.event.wait(max(1, round(wait * 1000)))  # a timeout of 0 would wait forever
+            if event.type != pg.NOEVENT:
+                events = [event] + pg.event.get()
+        return coalesce_mouse_motion(events)
+
+    def handle_events(self, wait: float | None = 0) -> None:
+        """
+        Handle events such as closing the game window, quitting the game, steering the spaceship, etc.
+        Args:
+        wait (float | None): How long to wait for an event if there is none in seconds, None waits until there is one. Defaults to 0 (don't wait).
+        """
+        for event in self.get_events(wait):
             if event.type == pg.QUIT:
                 self.run = False
 
+            if event.type in (pg.WINDOWFOCUSLOST, pg.WINDOWMINIMIZED) and stgs.PAUSE_ON_FOCUS_LOSS:
+                self.paused = True
+                self.move_x[:], self.move_y[:] = [0, 0], [0, 0]  # the key releases go to the other window
+            elif event.type == pg.WINDOWFOCUSGAINED and self.paused:
+                self.paused = False
+                self.renderer.invalidate()
+            elif event.type == pg.WINDOWEXPOSED:
+                self.renderer.invalidate()
+
             if self.game_state == "play":
                 if not self.countdown:
                     if event.type == pg.KEYDOWN:
@@ -282,19 +388,19 @@ class Game:
         """
         self.player_group.update(dt, self.move_x, self.move_y)
         self.drone_group.update(dt)
-        self.player_projectile_group.update(dt)
-        self.enemy_projectile_group.update(dt)
+        self.projectiles.update(dt)
         self.enemy_group.update(dt)
         self.upgrade_group.update(dt)
 
+        active_fx: list[object] = []
+        finished_fx: list[object] = []
         for projectile_hit in self.fx_list:
-            remove_hit = projectile_hit.update(dt)
-            if remove_hit:
-                self.fx_list.remove(projectile_hit)
+            (finished_fx if projectile_hit.update(dt) else active_fx).append(projectile_hit)
+        self.fx_list[:] = active_fx
+        for projectile_hit in finished_fx:  # released after the list is rebuilt, so a reused effect is never in it twice
+            projectile_hit.release_to_pool()
 
-        for healthbar in self.healthbars:
-            if healthbar.current_health <= 0:
-                self.healthbars.remove(healthbar)
+        self.healthbars.sweep()
 
     def move_background(self, dt: float) -> None:
         """
@@ -316,140 +422,274 @@ class Game:
         else:
             self.game_state = "game over"
 
-    def draw_lives(self) -> None:
-        """ Draw the lives of the player. """
+    def draw_lives(self) -> list[pg.Rect]:
+        """
+        Draw the lives of the player.
+        Returns:
+        list[pg.Rect]: The drawn areas.
+        """
+        drawn_rects: list[pg.Rect] = []
         if self.lives < 10:
             for i in range(self.lives):
-                self.main_window.blit(pg.transform.scale(self.assets["live_image"], (50, 82)), (10, 800 - 90 * i))
+                drawn_rects.append(self.main_window.blit(self.layers.scaled("live_image", (50, 82)), (10, 800 - 90 * i)))
         else:
-            self.main_window.blit(pg.transform.scale(self.assets["live_image"], (50, 82)), (10, 800))
+            drawn_rects.append(self.main_window.blit(self.layers.scaled("live_image", (50, 82)), (10, 800)))
             lives_to_render = f"x {self.lives}"
-            lives_to_blit = self.score_font.render(lives_to_render, True, self.WHITE)
-            self.main_window.blit(lives_to_blit, (80, 809))
-
-    def draw_stats_and_score(self) -> None:
-        """ Draw the stats and score of the player. """
-        score_to_render: str = f"Score: {self.score}"
-        score_to_blit: pg.Surface = self.score_font.render(score_to_render, True, self.WHITE)
-        self.main_window.blit(score_to_blit, (200, 8))
-
-        fire_power_to_render: str = f"FP: {self.spaceship.current_weapon_damage}"
-        fire_power_to_blit: pg.Surface = self.score_font.render(fire_power_to_render, True, self.WHITE)
-        self.main_window.blit(fire_power_to_blit, (600, 8))
-
-        fire_rate_to_render: str = f"FR: {round(self.spaceship.current_fire_rate, 2)}"
-        fire_rate_to_blit: pg.Surface = self.score_font.render(fire_rate_to_render, True, self.WHITE)
-        self.main_window.blit(fire_rate_to_blit, (800, 8))
-
-        hp_to_render: str = f"HP: {self.spaceship.health}/{self.spaceship.max_health}"
-        hp_to_blit: pg.Surface = self.score_font.render(hp_to_render, True, self.WHITE)
-        self.main_window.blit(hp_to_blit, (1000, 8))
+            lives_to_blit = self.score_texts.render(lives_to_render)
+            drawn_rects.append(self.main_window.blit(lives_to_blit, (80, 809)))
+        return drawn_rects
 
-        fps_to_render: str = f"FPS: {self.fps}"
-        fps_to_blit: pg.Surface = self.score_font.render(fps_to_render, True, self.WHITE)
-        self.main_window.blit(fps_to_blit, (1400, 8))
+    def draw_stat(self, label: str, value: str, pos: tuple[int, int]) -> pg.Rect:
+        """
+        Draw a stat of the HUD, the label comes from the text cache and the value is composed from the glyph atlas.
+        Args:
+        label (str): The label, e.g. 'Score: '.
+        value (str): The value.
+        pos (tuple[int, int]): The top left position.
+        Returns:
+        pg.Rect: The drawn area.
+        """
+        label_rect: pg.Rect = self.main_window.blit(self.score_texts.render(label), pos)
+        return label_rect.union(self.score_glyphs.draw(self.main_window, value, label_rect.topright))
 
-    def show_countdown(self, dt: float) -> None:
+    def draw_stats_and_score(self) -> list[pg.Rect]:
         """
-        Show the 'get ready' countdown before the game starts.
+        Draw the stats and score of the player.
+        Returns:
+        list[pg.Rect]: The drawn areas.
+        """
+        score_rect: pg.Rect = self.draw_stat("Score: ", str(self.score), (200, 8))
+        fire_power_rect: pg.Rect = self.draw_stat("FP: ", str(self.spaceship.current_weapon_damage), (600, 8))
+        fire_rate_rect: pg.Rect = self.draw_stat("FR: ", str(round(self.spaceship.current_fire_rate, 2)), (800, 8))
+        hp_rect: pg.Rect = self.draw_stat("HP: ", f"{self.spaceship.health}/{self.spaceship.max_health}", (1000, 8))
+        fps_rect: pg.Rect = self.draw_stat("FPS: ", str(self.fps), (1400, 8))
+        return [score_rect, fire_power_rect, fire_rate_rect, hp_rect, fps_rect]
+
+    def update_countdown(self, dt: float) -> None:
+        """
+        Counts the 'get ready' countdown down, the game starts when it is over.
         Args:
         dt (float): The time difference between the current frame and the previous frame.
         """
-        countdown_to_render = self.countdown_time // 1
-        if self.countdown_time >= 1:
-            countdown_to_blit: pg.Surface = self.score_font.render(str(int(countdown_to_render)), True, self.WHITE)
-            self.game_window.blit(countdown_to_blit, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - countdown_to_blit.get_width() // 2, 
-                                                    stgs.GAME_WINDOW_RESOLUTION[1] // 2 - countdown_to_blit.get_height() // 2))
-            self.game_window.blit(self.get_ready_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.get_ready_text.get_width() // 2, 
-                                                        stgs.GAME_WINDOW_RESOLUTION[1] // 2 - 100 ))
-        else:
-            self.game_window.blit(self.fight_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.fight_text.get_width() // 2, 
-                                                        stgs.GAME_WINDOW_RESOLUTION[1] // 2 - self.fight_text.get_height() // 2))
         self.countdown_time -= dt
         if self.countdown_time <= 0:
             self.countdown = False
 
-    def draw_window(self, dt: float) -> None:
+    def show_countdown(self) -> list[pg.Rect]:
+        """
+        Show the 'get ready' countdown before the game starts.
+        Returns:
+        list[pg.Rect]: The drawn areas of the game window.
+        """
+        drawn_rects: list[pg.Rect] = []
+        countdown_to_render = self.countdown_time // 1
+        if self.countdown_time >= 1:
+            countdown_to_blit: pg.Surface = self.score_texts.render(str(int(countdown_to_render)))
+            drawn_rects.append(self.render_scale.blit(self.game_window, countdown_to_blit, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - countdown_to_blit.get_width() // 2, 
+                                                                         stgs.GAME_WINDOW_RESOLUTION[1] // 2 - countdown_to_blit.get_height() // 2)))
+            drawn_rects.append(self.render_scale.blit(self.game_window, self.get_ready_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.get_ready_text.get_width() // 2, 
+                                                                          stgs.GAME_WINDOW_RESOLUTION[1] // 2 - 100 )))
+        else:
+            drawn_rects.append(self.render_scale.blit(self.game_window, self.fight_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.fight_text.get_width() // 2, 
+                                                                       stgs.GAME_WINDOW_RESOLUTION[1] // 2 - self.fight_text.get_height() // 2)))
+        return drawn_rects
+
+    def advance(self, frame_time: float) -> float:
         """
-        Draw the game window.
+        Runs as many fixed simulation steps as the (scaled) frame time needs, the rest is kept for the next frame.
         Args:
-        dt (float): The time difference between the current frame and the previous frame.
+        frame_time (float): The time since the last frame in seconds.
+        Returns:
+        float: The interpolation alpha for draw_window.
+        """
+        self.accumulator += frame_time * self.simulation_speed
+        while self.accumulator >= self.simulation_step:
+            if self.replay is not None and not self.replay.apply(self):
+                self.run = False  # the recording is over
+                break
+            if self.recorder is not None:
+                self.recorder.record(self)
+            self.update(self.simulation_step)
+            self.accumulator -= self.simulation_step
+            self.steps += 1
+        return self.accumulator / self.simulation_step if stgs.INTERPOLATE else 1
+
+    def update(self, dt: float) -> None:
+        """
+        Advances the simulation by one fixed step.
+        Args:
+        dt (float): The length of the step in seconds.
+        """
+        if self.game_state == "play":
+            self.interpolator.snapshot([self.player_group, self.drone_group, self.enemy_group, self.upgrade_group])
+            self.healthbars.snapshot()
+            if self.countdown:
+                self.update_countdown(dt)
+            else:
+                self.handle_enemies(dt)
+                self.update_groups(dt)
+                self.handle_upgrade_collision()
+                self.handle_projectile_enemy_collision()
+                self.handle_projectile_player_collision()
+                self.handle_enemy_player_collision()
+                self.handle_enemy_drone_collision()
+                self.move_background(dt)
+
+        elif self.game_state == "game over":
+            if self.game_over_timer > 4.5:
+                self.check_score()
+            if self.game_state == "game over" and self.game_over_timer < 5:
+                self.game_over_timer += dt
+
+    def draw_window(self, alpha: float = 1) -> None:
+        """
+        Draw the game window. Only the regions that changed since the last frame are drawn and pushed to the display,
+        the whole window is drawn if the state or the position of the background changed.
+        Args:
+        alpha (float): How far the simulation is between its last step and the next one, the sprites are drawn
+                       between their previous (0) and their current position (1). Defaults to 1.
         """
-        self.main_window.blit(pg.transform.scale(self.assets["title"], stgs.MAIN_WINDOW_RESOLUTION), (0, 0))
         if self.game_state == "menu":
-            self.main_window.blit(pg.transform.scale(self.assets["logo"], stgs.MAIN_WINDOW_RESOLUTION), (0, 0))
-            self.start_button.render()
-            self.help_button.render()
-            self.highscores_button.render()
-            self.quit_button.render()
+            self.renderer.start_frame("menu")
+            if self.renderer.needs_backdrop():
+                self.main_window.blit(self.layers.get("menu", None, self.build_menu_layer), (0, 0))
+                self.renderer.capture_backdrop()
 
         elif self.game_state == "help":
-            self.help_site.render(self.main_window)
-            self.back_button.render()
+            self.renderer.start_frame("help")
+            if self.renderer.needs_backdrop():
+                self.main_window.blit(self.layers.get("help", self.help_site.surface, self.build_help_layer), (0, 0))
+                self.renderer.capture_backdrop()
+            self.renderer.add_screen_rects(self.help_site.render_upgrade_text(self.main_window))
 
         elif self.game_state == "highscores":
-            self.main_window.blit(self.highscores_site, (0, 0))
-            self.back_button.render()
+            self.renderer.start_frame("highscores")
+            if self.renderer.needs_backdrop():
+                self.main_window.blit(self.layers.get("highscores", self.highscores_site, self.build_highscores_layer), (0, 0))
+                self.renderer.capture_backdrop()
 
         elif self.game_state == "play":
-            self.game_window.blit(self.assets["background"], (0, self.background_y))
+            background_pos: tuple[int, int] = (0, self.render_scale.length(self.background_y))
+            if self.renderer.start_frame("play", background_pos):
+                if self.renderer.needs_backdrop():
+                    self.main_window.blit(self.layers.get("play", None, self.build_play_layer), (0, 0))
+                    self.renderer.capture_backdrop()
+                self.background.draw(self.game_window, background_pos[1])
+            else:
+                self.renderer.restore_play_area(self.game_window, self.background, background_pos[1])
 
-            self.draw_stats_and_score()
-            self.draw_lives()
+            self.renderer.add_screen_rects(self.draw_stats_and_score())
+            self.renderer.add_screen_rects(self.draw_lives())
             if not self.countdown:
-                self.upgrade_group.draw(self.game_window)
-                self.enemy_projectile_group.draw(self.game_window)
-                self.enemy_group.draw(self.game_window)
-                self.player_projectile_group.draw(self.game_window)
+                self.renderer.add_play_rects(self.interpolator.draw(self.game_window, self.upgrade_group, alpha, self.render_scale))
+                self.renderer.add_play_rects(self.projectiles.draw(self.game_window, ENEMY, alpha, self.render_scale))
+                self.renderer.add_play_rects(self.interpolator.draw(self.game_window, self.enemy_group, alpha, self.render_scale))
+                self.renderer.add_play_rects(self.projectiles.draw(self.game_window, PLAYER, alpha, self.render_scale))
             else:
-                self.show_countdown(dt)
-            self.player_group.draw(self.game_window)
-            self.drone_group.draw(self.game_window)
+                self.renderer.add_play_rects(self.show_countdown())
+            self.renderer.add_play_rects(self.interpolator.draw(self.game_window, self.player_group, alpha, self.render_scale))
+            self.renderer.add_play_rects(self.interpolator.draw(self.game_window, self.drone_group, alpha, self.render_scale))
 
-            for effect in self.fx_list:
-                effect.draw(self.game_window)
-            for healthbar in self.healthbars:
-                healthbar.draw(self.game_window)
+            self.renderer.add_play_rects(draw_effects(self.game_window, self.fx_list, self.render_scale))
+            self.renderer.add_play_rects(self.healthbars.draw(self.game_window, alpha, self.render_scale))
 
-            pg.draw.rect(self.main_window, self.WHITE, (190, 90, 1410, 810))
-            self.main_window.blit(self.game_window, (195, 95))
+            self.renderer.present_play_area(self.game_window)
 
         elif self.game_state == "game over":
             if self.game_over_timer < 5:
-                self.game_window.blit(self.assets["background"], (0, self.background_y))
-                self.game_over_timer += dt
-                self.game_window.blit(self.game_over_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.game_over_text.get_width() // 2,
-                                                            stgs.GAME_WINDOW_RESOLUTION[1] // 2 - self.game_over_text.get_height() // 2))
-                pg.draw.rect(self.main_window, self.WHITE, (190, 90, 1410, 810))
-                self.main_window.blit(self.game_window, (195, 95))
+                self.renderer.start_frame("game over")
+                if self.renderer.needs_backdrop():
+                    self.main_window.blit(self.layers.get("play", None, self.build_play_layer), (0, 0))
+                    self.background.draw(self.game_window, self.render_scale.length(self.background_y))
+                    self.render_scale.blit(self.game_window, self.game_over_text, (stgs.GAME_WINDOW_RESOLUTION[0] // 2 - self.game_over_text.get_width() // 2,
+                                                                                   stgs.GAME_WINDOW_RESOLUTION[1] // 2 - self.game_over_text.get_height() // 2))
+                    self.renderer.present_play_area(self.game_window)
+                    self.renderer.capture_backdrop()
             elif self.game_over_timer >= 5:
-                self.main_window.blit(self.highscores_site, (0, 0))
-                player_name_to_blit = self.highscores_font.render(self.player_name, True, self.WHITE)
-                pg.draw.rect(self.main_window, self.WHITE, (590, 740, max(30, player_name_to_blit.get_width() + 20), 80), width=3)
-                self.main_window.blit(player_name_to_blit, (600, 745))
-                self.main_window.blit(self.enter_name_text, (stgs.MAIN_WINDOW_RESOLUTION[0] // 2 - self.enter_name_text.get_width() // 2, 820))
-            
+                self.renderer.start_frame("enter name")
+                if self.renderer.needs_backdrop():
+                    self.main_window.blit(self.layers.scaled("title", stgs.MAIN_WINDOW_RESOLUTION), (0, 0))
+                    self.main_window.blit(self.highscores_site, (0, 0))
+                    self.main_window.blit(self.enter_name_text, (stgs.MAIN_WINDOW_RESOLUTION[0] // 2 - self.enter_name_text.get_width() // 2, 820))
+                    self.renderer.capture_backdrop()
+                player_name_to_blit = self.highscores_texts.render(self.player_name)
+                name_box_rect = pg.draw.rect(self.main_window, self.WHITE, (590, 740, max(30, player_name_to_blit.get_width() + 20), 80), width=3)
+                self.renderer.add_screen_rects([name_box_rect, self.main_window.blit(player_name_to_blit, (600, 745))])
+
+        self.renderer.end_frame()
+
+    def build_menu_layer(self, surf: pg.Surface) -> None:
+        """
+        Draws the static menu: the title, the logo and the buttons.
+        Args:
+        surf (pg.Surface): The layer surface.
+        """
+        surf.blit(self.layers.scaled("title", surf.get_size()), (0, 0))
+        surf.blit(self.layers.scaled("logo", surf.get_size()), (0, 0))
+        for button in [self.start_button, self.help_button, self.highscores_button, self.quit_button]:
+            button.render(surf)
 
-        pg.display.update()
+    def build_play_layer(self, surf: pg.Surface) -> None:
+        """
+        Draws the static frame of the game window: the title and the white border, the inside is covered by the game window.
+        Args:
+        surf (pg.Surface): The layer surface.
+        """
+        surf.blit(self.layers.scaled("title", surf.get_size()), (0, 0))
+        pg.draw.rect(surf, self.WHITE, (190, 90, 1410, 810), width=5)
+
+    def build_help_layer(self, surf: pg.Surface) -> None:
+        """
+        Draws the static help site: the title, the help text with the upgrades and the back button.
+        Args:
+        surf (pg.Surface): The layer surface.
+        """
+        surf.blit(self.layers.scaled("title", surf.get_size()), (0, 0))
+        surf.blit(self.help_site.surface, (0, 0))
+        self.back_button.render(surf)
+
+    def build_highscores_layer(self, surf: pg.Surface) -> None:
+        """
+        Draws the static highscores site: the title, the highscores and the back button.
+        Args:
+        surf (pg.Surface): The layer surface.
+        """
+        surf.blit(self.layers.scaled("title", surf.get_size()), (0, 0))
+        surf.blit(self.highscores_site, (0, 0))
+        self.back_button.render(surf)
 
     def create_buttons(self) -> None:
         """ Creates the menu buttons. """
+        profiler.start_laps()
         self.start_button = Button(self.main_window, "Start", (1380, 630))
+        profiler.lap("create_buttons: Start")
         self.help_button =  Button(self.main_window, "Help", (1380, 700))
+        profiler.lap("create_buttons: Help")
         self.highscores_button = Button(self.main_window, "highscores", (1380, 770))
+        profiler.lap("create_buttons: highscores")
         self.quit_button = Button(self.main_window, "Quit", (1380, 840))
+        profiler.lap("create_buttons: Quit")
         self.back_button = Button(self.main_window, "back", (200, 800))
+        profiler.lap("create_buttons: back")
 
     def main(self) -> None:
-        """ The main function of the game, containing the game loop. """
+        """
+        The main function of the game, containing the game loop. The simulation runs in fixed steps of 1 / SIMULATION_HZ seconds,
+        as many as the elapsed (and scaled) time needs, and every frame draws the sprites interpolated between the last two steps.
+        The frames are limited to FPS_CAP, in static states the loop waits for events and while the game is paused it sleeps.
+        """
         frame_counter = 0
         time_counter = 0
         self.create_buttons()
-        last_time = time()
+        limiter = FrameLimiter()
         while self.run:
-            dt = time() - last_time
-            last_time = time()
-            self.handle_events()
+            if self.paused:
+                self.handle_events(wait=None)
+                limiter.reset()  # the pause isn't simulated
+                continue
+            frame_time = min(limiter.tick(), stgs.MAX_FRAME_TIME)
+            self.handle_events(wait=stgs.IDLE_WAIT if self.is_idle() else 0)
+            self.assets.update()
 
             if self.game_state == "menu":
                 if self.start_button.check_button_collision():
@@ -470,27 +710,160 @@ class Game:
 
             elif self.game_state == "play":
                 frame_counter += 1
-                time_counter += dt
+                time_counter += frame_time
                 if time_counter > 1:
                     self.fps = frame_counter
                     frame_counter = 0
                     time_counter = 0
-                if not self.countdown:
-                    self.handle_enemies(dt)
-                    self.update_groups(dt)
-                    self.handle_upgrade_collision()
-                    self.handle_projectile_enemy_collision()
-                    self.handle_projectile_player_collision()
-                    self.handle_enemy_player_collision()
-                    self.handle_enemy_drone_collision()
-                    self.move_background(dt)
-
-            elif self.game_state == "game over" and self.game_over_timer > 4.5:
-                self.check_score()
-                
 
-            self.draw_window(dt)
+            self.draw_window(self.advance(frame_time))
+        self.assets.close()
+
+    def start_level(self, phase: int, wave: int = 0) -> None:
+        """
+        Starts playing at a phase and a wave without the countdown.
+        Args:
+        phase (int): The phase.
+        wave (int): The first wave. Defaults to 0.
+        """
+        self.phase = phase - 1
+        self.proceed_level()
+        self.wave = wave
+        self.countdown = False
+        self.game_state = "play"
+
+    def run_headless(self, duration: float, last_wave: int | None = None, render: bool = False,
+                     one_phase: bool = True) -> dict[str, int | float | str]:
+        """
+        Runs the game loop as fast as possible on a synthetic clock: every frame advances the simulation by 1 / FPS_CAP seconds
+        (1 / SIMULATION_HZ if the frame rate isn't capped) without waiting. It stops when the duration is simulated,
+        the last wave is cleared, the phase is over, the game is lost or a replay is over.
+        Args:
+        duration (float): The maximum simulated time in seconds.
+        last_wave (int | None): The wave of the current phase after which to stop. Defaults to None (until the phase is over).
+        render (bool): Whether to draw the frames (the display is never updated). Defaults to False.
+        one_phase (bool): Whether to stop when the phase is over. Defaults to True.
+        Returns:
+        dict[str, int | float | str]: The statistics of the run.
+        """
+        frame_time: float = 1 / (stgs.FPS_CAP or stgs.SIMULATION_HZ)
+        phase: int = self.phase
+        frames: int = 0
+        simulated: float = 0
+        steps: int = self.steps
+        start = perf_counter()
+        while self.run and simulated < duration and self.game_state == "play" and (self.phase == phase or not one_phase):
+            if last_wave is not None and self.wave > last_wave and not self.enemy_group:
+                break
+            self.handle_events()
+            self.assets.update()
+            alpha = self.advance(frame_time)
+            if render:
+                self.draw_window(alpha)
+            frames += 1
+            simulated += frame_time
+        wall = perf_counter() - start
+        return {"simulated s": simulated, "wall s": wall, "speedup": simulated / max(wall, 1e-9), "frames": frames,
+                "steps": self.steps - steps, "phase": self.phase, "wave": self.wave,
+                "score": self.score, "lives": self.lives, "state": self.game_state, "seed": self.rng.seed}
+
+
+def startup_profile(file_path: str) -> None:
+    """
+    Creates the game and its buttons, prints the startup phases ranked by their time and writes them to a json file.
+    Args:
+    file_path (str): The path of the json file.
+    """
+    game = Game()
+    game.create_buttons()
+    game.assets.close()
+    print(profiler.report())
+    profiler.write_json(file_path)
+    print(f"written to {file_path}")
+
+
+def headless(phase: int, waves: list[int] | None, duration: float, render: bool, seed: int | None) -> None:
+    """
+    Plays a phase without a window as fast as possible and prints the statistics of the run and of the object pools.
+    Args:
+    phase (int): The phase.
+    waves (list[int] | None): The first and the last wave, None plays the whole phase.
+    duration (float): The maximum simulated time in seconds.
+    render (bool): Whether to draw the frames.
+    seed (int | None): The seed of the random streams, None uses RNG_SEED (a random one if that is None as well), the used seed is printed with the statistics.
+    """
+    game = Game(headless=True, seed=seed)
+    first_wave, last_wave = waves if waves else (0, len(stgs.enemy_waves[phase]) - 1)
+    game.start_level(phase, first_wave)
+    stats = game.run_headless(duration, last_wave, render)
+    game.assets.close()
+    print(f"phase {phase} waves {first_wave}-{last_wave}, {'rendered' if render else 'not rendered'}")
+    for name, value in stats.items():
+        print(f"{name:<12}{round(value, 3) if isinstance(value, float) else value}")
+    print(pool_report())
+
+
+def replay(file_path: str, render: bool) -> None:
+    """
+    Replays a recording without a window as fast as possible and prints the statistics of the run and of the object pools.
+    Args:
+    file_path (str): The path of the recording.
+    render (bool): Whether to draw the frames.
+    """
+    recording = InputReplay(file_path)
+    game = Game(headless=True, seed=recording.seed)
+    game.replay = recording
+    recording.start(game)
+    stats = game.run_headless(math.inf, render=render, one_phase=False)
+    game.assets.close()
+    print(f"replay of {file_path} from phase {recording.phase} wave {recording.wave}, {recording.steps} recorded steps, "
+          f"{'rendered' if render else 'not rendered'}")
+    for name, value in stats.items():
+        print(f"{name:<12}{round(value, 3) if isinstance(value, float) else value}")
+    print(pool_report())
+
+
+def play(record: str | None, seed: int | None) -> None:
+    """
+    Plays the game, optionally recording the input of the first game to a file when the game is closed.
+    Args:
+    record (str | None): The path of the recording, None doesn't record.
+    seed (int | None): The seed of the random streams, None uses RNG_SEED.
+    """
+    game = Game(seed=seed)
+    if record:
+        game.recorder = InputRecorder()
+    game.main()
+    if record:
+        game.recorder.save(record)
 
 
 if __name__ == "__main__":
-    Game().main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Spaceship")
+    parser.add_argument("--startup-profile", nargs="?", const="startup_profile.json", metavar="FILE",
+                        help="time the startup, print a ranked table and write it to FILE (default: startup_profile.json)")
+    parser.add_argument("--headless", action="store_true", help="play a phase without a window as fast as possible and print statistics")
+    parser.add_argument("--phase", type=int, default=1, choices=sorted(stgs.enemy_waves), help="headless: the phase to play (default: 1)")
+    parser.add_argument("--waves", type=int, nargs=2, metavar=("FIRST", "LAST"), help="headless: the wave range (default: the whole phase)")
+    parser.add_argument("--duration", type=float, default=60, help="headless: the maximum simulated time in seconds (default: 60)")
+    parser.add_argument("--render", action="store_true", help="headless, replay: draw the frames")
+    parser.add_argument("--seed", type=int, help="the seed of the random streams (default: RNG_SEED, a random one if that is None)")
+    parser.add_argument("--record", metavar="FILE", help="record the input of the game to FILE, it is written when the game is closed")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recording without a window as fast as possible and print statistics")
+    parser.add_argument("--clear-asset-cache", action="store_true", help="remove the cached scaled images (see ASSET_CACHE) and exit")
+    args = parser.parse_args()
+    if args.waves and not 0 <= args.waves[0] <= args.waves[1] < len(stgs.enemy_waves[args.phase]):
+        parser.error(f"--waves: FIRST and LAST must be waves of phase {args.phase} (0 to {len(stgs.enemy_waves[args.phase]) - 1}), FIRST not after LAST")
+    if args.clear_asset_cache:
+        clear_cache()
+        sys.exit()
+    if args.startup_profile:
+        startup_profile(args.startup_profile)
+        sys.exit()
+    if args.headless:
+        headless(args.phase, args.waves, args.duration, args.render, args.seed)
+        sys.exit()
+    if args.replay:
+        replay(args.replay, args.render)
+        sys.exit()
+    play(args.record, args.seed)
\ No newline at end of file
@@ -1,11 +1,21 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+
+# the asset pack is not in the repository, it is built from the images if it is missing or older than them
+os.chdir(SPECPATH)
+sys.path.insert(0, SPECPATH)
+import settings as stgs
+from asset_pack import build_pack, pack_is_current
+if not pack_is_current(stgs.ASSETS, stgs.ASSET_PACK_MANIFEST):
+    build_pack(stgs.ASSETS, stgs.ASSET_PACK, stgs.ASSET_PACK_MANIFEST)
 
 
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[(stgs.ASSET_PACK, '.'), (stgs.ASSET_PACK_MANIFEST, '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
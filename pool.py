@@ -0,0 +1,95 @@
+from typing import TypeVar
+
+Pooled_object = TypeVar("Pooled_object")
+
+
+class ObjectPool:
+    def __init__(self, name: str) -> None:
+        """
+        Keeps released objects of one class, so they can be used again instead of creating new ones.
+        Args:
+        name (str): The name of the pool, the class name.
+        """
+        self.name: str = name
+        self.free: list[object] = []
+        self.hits: int = 0  # acquired objects that came from the pool
+        self.misses: int = 0  # acquired objects that had to be created
+        self.in_use: int = 0
+        self.high_water: int = 0  # the most objects in use at the same time
+
+    def acquire(self, cls: type) -> Pooled_object:
+        """
+        Returns a released object, or a new (not initialized) one if there is none.
+        Args:
+        cls (type): The class of the object.
+        Returns:
+        Pooled_object: The object, it still has to be initialized.
+        """
+        if self.free:
+            obj = self.free.pop()
+            self.hits += 1
+        else:
+            obj = object.__new__(cls)
+            self.misses += 1
+        obj.pooled = False
+        obj.pool_generation = self.hits + self.misses  # changes with every acquisition, a reused object is a new one
+        self.in_use += 1
+        self.high_water = max(self.high_water, self.in_use)
+        return obj
+
+    def release(self, obj: object) -> None:
+        """
+        Puts an object back into the pool, releasing it twice has no effect.
+        Args:
+        obj (object): The object.
+        """
+        if not obj.pooled:
+            obj.pooled = True
+            self.in_use -= 1
+            self.free.append(obj)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Returns the statistics of the pool.
+        Returns:
+        dict[str, int]: The hits, misses, objects in use, high-water mark and free objects.
+        """
+        return {"hits": self.hits, "misses": self.misses, "in use": self.in_use, "high water": self.high_water, "free": len(self.free)}
+
+
+pools: dict[str, ObjectPool] = {}
+
+
+class Pooled:
+    """
+    Mixin for classes whose instances are pooled. Creating an instance takes a released one from the pool of the class
+    and __init__ resets it as usual (reset-on-acquire), so the constructors don't change.
+    The class has to call release_to_pool when an instance isn't used anymore.
+    """
+    pool: ObjectPool
+
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        cls.pool = pools.setdefault(cls.__name__, ObjectPool(cls.__name__))  # every subclass has its own pool
+
+    def __new__(cls, *args, **kwargs) -> Pooled_object:
+        return cls.pool.acquire(cls)
+
+    def release_to_pool(self) -> None:
+        """ Puts the instance back into the pool of its class. """
+        self.pool.release(self)
+
+
+def pool_report() -> str:
+    """
+    Returns the statistics of every pool that was used as a table.
+    Returns:
+    str: The table.
+    """
+    lines = [f"{'pool':<20}{'hits':>9}{'misses':>9}{'in use':>9}{'high water':>12}{'free':>7}"]
+    for name, pool in pools.items():
+        if not pool.hits + pool.misses:
+            continue
+        stats = pool.stats()
+        lines.append(f"{name:<20}{stats['hits']:>9}{stats['misses']:>9}{stats['in use']:>9}{stats['high water']:>12}{stats['free']:>7}")
+    return "\n".join(lines)
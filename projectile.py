@@ -1,17 +1,262 @@
 import settings as stgs
+from utils import get_mask, get_transformed
+from pool import Pooled
+from render_scale import RenderScale
 
 import pygame as pg
 import math
+import numpy as np
 
-from typing import TypeVar
+from typing import Callable, Final, TypeVar
 
 Game = TypeVar("Game")
 
+PLAYER: Final[int] = 0
+ENEMY: Final[int] = 1
+FIRING_ANGLES: Final[tuple[int, ...]] = (60, 75, 90, 105, 120, 240, 270, 300)  # every angle the ships fire at
+LASER_COLORS: Final[int] = 5
+ROCKET_SCALE: Final[float] = 0.5
 
-class Projectile(pg.sprite.Sprite):
+
+def round_positions(positions: np.ndarray) -> np.ndarray:
+    """
+    Rounds positions half away from zero, like pygame does when a float is set as a rect position.
+    np.rint rounds halves to the even number, so a projectile at x.5 would be one pixel off its rect.
+    Args:
+    positions (np.ndarray): The positions to round.
+    Returns:
+    np.ndarray: The rounded positions.
+    """
+    return np.copysign(np.floor(np.abs(positions) + 0.5), positions)
+
+
+class ProjectileEngine:
+    def __init__(self, capacity: int = stgs.PROJECTILE_CAPACITY) -> None:
+        """
+        Moves, culls and draws all projectiles at once. The projectile data is kept in numpy arrays (one slot per projectile),
+        the Projectile sprites are only handles to their slot, so they can still be used in groups and for the collisions.
+        Args:
+        capacity (int): The number of slots to start with, the arrays grow if they are full.
+        """
+        self.capacity: int = 0
+        self.size: int = 0  # slots above this were never used
+        self.pos: np.ndarray = np.zeros((0, 2))
+        self.previous_pos: np.ndarray = np.zeros((0, 2))  # before the last update, for the interpolation
+        self.velocity: np.ndarray = np.zeros((0, 2))
+        self.damage: np.ndarray = np.zeros(0, np.int64)
+        self.extent: np.ndarray = np.zeros((0, 2), np.int64)  # width and height of the rect
+        self.owner: np.ndarray = np.zeros(0, np.int8)
+        self.frame_base: np.ndarray = np.zeros(0, np.int32)  # index of the first frame in self.images
+        self.frame_count: np.ndarray = np.zeros(0, np.int32)
+        self.frame_duration: np.ndarray = np.zeros(0)
+        self.age: np.ndarray = np.zeros(0)
+        self.alive: np.ndarray = np.zeros(0, bool)
+        self.handles: list[pg.sprite.Sprite | None] = []
+        self.free_slots: list[int] = []
+
+        self.images: list[pg.Surface] = []
+        self.masks: list[pg.mask.Mask] = []
+        self.frame_keys: dict[tuple, tuple[int, int]] = {}  # key -> (frame base, frame count)
+        self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        """
+        Resizes the arrays, the data of the used slots is kept.
+        Args:
+        capacity (int): The new number of slots.
+        """
+        for name in ("pos", "previous_pos", "velocity", "damage", "extent", "owner", "frame_base", "frame_count", "frame_duration", "age", "alive"):
+            old: np.ndarray = getattr(self, name)
+            new: np.ndarray = np.zeros((capacity,) + old.shape[1:], old.dtype)
+            new[:self.capacity] = old
+            setattr(self, name, new)
+        self.frame_count[self.capacity:] = 1
+        self.frame_duration[self.capacity:] = 1
+        self.handles += [None] * (capacity - self.capacity)
+        self.capacity = capacity
+
+    def register_frames(self, key: tuple, create_frames: Callable[[], list[pg.Surface]]) -> tuple[int, int]:
+        """
+        Adds the frames of a projectile type to the image table, only the first time the key is used.
+        Args:
+        key (tuple): The key of the frames, e.g. ('laser', color, angle).
+        create_frames (Callable[[], list[pg.Surface]]): Creates the frames.
+        Returns:
+        tuple[int, int]: The index of the first frame and the number of frames.
+        """
+        if key not in self.frame_keys:
+            frames = create_frames()
+            self.frame_keys[key] = (len(self.images), len(frames))
+            self.images += frames
+            self.masks += [get_mask(frame) for frame in frames]
+        return self.frame_keys[key]
+
+    def spawn(self, handle: pg.sprite.Sprite, owner: int, pos: tuple[float, float], velocity: tuple[float, float], damage: int,
+              frames: tuple[int, int], frame_duration: float = 1) -> int:
+        """
+        Puts a new projectile into a free slot.
+        Args:
+        handle (pg.sprite.Sprite): The sprite of the projectile.
+        owner (int): PLAYER or ENEMY.
+        pos (tuple[float, float]): The top left position.
+        velocity (tuple[float, float]): The velocity in pixels per second.
+        damage (int): The damage of the projectile.
+        frames (tuple[int, int]): The index of the first frame and the number of frames, see register_frames.
+        frame_duration (float): The time every frame is shown. Defaults to 1.
+        Returns:
+        int: The slot.
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self.grow(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+        self.pos[slot] = self.previous_pos[slot] = pos
+        self.velocity[slot] = velocity
+        self.damage[slot] = damage
+        self.extent[slot] = self.images[frames[0]].get_size()
+        self.owner[slot] = owner
+        self.frame_base[slot], self.frame_count[slot] = frames
+        self.frame_duration[slot] = frame_duration
+        self.age[slot] = 0
+        self.alive[slot] = True
+        self.handles[slot] = handle
+        return slot
+
+    def release(self, slot: int) -> None:
+        """
+        Frees the slot of a removed projectile.
+        Args:
+        slot (int): The slot.
+        """
+        self.alive[slot] = False
+        self.handles[slot] = None
+        self.free_slots.append(slot)
+
+    def frame_index(self, slot: int) -> int:
+        """
+        Returns the index of the current frame of a projectile in the image table.
+        Args:
+        slot (int): The slot.
+        Returns:
+        int: The index of the frame.
+        """
+        return int(self.frame_base[slot] + int(self.age[slot] // self.frame_duration[slot]) % self.frame_count[slot])
+
+    def update(self, dt: float) -> None:
+        """
+        Moves every projectile in one step and kills the ones that left the game window.
+        Args:
+        dt (float): The time difference.
+        """
+        used = slice(0, self.size)
+        self.previous_pos[used] = self.pos[used]
+        self.pos[used] += self.velocity[used] * dt
+        self.age[used] += dt
+        x, y = self.pos[used, 0], self.pos[used, 1]
+        outside = self.alive[used] & ((y < -10) | (y > stgs.GAME_WINDOW_RESOLUTION[1] + 10) | (x < -10) | (x > stgs.GAME_WINDOW_RESOLUTION[0] + 10))
+        for slot in np.flatnonzero(outside).tolist():
+            self.handles[slot].kill()
+
+    def overlapping(self, owner: int, rects: list[pg.Rect]) -> set[int]:
+        """
+        Returns the slots of the projectiles of an owner whose rect overlaps at least one of the rects, tested all at once.
+        Only these projectiles can collide with the sprites of the rects, so the others can skip the collision test.
+        Args:
+        owner (int): PLAYER or ENEMY.
+        rects (list[pg.Rect]): The rects, e.g. of the enemies.
+        Returns:
+        set[int]: The slots.
+        """
+        if not rects:
+            return set()
+        used = slice(0, self.size)
+        slots = np.flatnonzero(self.alive[used] & (self.owner[used] == owner))
+        if not len(slots):
+            return set()
+        top_left = round_positions(self.pos[slots])  # rounded like Projectile.rect
+        other = np.array([(rect.left, rect.top, rect.right, rect.bottom) for rect in rects], float)
+        # rects overlap if each one starts before the other one ends, on both axes
+        overlap = ((top_left[:, None] < other[:, 2:]) & (top_left[:, None] + self.extent[slots, None] > other[:, :2])).all(axis=2).any(axis=1)
+        return set(slots[overlap].tolist())
+
+    def draw(self, surf: pg.Surface, owner: int, alpha: float = 1, render_scale: RenderScale | None = None) -> list[pg.Rect]:
+        """
+        Draws the projectiles of an owner with one batched blit.
+        Args:
+        surf (pg.Surface): The surface to draw on.
+        owner (int): PLAYER or ENEMY.
+        alpha (float): Where to draw between the position before the last update (0) and the current position (1). Defaults to 1.
+        render_scale (RenderScale | None): Draws on a smaller render buffer. Defaults to None (the surface is the game window).
+        Returns:
+        list[pg.Rect]: The drawn areas.
+        """
+        used = slice(0, self.size)
+        slots = np.flatnonzero(self.alive[used] & (self.owner[used] == owner))
+        if not len(slots):
+            return []
+        frames = self.frame_base[slots] + (self.age[slots] // self.frame_duration[slots]).astype(np.int64) % self.frame_count[slots]
+        pos = self.pos[slots] if alpha >= 1 else self.previous_pos[slots] + (self.pos[slots] - self.previous_pos[slots]) * alpha
+        images = self.images
+        if render_scale is not None and render_scale.scale != 1:
+            positions = np.rint(round_positions(pos) * render_scale.scale).astype(np.int64).tolist()
+            return surf.blits([(render_scale.image(images[frame]), position) for frame, position in zip(frames.tolist(), positions)])
+        positions = round_positions(pos).astype(np.int64).tolist()
+        return surf.blits([(images[frame], position) for frame, position in zip(frames.tolist(), positions)])
+
+
+def register_laser_frames(engine: ProjectileEngine, assets: dict, color: int, rotate_angle: int) -> tuple[int, int]:
+    """
+    Registers the frame of a laser, rotated clockwise by rotate_angle.
+    Args:
+    engine (ProjectileEngine): The projectile engine.
+    assets (dict): The game assets.
+    color (int): The color code of the laser.
+    rotate_angle (int): The rotation of the laser image in degrees clockwise.
+    Returns:
+    tuple[int, int]: The index of the frame in the image table of the engine and the number of frames.
+    """
+    img = assets["laser"][color]
+    return engine.register_frames(("laser", color, rotate_angle), lambda: [get_transformed(img, angle=-rotate_angle)])
+
+def register_rocket_frames(engine: ProjectileEngine, assets: dict, player: bool = False) -> tuple[int, int]:
+    """
+    Registers the frames of a rocket at half size, the frames of the rockets of the player are turned upwards.
+    Args:
+    engine (ProjectileEngine): The projectile engine.
+    assets (dict): The game assets.
+    player (bool): Whether it is a rocket of the player. Defaults to False.
+    Returns:
+    tuple[int, int]: The index of the first frame in the image table of the engine and the number of frames.
+    """
+    img_list = assets["rocket1"].img_list
+    if player:
+        return engine.register_frames(("player", "rocket1"), lambda: [get_transformed(img, angle=180, scale=ROCKET_SCALE) for img in img_list])
+    return engine.register_frames(("rocket1",), lambda: [get_transformed(img, scale=ROCKET_SCALE) for img in img_list])
+
+def prewarm_frames(engine: ProjectileEngine, assets: dict) -> None:
+    """
+    Registers the frames of every laser color at every firing angle and of the rockets,
+    so no image has to be transformed while the game runs.
+    Args:
+    engine (ProjectileEngine): The projectile engine.
+    assets (dict): The game assets.
+    """
+    for color in range(LASER_COLORS):
+        for angle in FIRING_ANGLES:
+            register_laser_frames(engine, assets, color, angle - 90 if angle != 90 else 0)
+    register_rocket_frames(engine, assets)
+    register_rocket_frames(engine, assets, player=True)
+
+
+class Projectile(Pooled, pg.sprite.Sprite):
     def __init__(self, game: Game, projectile_type: str, damage: int, group: pg.sprite.Group, pos: tuple[int], direction: int, laser_color: str = None, angle: int = 90) -> None:
         """
         A projectile class that can be used to create different types of projectiles.
+        The projectile lives in a slot of the projectile engine of the game, this sprite is the handle of the slot.
+        The subclasses set the OWNER and the SPEED of their projectiles. The sprites are pooled.
         Args:
         game (Game): The game object.
         projectile_type (str): The type of projectile. Can be 'laser' or 'rocket'.
@@ -24,35 +269,38 @@ class Projectile(pg.sprite.Sprite):
         """
         super().__init__(group)
         self.game: Game = game
-        self.damage: int = damage
+        self.engine: ProjectileEngine = game.projectiles
         color: int = self.color_picker(color=laser_color)
         self.angle: int = angle
         if self.angle != 90:
             self.image_rotate_angle: int = self.angle - 90
-        self.animate: bool = self.get_image(type=projectile_type, color=color)
-        self.rect: pg.Rect = self.image.get_rect(center=pos)
-        self.pos: pg.Vector2 = pg.Vector2(self.rect.topleft)
-        self.direction: int = direction
-        
-    def get_image(self, type: str, color: str = None) -> bool:
+        frames, frame_duration = self.get_frames(type=projectile_type, color=color)
+        self.size: tuple[int, int] = self.engine.images[frames[0]].get_size()
+        start_rect: pg.Rect = self.engine.images[frames[0]].get_rect(center=pos)
+        if self.angle == 90:
+            velocity = (0, direction * self.SPEED)
+        else:
+            velocity = (-self.SPEED * math.cos(math.radians(self.angle)), -self.SPEED * math.sin(math.radians(self.angle)))
+        self.slot: int | None = self.engine.spawn(self, self.OWNER, start_rect.topleft, velocity, damage, frames, frame_duration)
+        # the state of the projectile when its slot was freed, so a killed projectile can still be read
+        self.last_pos: tuple[float, float] = start_rect.topleft
+        self.last_frame: int = frames[0]
+        self.last_damage: int = damage
+
+    def get_frames(self, type: str, color: int = None) -> tuple[tuple[int, int], float]:
         """
-        Get the image of the projectile.
+        Get the frames of the projectile, they are created once per type, color and angle.
         Args:
         type (str): The type of projectile.
-        color (str): The color of the projectile. Defaults to None.
+        color (int): The color code of the projectile. Defaults to None.
         Returns:
-        bool: Whether the image is animated or not.
+        tuple[tuple[int, int], float]: The frames in the image table of the engine and the time every frame is shown.
         """
         if type == "laser":
-            self.image: pg.Surface = self.game.assets[type][color]
-            if self.game.spaceship.weapon == "sprayer" and self.angle != 90:
-                self.image = pg.transform.rotate(self.image, -self.image_rotate_angle)
-            return False
+            rotate_angle: int = self.image_rotate_angle if self.game.spaceship.weapon == "sprayer" and self.angle != 90 else 0
+            return register_laser_frames(self.engine, self.game.assets, color, rotate_angle), 1
         elif type == "rocket1":
-            self.animation = self.game.assets[type].copy()
-            self.image: pg.Surface = self.animation.get_img()
-            self.image = pg.transform.scale(self.image, (self.image.get_width() // 2, self.image.get_height() // 2))
-            return True
+            return register_rocket_frames(self.engine, self.game.assets), self.game.assets[type].img_duration
 
     def color_picker(self, color: str) -> int:
         """
@@ -71,36 +319,79 @@ class Projectile(pg.sprite.Sprite):
         elif color == "red":
             return 3
         else:
-            return 4    
+            return 4
 
-    def update(self, dt: float) -> None:
+    def top_left(self) -> tuple[float, float]:
         """
-        Update the projectile.
-        Args:
-        dt (float): The time difference.
+        Returns the top left position of the projectile, the last one in the engine if the projectile was killed.
+        Returns:
+        tuple[float, float]: The position.
         """
-        if self.angle == 90:
-            if self.animate:
-                self.animation.update(dt)
-                self.image = self.animation.get_img()
-            self.pos.y += self.direction * self.speed * dt
-        else:
-            x_move = self.speed * dt * math.cos(math.radians(self.angle))
-            y_move = self.speed * dt * math.sin(math.radians(self.angle))   
-            self.pos.x -= x_move
-            self.pos.y -= y_move
+        return tuple(self.engine.pos[self.slot].tolist()) if self.slot is not None else self.last_pos
+
+    def frame(self) -> int:
+        """
+        Returns the current frame of the projectile in the image table of the engine, the last one if the projectile was killed.
+        Returns:
+        int: The frame.
+        """
+        return self.engine.frame_index(self.slot) if self.slot is not None else self.last_frame
+
+    @property
+    def pos(self) -> pg.Vector2:
+        """ The top left position of the projectile. """
+        return pg.Vector2(self.top_left())
+
+    @property
+    def rect(self) -> pg.Rect:
+        """ The rect of the projectile, its position is set like the sprite rect was set, so pygame rounds it half away from zero. """
+        rect = pg.Rect((0, 0), self.size)
+        rect.topleft = self.top_left()
+        return rect
+
+    @property
+    def image(self) -> pg.Surface:
+        """ The current frame of the projectile. """
+        return self.engine.images[self.frame()]
+
+    @property
+    def mask(self) -> pg.mask.Mask:
+        """ The mask of the current frame of the projectile. """
+        return self.engine.masks[self.frame()]
+
+    @property
+    def damage(self) -> int:
+        """ The damage of the projectile. """
+        return int(self.engine.damage[self.slot]) if self.slot is not None else self.last_damage
 
-        self.rect.x = self.pos.x
-        self.rect.y = self.pos.y
+    def release(self) -> None:
+        """ Frees the slot of the projectile in the engine, keeps its last state on the handle and puts the sprite back into the pool. """
+        if self.slot is not None:
+            self.last_pos, self.last_frame, self.last_damage = self.top_left(), self.frame(), self.damage
+            self.engine.release(self.slot)
+            self.slot = None
+            self.release_to_pool()
 
-        if self.pos.y < -10 or self.pos.y > stgs.GAME_WINDOW_RESOLUTION[1] + 10:
-            self.kill()
-        
-        if self.pos.x < -10 or self.pos.x > stgs.GAME_WINDOW_RESOLUTION[0] + 10:
-            self.kill()
+    def kill(self) -> None:
+        """ Removes the projectile from its groups and from the engine. """
+        super().kill()
+        self.release()
+
+    def remove_internal(self, group: pg.sprite.AbstractGroup) -> None:
+        """
+        Called by a group the projectile is removed from, the slot is freed when it is in no group anymore.
+        Args:
+        group (pg.sprite.AbstractGroup): The group.
+        """
+        super().remove_internal(group)
+        if not self.alive():
+            self.release()
 
 
 class PlayerProjectile(Projectile):
+    OWNER: Final[int] = PLAYER
+    SPEED: Final[int] = 250
+
     def __init__(self, game: Game, projectile_type: str, damage: int, pos: tuple[int], angle: int = 90) -> None:
         """
         Initializes a PlayerProjectile object with inheritance from the Projectile class.
@@ -112,22 +403,25 @@ class PlayerProjectile(Projectile):
         angle (int): The angle of the projectile. Defaults to 90.
         """
         super().__init__(game=game, projectile_type=projectile_type, damage=damage, group=game.player_projectile_group, pos=pos, direction=-1, laser_color="blue", angle=angle)
-        self.speed: int = 250
-        
-    def get_image(self, type: str, color: str) -> None:
+
+    def get_frames(self, type: str, color: int) -> tuple[tuple[int, int], float]:
         """
-        Returns the image of the projectile.
+        Returns the frames of the projectile, the rockets of the player fly upwards.
         Args:
         type (str): The type of projectile.
-        color (str): The color of the projectile.
+        color (int): The color code of the projectile.
+        Returns:
+        tuple[tuple[int, int], float]: The frames in the image table of the engine and the time every frame is shown.
         """
-        super().get_image(type, color)
-
         if type == "rocket1":
-            self.image = pg.transform.rotate(self.image, 180)
+            return register_rocket_frames(self.engine, self.game.assets, player=True), self.game.assets[type].img_duration
+        return super().get_frames(type, color)
 
 
 class EnemyProjectile(Projectile):
+    OWNER: Final[int] = ENEMY
+    SPEED: Final[int] = 150
+
     def __init__(self, game: Game, projectile_type: str, damage: int, pos: tuple[int], laser_color: str, angle: int = 90) -> None:
         """
         Initializes a EnemyProjectile object with inheritance from the Projectile class.
@@ -139,4 +433,3 @@ class EnemyProjectile(Projectile):
         angle (int): The angle of the projectile. Defaults to 90.
         """
         super().__init__(game, projectile_type=projectile_type, damage=damage, group=game.enemy_projectile_group, pos=pos, direction=1, laser_color=laser_color, angle=angle)
-        self.speed: int = 150
\ No newline at end of file
@@ -0,0 +1,92 @@
+import settings as stgs
+
+import weakref
+import pygame as pg
+from typing import Iterable
+
+
+class RenderScale:
+    def __init__(self, scale: float = stgs.RENDER_SCALE, logical_size: tuple[int, int] = stgs.GAME_WINDOW_RESOLUTION) -> None:
+        """
+        Maps the logical game window coordinates, in which the game is simulated, to a smaller render buffer.
+        The images are drawn as smoothly downscaled variants, the buffer is upscaled to the game window once per frame.
+        The variants are created in memory when the game starts (see prewarm), the asset files only exist in full size.
+        Args:
+        scale (float): The size of the render buffer relative to the game window, e.g. 0.5. Defaults to RENDER_SCALE.
+        logical_size (tuple[int, int]): The size of the game window. Defaults to the game window resolution.
+        """
+        self.scale: float = scale
+        self.logical_size: tuple[int, int] = logical_size
+        self.size: tuple[int, int] = (round(logical_size[0] * scale), round(logical_size[1] * scale))
+        self.variants: weakref.WeakKeyDictionary[pg.Surface, pg.Surface] = weakref.WeakKeyDictionary()
+
+    def length(self, value: int | float) -> int:
+        """
+        Scales a length or a coordinate.
+        Args:
+        value (int | float): The value in game window pixels.
+        Returns:
+        int: The rounded value in render buffer pixels.
+        """
+        return round(value * self.scale)
+
+    def pos(self, pos: tuple[int | float, int | float]) -> tuple[int, int]:
+        """
+        Scales a position.
+        Args:
+        pos (tuple[int | float, int | float]): The position in the game window.
+        Returns:
+        tuple[int, int]: The position in the render buffer.
+        """
+        return round(pos[0] * self.scale), round(pos[1] * self.scale)
+
+    def image(self, img: pg.Surface) -> pg.Surface:
+        """
+        Returns the downscaled variant of an image, it is only created once per image.
+        Args:
+        img (pg.Surface): The image in game window pixels, e.g. a frame of an asset.
+        Returns:
+        pg.Surface: The image in render buffer pixels, the image itself if the scale is 1.
+        """
+        if self.scale == 1:
+            return img
+        variant: pg.Surface | None = self.variants.get(img)
+        if variant is None:
+            size = (max(1, round(img.get_width() * self.scale)), max(1, round(img.get_height() * self.scale)))
+            variant = self.variants[img] = pg.transform.smoothscale(img, size) if img.get_bitsize() >= 24 else pg.transform.scale(img, size)
+        return variant
+
+    def prewarm(self, images: Iterable[pg.Surface]) -> None:
+        """
+        Creates the downscaled variants of images ahead of time, so they don't cost time when they are drawn the first time.
+        Args:
+        images (Iterable[pg.Surface]): The images.
+        """
+        for img in images:
+            self.image(img)
+
+    def blit(self, surf: pg.Surface, img: pg.Surface, pos: tuple[int | float, int | float]) -> pg.Rect:
+        """
+        Draws an image at a position of the game window on the render buffer.
+        Args:
+        surf (pg.Surface): The render buffer.
+        img (pg.Surface): The image in game window pixels.
+        pos (tuple[int | float, int | float]): The top left position in the game window.
+        Returns:
+        pg.Rect: The drawn area in render buffer coordinates.
+        """
+        if self.scale == 1:
+            return surf.blit(img, pos)
+        return surf.blit(self.image(img), self.pos(pos))
+
+    def upscale(self, surf: pg.Surface, dest: pg.Surface) -> None:
+        """
+        Copies the render buffer to a surface of the game window size, e.g. a subsurface of the screen.
+        Args:
+        surf (pg.Surface): The render buffer.
+        dest (pg.Surface): The destination surface.
+        """
+        if surf.get_size() == dest.get_size():
+            dest.blit(surf, (0, 0))
+        else:
+            pg.transform.scale(surf, dest.get_size(), dest)
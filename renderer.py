@@ -0,0 +1,184 @@
+import settings as stgs
+
+import pygame as pg
+from fractions import Fraction
+from typing import Final, Hashable, Iterable, TypeVar
+
+Background = TypeVar("Background")
+
+
+class DirtyRectRenderer:
+    MAX_SCALE_BLOCK: Final[int] = 8  # render buffers whose scaling repeats in larger blocks are always upscaled as a whole
+
+    def __init__(self, screen: pg.Surface, play_area: pg.Rect, present: bool = True) -> None:
+        """
+        Keeps track of the rects that were drawn in the last and in the current frame,
+        so only these regions have to be restored, redrawn and pushed to the display.
+        A frame is drawn fully if its static content (e.g. the game state) or its frame key (e.g. the background position) changed.
+        Args:
+        screen (pg.Surface): The display surface.
+        play_area (pg.Rect): The area of the game window on the screen.
+        present (bool): Whether the frames are pushed to the display, False for headless runs. Defaults to True.
+        """
+        self.screen: pg.Surface = screen
+        self.play_area: pg.Rect = pg.Rect(play_area)
+        self.present: bool = present
+        self.backdrop: pg.Surface | None = None  # the screen with only the static content
+        self.static_key: Hashable = None
+        self.frame_key: Hashable = None
+        self.full_frame: bool = True
+        self.screen_rects: list[pg.Rect] = []
+        self.previous_screen_rects: list[pg.Rect] = []
+        self.presented_rects: list[pg.Rect] = []  # the regions of the game window that were copied to the screen
+        self.play_rects: list[pg.Rect] = []  # in game window coordinates
+        self.previous_play_rects: list[pg.Rect] = []
+        self.frames: int = 0
+        self.full_frames: int = 0
+        self.updated_pixels: int = 0
+
+    def start_frame(self, static_key: Hashable, frame_key: Hashable = None) -> bool:
+        """
+        Starts a frame. If the static content changed, the backdrop has to be drawn and captured again (see capture_backdrop).
+        Otherwise the regions of the screen drawn in the last frame are restored. If the frame key changed, the play area
+        has to be drawn fully, everything else on the screen is tracked with rects.
+        Args:
+        static_key (Hashable): Describes the static content of the screen, e.g. the game state.
+        frame_key (Hashable): Describes the rest of the content that can't be tracked with rects, e.g. the background position. Defaults to None.
+        Returns:
+        bool: Whether the frame is drawn fully.
+        """
+        if static_key != self.static_key or not stgs.DIRTY_RECTS:
+            self.backdrop = None
+            self.full_frame = True
+        else:
+            for rect in self.previous_screen_rects:
+                self.screen.blit(self.backdrop, rect, rect)
+            self.full_frame = frame_key != self.frame_key
+        self.static_key, self.frame_key = static_key, frame_key
+        if self.full_frame:
+            self.previous_screen_rects, self.previous_play_rects = [], []
+        self.screen_rects, self.presented_rects, self.play_rects = [], [], []
+        return self.full_frame
+
+    def invalidate(self) -> None:
+        """ Draws and pushes the next frame fully, e.g. after the window was covered or the game was paused. """
+        self.static_key = None
+
+    def needs_backdrop(self) -> bool:
+        """
+        Returns whether the static content has to be drawn, because there is no backdrop for it.
+        Returns:
+        bool: Whether the backdrop is missing.
+        """
+        return self.backdrop is None
+
+    def capture_backdrop(self) -> None:
+        """ Keeps a copy of the screen after the static content is drawn. """
+        self.backdrop = self.screen.copy()
+
+    def add_screen_rects(self, rects: Iterable[pg.Rect]) -> None:
+        """
+        Adds rects that were drawn on the screen this frame.
+        Args:
+        rects (Iterable[pg.Rect]): The rects in screen coordinates.
+        """
+        self.screen_rects += [pg.Rect(rect) for rect in rects]
+
+    def add_play_rects(self, rects: Iterable[pg.Rect]) -> None:
+        """
+        Adds rects that were drawn on the game window this frame.
+        Args:
+        rects (Iterable[pg.Rect]): The rects in game window coordinates.
+        """
+        self.play_rects += [pg.Rect(rect) for rect in rects]
+
+    def restore_play_area(self, surf: pg.Surface, background: Background, background_y: int) -> None:
+        """
+        Draws the background over the regions of the game window that were drawn in the last frame.
+        Args:
+        surf (pg.Surface): The game window.
+        background (Background): The background streamer.
+        background_y (int): The position of the top of the background on the game window.
+        """
+        for rect in self.previous_play_rects:
+            background.draw(surf, background_y, rect)
+
+    def present_play_area(self, surf: pg.Surface) -> None:
+        """
+        Copies the game window to the screen, in a dirty frame only the regions drawn in the last and in this frame.
+        A render buffer smaller than the play area is upscaled to it, a game window that is a subsurface of the screen is drawn in place.
+        Args:
+        surf (pg.Surface): The game window or the render buffer.
+        """
+        if surf.get_abs_parent() is self.screen:
+            if not self.full_frame:
+                self.presented_rects += [rect.clip(self.play_area) for rect in
+                                         (rect.move(self.play_area.topleft) for rect in self.previous_play_rects + self.play_rects)]
+            return
+        if surf.get_size() != self.play_area.size:
+            self.present_scaled_play_area(surf)
+            return
+        if self.full_frame:
+            self.screen.blit(surf, self.play_area)
+            return
+        window_rect = surf.get_rect()
+        for rect in self.previous_play_rects + self.play_rects:
+            rect = rect.clip(window_rect)
+            if rect.width and rect.height:
+                self.screen.blit(surf, rect.move(self.play_area.topleft), rect)
+                self.presented_rects.append(rect.move(self.play_area.topleft))
+
+    def present_scaled_play_area(self, surf: pg.Surface) -> None:
+        """
+        Upscales a render buffer that is smaller than the play area to the screen, in a dirty frame only the regions drawn in the last and in this frame.
+        The regions are aligned to the blocks in which the scaling repeats (e.g. 3 pixels of a 75% buffer become 4 pixels),
+        so they are scaled exactly like the whole buffer.
+        Args:
+        surf (pg.Surface): The render buffer.
+        """
+        ratio = Fraction(self.play_area.width, surf.get_width())
+        if self.full_frame or ratio != Fraction(self.play_area.height, surf.get_height()) or ratio.denominator > self.MAX_SCALE_BLOCK:
+            pg.transform.scale(surf, self.play_area.size, self.screen.subsurface(self.play_area))
+            self.presented_rects.append(pg.Rect(self.play_area))
+            return
+        block, scaled_block = ratio.denominator, ratio.numerator
+        window_rect = surf.get_rect()
+        for rect in self.previous_play_rects + self.play_rects:
+            rect = rect.clip(window_rect)
+            if not rect.width or not rect.height:
+                continue
+            left, top = rect.left // block * block, rect.top // block * block
+            right, bottom = min(window_rect.width, -(-rect.right // block) * block), min(window_rect.height, -(-rect.bottom // block) * block)
+            scaled_rect = pg.Rect(left * scaled_block // block, top * scaled_block // block,
+                                  min(self.play_area.width, right * scaled_block // block) - left * scaled_block // block,
+                                  min(self.play_area.height, bottom * scaled_block // block) - top * scaled_block // block).move(self.play_area.topleft)
+            pg.transform.scale(surf.subsurface((left, top, right - left, bottom - top)), scaled_rect.size, self.screen.subsurface(scaled_rect))
+            self.presented_rects.append(scaled_rect)
+
+    def end_frame(self) -> None:
+        """ Pushes the frame to the display, in a dirty frame only the regions drawn in the last and in this frame. """
+        self.frames += 1
+        if self.full_frame:
+            if self.present:
+                pg.display.update()
+            self.full_frames += 1
+            self.updated_pixels += self.screen.get_width() * self.screen.get_height()
+        else:
+            rects = self.previous_screen_rects + self.screen_rects + self.presented_rects
+            if len(rects) > stgs.DIRTY_RECTS_MAX:
+                rects = [rects[0].unionall(rects[1:])]  # one big rect is cheaper than a lot of small ones
+            if self.present:
+                pg.display.update(rects)
+            self.updated_pixels += sum(rect.width * rect.height for rect in rects)
+        self.previous_screen_rects = self.screen_rects
+        self.previous_play_rects = self.play_rects
+
+    def stats(self) -> dict[str, float]:
+        """
+        Returns the statistics of the renderer.
+        Returns:
+        dict[str, float]: The number of frames, the share of full frames and the average share of the screen that was updated.
+        """
+        screen_pixels = self.screen.get_width() * self.screen.get_height()
+        return {"frames": self.frames, "full frames": self.full_frames / max(1, self.frames),
+                "updated screen": self.updated_pixels / max(1, self.frames * screen_pixels)}
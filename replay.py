@@ -0,0 +1,125 @@
+import settings as stgs
+
+import struct
+from typing import Final, TypeVar
+
+Game = TypeVar("Game")
+
+MAGIC: Final[bytes] = b"SPRL"
+VERSION: Final[int] = 1
+HEADER: Final[struct.Struct] = struct.Struct("<4sBqHBB?")  # magic, version, seed, simulation hz, phase, wave, countdown
+RUN: Final[struct.Struct] = struct.Struct("<HB")  # number of steps, input bits
+MAX_RUN: Final[int] = 0xFFFF
+
+
+def pack_input(game: Game) -> int:
+    """
+    Packs the movement state of the game into the bits of one byte: up, down, left, right.
+    Args:
+    game (Game): The game.
+    Returns:
+    int: The input bits.
+    """
+    return game.move_y[0] | game.move_y[1] << 1 | game.move_x[0] << 2 | game.move_x[1] << 3
+
+def unpack_input(game: Game, bits: int) -> None:
+    """
+    Sets the movement state of the game from input bits, see pack_input.
+    Args:
+    game (Game): The game.
+    bits (int): The input bits.
+    """
+    game.move_y[:] = [bits & 1, bits >> 1 & 1]
+    game.move_x[:] = [bits >> 2 & 1, bits >> 3 & 1]
+
+
+class InputRecorder:
+    def __init__(self) -> None:
+        """
+        Records the input of every simulation step of the first game as runs of equal input,
+        together with the seed and the level the recording started at.
+        """
+        self.header: bytes | None = None
+        self.finished: bool = False
+        self.runs: list[list[int]] = []  # [number of steps, input bits]
+
+    def record(self, game: Game) -> None:
+        """
+        Records the input of the next simulation step, call it before the step.
+        Args:
+        game (Game): The game.
+        """
+        if self.finished:
+            return
+        if game.game_state != "play":
+            self.finished = self.header is not None  # the game is over, the next one isn't recorded
+            return
+        if self.header is None:
+            self.header = HEADER.pack(MAGIC, VERSION, game.rng.seed, stgs.SIMULATION_HZ, game.phase, game.wave, game.countdown)
+        bits = pack_input(game)
+        if self.runs and self.runs[-1][1] == bits and self.runs[-1][0] < MAX_RUN:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, bits])
+
+    def save(self, file_path: str) -> None:
+        """
+        Writes the recording to a file, nothing is written if no step was recorded.
+        Args:
+        file_path (str): The path of the file.
+        """
+        if self.header is None:
+            return
+        with open(file_path, "wb") as file:
+            file.write(self.header)
+            file.write(b"".join(RUN.pack(steps, bits) for steps, bits in self.runs))
+
+
+class InputReplay:
+    def __init__(self, file_path: str) -> None:
+        """
+        Reads a recording, it feeds the input back into the simulation steps of a game.
+        Args:
+        file_path (str): The path of the file.
+        """
+        with open(file_path, "rb") as file:
+            data = file.read()
+        magic, version, self.seed, simulation_hz, self.phase, self.wave, self.countdown = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{file_path} is not a version {VERSION} replay")
+        if simulation_hz != stgs.SIMULATION_HZ:
+            raise ValueError(f"{file_path} was recorded at {simulation_hz} simulation steps per second, not {stgs.SIMULATION_HZ}")
+        self.runs: list[tuple[int, int]] = list(RUN.iter_unpack(data[HEADER.size:]))
+        self.steps: int = sum(steps for steps, _ in self.runs)
+        self.run_index: int = 0
+        self.steps_left: int = self.runs[0][0] if self.runs else 0
+
+    def start(self, game: Game) -> None:
+        """
+        Puts a new game (created with the seed of the recording) into the level the recording started at.
+        Args:
+        game (Game): The game.
+        """
+        if game.rng.seed != self.seed:
+            raise ValueError(f"the game has the seed {game.rng.seed}, the replay needs {self.seed}")
+        game.start_level(self.phase, self.wave)
+        game.countdown = self.countdown
+
+    def apply(self, game: Game) -> bool:
+        """
+        Sets the input of the next simulation step, call it before the step.
+        Args:
+        game (Game): The game.
+        Returns:
+        bool: False if the recording is over.
+        """
+        if game.game_state != "play":
+            return True
+        if self.steps_left == 0:
+            return False
+        unpack_input(game, self.runs[self.run_index][1])
+        self.steps_left -= 1
+        if self.steps_left == 0 and self.run_index + 1 < len(self.runs):
+            self.run_index += 1
+            self.steps_left = self.runs[self.run_index][0]
+        return True
@@ -0,0 +1,33 @@
+import random
+from typing import Final
+
+
+class RandomStreams:
+    STREAMS: Final[tuple[str, ...]] = ("enemy_fire", "boss_ai", "upgrades", "fx", "ui")
+
+    def __init__(self, seed: int | None = None) -> None:
+        """
+        The random number generators of the game, one independent stream per subsystem, so a run can be reproduced from
+        its seed and drawing more or fewer numbers in one subsystem (e.g. the effects) doesn't change the others.
+        enemy_fire: when and how the enemies and the bosses shoot. boss_ai: the movement of the bosses and how long they explode.
+        upgrades: which upgrade drops. fx: cosmetic randomness, e.g. explosion positions. ui: the menus, e.g. the help site.
+        Args:
+        seed (int | None): The seed, None picks a random one (see self.seed).
+        """
+        self.enemy_fire: random.Random = random.Random()
+        self.boss_ai: random.Random = random.Random()
+        self.upgrades: random.Random = random.Random()
+        self.fx: random.Random = random.Random()
+        self.ui: random.Random = random.Random()
+        self.seed: int = 0
+        self.reseed(seed)
+
+    def reseed(self, seed: int | None = None) -> None:
+        """
+        Seeds every stream, each one from the seed and its name.
+        Args:
+        seed (int | None): The seed, None picks a random one.
+        """
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        for name in self.STREAMS:
+            getattr(self, name).seed(f"{self.seed}/{name}")
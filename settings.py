@@ -2,6 +2,82 @@ from typing import Final
 
 MAIN_WINDOW_RESOLUTION: Final[tuple[int]] = (1600, 900)
 GAME_WINDOW_RESOLUTION: Final[tuple[int]] = (1400, 800)
+ASSET_CACHE: Final[bool] = True  # keep the scaled images in .asset_cache/ for faster starts
+ASSET_LOADER_WORKERS: Final[int | None] = None  # None lets the thread pool pick a worker count from the cpu count
+ASSET_PACK: Final[str] = "assets.pack"  # built by asset_pack.py, used instead of the images directory if it exists
+ASSET_PACK_MANIFEST: Final[str] = "assets_manifest.json"
+ATLAS: Final[bool] = True  # pack the animation frames into shared sheets
+ATLAS_SHEET_SIZE: Final[int] = 4096
+ATLAS_LAZY_SHEET_SIZE: Final[int] = 2048  # smaller sheets for the lazy groups, they are converted one sheet per frame
+ASSET_PREFETCH_WORKERS: Final[int] = 2
+ASSET_PREFETCH_FRAME_BUDGET: Final[float] = 0.002  # seconds per frame for converting prefetched images
+PROJECTILE_CAPACITY: Final[int] = 256  # slots of the projectile engine to start with, it grows if needed
+DIRTY_RECTS: Final[bool] = True  # only redraw and push the changed regions of the screen, False always draws full frames
+DIRTY_RECTS_MAX: Final[int] = 200  # more dirty rects than this are pushed to the display as one rect
+COLLISION_CELL_SIZE: Final[int] = 128  # cell size of the collision broadphase grid in pixels
+TEXT_CACHE_SIZE: Final[int] = 256  # rendered texts kept per font and color
+HEALTHBAR_CAPACITY: Final[int] = 64  # rows of the healthbar manager to start with, it grows if needed
+BACKGROUND_TILE_HEIGHT: Final[int] = 200  # height of the horizontal background tiles in pixels
+SIMULATION_HZ: Final[int] = 120  # fixed simulation steps per second, independent of the rendered frames
+MAX_FRAME_TIME: Final[float] = 0.25  # longer frames (e.g. after dragging the window) are clamped, so the simulation doesn't spiral
+SIMULATION_SPEED: Final[float] = 1.0  # simulated seconds per real second, e.g. 4 to fast-forward
+INTERPOLATE: Final[bool] = True  # draw the sprites between their last two simulated positions
+FPS_CAP: Final[int | None] = 144  # maximum rendered frames per second, None renders as fast as possible
+FRAME_SPIN_TIME: Final[float] = 0.001  # the end of a frame is busy-waited, sleep alone wakes up too late
+IDLE_WAIT: Final[float] = 0.25  # in states where nothing moves the loop waits for events, but at most this long (for the asset prefetching)
+RNG_SEED: Final[int | None] = None  # seed of the random streams of the game, None picks a new one every start
+RENDER_SCALE: Final[float] = 1.0  # size of the render buffer of the game window, e.g. 0.5 or 0.75 on low-end hardware, it is upscaled once per frame
+PAUSE_ON_FOCUS_LOSS: Final[bool] = True  # pause the game and sleep while the window is unfocused or minimized
+
+# wave table entry of a boss -> asset group of the boss, the groups are loaded lazily per phase
+BOSS_ASSETS: Final[dict[int, str]] = {100: "boss1", 120: "boss2", 140: "boss3",
+                                      160: "boss1", 180: "boss2", 200: "boss3",
+                                      220: "boss1", 240: "boss2", 260: "boss3"}
+
+
+# "file" loads a single image, without it every image in "path" is loaded as a list,
+# "animation" (animation_duration, loop) turns that list into an Animation.
+ASSETS: Final[dict[str, dict]] = {
+    "background": {"path": "backgrounds", "file": "00.png", "scale": 1},
+    "title": {"path": "", "file": "title.png", "scale": 1},
+    "logo": {"path": "", "file": "logo.png", "scale": 1},
+    "live_image": {"path": "", "file": "spaceship.png", "scale": 1},
+    "ship/idle": {"path": "Ship/idle", "scale": 0.25, "animation": (0.5, True)},
+    "ship/curve": {"path": "Ship/curve", "scale": 0.25, "animation": (0.5, True)},
+    "laser/idle": {"path": "Ship/weapons", "file": "laser idle.png", "scale": 0.25},
+    "laser/curve": {"path": "Ship/weapons", "file": "laser curve.png", "scale": 0.25},
+    "rocket_launcher/idle": {"path": "Ship/weapons", "file": "rocketlauncher idle.png", "scale": 0.25},
+    "rocket_launcher/curve": {"path": "Ship/weapons", "file": "rocketlauncher curve.png", "scale": 0.25},
+    "sprayer/idle": {"path": "Ship/weapons", "file": "sprayer idle.png", "scale": 0.25},
+    "sprayer/curve": {"path": "Ship/weapons", "file": "sprayer curve.png", "scale": 0.25},
+    "drone/idle": {"path": "drone/idle", "scale": 0.3, "animation": (0.5, True)},
+    "drone/curve": {"path": "drone/curve", "scale": 0.3, "animation": (0.5, True)},
+    "enemy1/idle": {"path": "enemies/ship1/idle", "scale": 0.25, "animation": (0.5, True)},
+    "enemy2/idle": {"path": "enemies/ship2/idle", "scale": 0.25, "animation": (0.5, True)},
+    "enemy3/idle": {"path": "enemies/ship3/idle", "scale": 0.25, "animation": (0.5, True)},
+    "boss1/idle": {"path": "enemies/boss1/idle", "scale": 0.75, "animation": (0.5, True)},
+    "boss1/left": {"path": "enemies/boss1/left(right)", "scale": 0.75, "animation": (0.5, True)},
+    "boss1/right": {"path": "enemies/boss1/right(left)", "scale": 0.75, "animation": (0.5, True)},
+    "boss1/flight": {"path": "enemies/boss1/flight", "scale": 0.75, "animation": (0.5, True)},
+    "boss1/open": {"path": "enemies/boss1/open", "scale": 0.75, "animation": (2, False)},
+    "boss2/idle": {"path": "enemies/boss2/idle", "scale": 0.75, "animation": (0.5, True)},
+    "boss2/left": {"path": "enemies/boss2/left(right)", "scale": 0.75, "animation": (0.5, True)},
+    "boss2/right": {"path": "enemies/boss2/right(left)", "scale": 0.75, "animation": (0.5, True)},
+    "boss2/flight": {"path": "enemies/boss2/flight", "scale": 0.75, "animation": (0.5, True)},
+    "boss2/open": {"path": "enemies/boss2/open", "scale": 0.75, "animation": (2, False)},
+    "boss3/idle": {"path": "enemies/boss3/idle", "scale": 0.75, "animation": (0.5, True)},
+    "boss3/left": {"path": "enemies/boss3/left(right)", "scale": 0.75, "animation": (0.5, True)},
+    "boss3/right": {"path": "enemies/boss3/right(left)", "scale": 0.75, "animation": (0.5, True)},
+    "boss3/flight": {"path": "enemies/boss3/flight", "scale": 0.75, "animation": (0.5, True)},
+    "boss3/open": {"path": "enemies/boss3/open", "scale": 0.75, "animation": (2, False)},
+    "laser": {"path": "ammo/lasers", "scale": 0.5},
+    "rocket1": {"path": "ammo/rockets/rocket1", "scale": 0.25, "animation": (2, True)},
+    "upgrade/background": {"path": "upgrades/backgrounds", "scale": 0.5},
+    "upgrade/image": {"path": "upgrades/images", "scale": 0.5},
+    "explosion": {"path": "fx/ship explosion", "scale": 0.5, "animation": (1, False)},
+    "projectile_hit": {"path": "fx/small explosion", "scale": 0.5, "animation": (0.5, False)},
+    "bigger_explosion": {"path": "fx/small explosion", "scale": 1, "animation": (0.5, False)},
+}
 
 
 enemy_waves: Final[dict[list[int]]] = {1: [
@@ -1,6 +1,7 @@
 import settings as stgs
 from projectile import PlayerProjectile
 from healthbar import Healthbar
+from utils import get_composite, get_mask
 
 import pygame as pg
 from typing import Final, TypeVar
@@ -12,6 +13,8 @@ Healthbar_object = TypeVar("Healthbar_object")
 
 class Spaceship(pg.sprite.Sprite):
     TRANSPARENT_BACKGROUND: Final[tuple[int]] = (0, 0, 0, 0)
+    WEAPONS: Final[tuple[str, ...]] = ("laser", "rocket_launcher", "sprayer")
+    STATES: Final[tuple[str, ...]] = ("idle", "curve")
     
     def __init__(self, game: Game, player_group: pg.sprite.Group, projectile_group: pg.sprite.Group, pos: tuple[int]) -> None:
         """
@@ -30,12 +33,9 @@ class Spaceship(pg.sprite.Sprite):
         self.animation: Animation_object = self.game.assets["ship/" + self.state].copy()
         self.ship_image: pg.Surface = self.animation.get_img()
         self.weapon_image: pg.Surface = self.game.assets[self.weapon + "/" + self.state]
-        self.image: pg.Surface = pg.Surface((self.ship_image.get_width(), self.ship_image.get_height()), pg.SRCALPHA)
-        self.image.fill(self.TRANSPARENT_BACKGROUND)
-        self.image.blit(self.weapon_image, (0, 0))
-        self.image.blit(self.ship_image, (0, 0))
+        self.image: pg.Surface = get_composite(self.weapon_image, self.ship_image)
         self.rect: pg.Rect = self.image.get_rect(center = pos)
-        self.mask: pg.mask = pg.mask.from_surface(self.image)
+        self.mask: pg.mask.Mask = self.animation.get_mask()
         self.pos: pg.Vector2 = pg.Vector2(self.rect.topleft)
         self.direction: pg.Vector2 = pg.Vector2()
         self.flip_image: bool = False
@@ -59,8 +59,8 @@ class Spaceship(pg.sprite.Sprite):
     def update_healthbar(self) -> None:
         """ Update the healthbar object. """
         if self.healthbar:
-            self.game.healthbars.remove(self.healthbar)
-        self.healthbar = Healthbar(self.game, self.max_health, self.health, self.image.get_width(), self.pos, self.image.get_height())
+            self.healthbar.remove()
+        self.healthbar = Healthbar(self.game, self.max_health, self.health, self.image.get_width(), self.pos, self.image.get_height(), owner=self)
 
     def take_damage(self, damage: int | float) -> None:
         """
@@ -90,9 +90,24 @@ class Spaceship(pg.sprite.Sprite):
         """
         return self.current_weapon_damage
     
+    @classmethod
+    def prewarm_frames(cls, assets: dict) -> None:
+        """
+        Creates the composite frames (weapon and ship frame, maybe flipped) and their masks for every weapon and state,
+        so the spaceship only points at cached surfaces while the game runs.
+        Args:
+        assets (dict): The game assets.
+        """
+        for state in cls.STATES:
+            for img in assets["ship/" + state].img_list:
+                get_mask(img, flip_x=True)  # the unflipped masks are created with the animation
+                for flip_image in (False, True):
+                    for weapon in cls.WEAPONS:
+                        get_composite(assets[weapon + "/" + state], img, flip_image)
+
     def create_mask(self) -> None:
-        """ Creates the mask for the spaceship. """
-        self.mask = pg.mask.from_surface(self.ship_image)
+        """ Sets the mask of the current (maybe flipped) ship frame, the masks are created only once per frame. """
+        self.mask = self.animation.get_mask(self.flip_image)
 
     def handle_animation(self, dt: float, move_x: tuple[int]) -> None:
         """
@@ -109,7 +124,6 @@ class Spaceship(pg.sprite.Sprite):
         if old_state != self.state:
             self.animation = self.game.assets["ship/" + self.state].copy()
             self.rect = self.ship_image.get_rect(center = self.pos)
-            self.create_mask()
 
         self.flip_image = True if (move_x[1] - move_x[0]) > 0 else False
         if self.auto_fire:
@@ -118,10 +132,8 @@ class Spaceship(pg.sprite.Sprite):
 
         self.ship_image = self.animation.get_img()
         self.weapon_image = self.game.assets[self.weapon + "/" + self.state]
-        self.image.fill(self.TRANSPARENT_BACKGROUND)
-        self.image.blit(self.weapon_image, (0, 0))
-        self.image.blit(self.ship_image, (0, 0))
-        self.image = pg.transform.flip(self.image, self.flip_image, False)
+        self.image = get_composite(self.weapon_image, self.ship_image, self.flip_image)  # cached per weapon, state, frame and flip
+        self.create_mask()
 
     def update(self, dt: float, move_x: tuple[int] = (0, 0), move_y: tuple[int] = (0, 0)) -> None:
         """
@@ -0,0 +1,89 @@
+import settings as stgs
+
+import pygame as pg
+from typing import Callable, Iterable, TypeVar
+
+Spatial_hash_object = TypeVar("Spatial_hash_object")
+
+
+class SpatialHash:
+    def __init__(self, cell_size: int = stgs.COLLISION_CELL_SIZE) -> None:
+        """
+        A uniform grid for the collision broadphase. Every sprite is put into each cell its rect covers,
+        so a query only has to look at the sprites in the cells the queried rect covers.
+        Args:
+        cell_size (int): The width and height of a cell in pixels.
+        """
+        self.cell_size: int = cell_size
+        self.cells: dict[tuple[int, int], list[pg.sprite.Sprite]] = {}
+        self.order: dict[pg.sprite.Sprite, int] = {}  # sprite -> insertion number, keeps the results in group order
+
+    @classmethod
+    def from_group(cls, group: Iterable[pg.sprite.Sprite], cell_size: int = stgs.COLLISION_CELL_SIZE) -> Spatial_hash_object:
+        """
+        Creates a grid that holds every sprite of a group.
+        Args:
+        group (Iterable[pg.sprite.Sprite]): The sprites.
+        cell_size (int): The width and height of a cell in pixels.
+        Returns:
+        Spatial_hash_object: The grid.
+        """
+        grid = cls(cell_size)
+        for sprite in group:
+            grid.insert(sprite)
+        return grid
+
+    def cell_range(self, rect: pg.Rect) -> tuple[range, range]:
+        """
+        Returns the columns and rows of the cells a rect covers.
+        Args:
+        rect (pg.Rect): The rect.
+        Returns:
+        tuple[range, range]: The columns and the rows.
+        """
+        size = self.cell_size
+        return range(rect.left // size, (rect.right - 1) // size + 1), range(rect.top // size, (rect.bottom - 1) // size + 1)
+
+    def insert(self, sprite: pg.sprite.Sprite) -> None:
+        """
+        Puts a sprite into every cell its rect covers.
+        Args:
+        sprite (pg.sprite.Sprite): The sprite.
+        """
+        self.order[sprite] = len(self.order)
+        columns, rows = self.cell_range(sprite.rect)
+        for column in columns:
+            for row in rows:
+                self.cells.setdefault((column, row), []).append(sprite)
+
+    def query(self, rect: pg.Rect) -> list[pg.sprite.Sprite]:
+        """
+        Returns the sprites in the cells a rect covers, the candidates for a collision with it.
+        Args:
+        rect (pg.Rect): The rect.
+        Returns:
+        list[pg.sprite.Sprite]: The candidates in the order they were inserted.
+        """
+        columns, rows = self.cell_range(rect)
+        if len(columns) == 1 and len(rows) == 1:  # the most common case, e.g. for projectiles
+            return list(self.cells.get((columns[0], rows[0]), ()))
+        candidates: set[pg.sprite.Sprite] = set()
+        for column in columns:
+            for row in rows:
+                candidates.update(self.cells.get((column, row), ()))
+        return sorted(candidates, key=self.order.__getitem__)
+
+    def collide(self, sprite: pg.sprite.Sprite, collided: Callable[[pg.sprite.Sprite, pg.sprite.Sprite], bool] | None = None) -> list[pg.sprite.Sprite]:
+        """
+        Returns the sprites of the grid that collide with a sprite, like pg.sprite.spritecollide does for a group.
+        Only candidates whose rect overlaps the rect of the sprite reach the collided callback.
+        Sprites that were killed since they were inserted are skipped.
+        Args:
+        sprite (pg.sprite.Sprite): The sprite.
+        collided (Callable[[pg.sprite.Sprite, pg.sprite.Sprite], bool] | None): The narrowphase test, e.g. pg.sprite.collide_mask. Defaults to None (rects only).
+        Returns:
+        list[pg.sprite.Sprite]: The colliding sprites.
+        """
+        rect = sprite.rect
+        return [candidate for candidate in self.query(rect)
+                if rect.colliderect(candidate.rect) and candidate.alive() and (collided is None or collided(sprite, candidate))]
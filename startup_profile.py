@@ -0,0 +1,115 @@
+"""
+Startup profiler, enabled with: python main.py --startup-profile [file.json]
+It is imported first by main.py, so it can time the imports of the game modules.
+"""
+import builtins
+import json
+import platform
+import sys
+import threading
+from contextlib import contextmanager
+from time import perf_counter, strftime
+from typing import Iterator
+
+
+class StartupProfiler:
+    def __init__(self) -> None:
+        """ Collects the time of the startup phases, the entries with the same name add up. """
+        self.enabled: bool = False
+        self.start: float = perf_counter()
+        self.last_lap: float = self.start
+        self.times: dict[str, list[str | float]] = {}  # name -> [category, seconds]
+        self.lock: threading.Lock = threading.Lock()  # the asset loader adds times from its worker threads
+
+    def add(self, name: str, seconds: float, category: str) -> None:
+        """
+        Adds the time of a phase.
+        Args:
+        name (str): The name of the phase.
+        seconds (float): The time the phase took.
+        category (str): The category, e.g. 'import', 'init' or 'asset'.
+        """
+        if self.enabled:
+            with self.lock:
+                self.times.setdefault(name, [category, 0.0])[1] += seconds
+
+    def lap(self, name: str, category: str = "init") -> None:
+        """
+        Adds the time since the last lap (or since start_laps) as a phase.
+        Args:
+        name (str): The name of the phase.
+        category (str): The category. Defaults to 'init'.
+        """
+        now = perf_counter()
+        self.add(name, now - self.last_lap, category)
+        self.last_lap = now
+
+    def start_laps(self) -> None:
+        """ Starts the time of the next lap now. """
+        self.last_lap = perf_counter()
+
+    @contextmanager
+    def phase(self, name: str, category: str = "init") -> Iterator[None]:
+        """
+        Times the code inside of the with block as a phase.
+        Args:
+        name (str): The name of the phase.
+        category (str): The category. Defaults to 'init'.
+        """
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, perf_counter() - start, category)
+
+    def enable_import_timing(self) -> None:
+        """
+        Times every import the main module does (including the imports these modules do themselves),
+        so e.g. 'import enemy_creator' contains the whole 'from enemy import *' chain.
+        """
+        original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if globals is None or globals.get("__name__") != "__main__" or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+            start = perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                self.add(f"import {name}", perf_counter() - start, "import")
+
+        builtins.__import__ = timed_import
+
+    def report(self) -> str:
+        """
+        Returns the phases ranked by their time as a table.
+        Returns:
+        str: The table.
+        """
+        total = perf_counter() - self.start
+        lines = [f"{'phase':<48}{'category':<10}{'ms':>10}{'%':>7}"]
+        for name, (category, seconds) in sorted(self.times.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{name:<48}{category:<10}{seconds * 1000:>10.1f}{seconds * 100 / total:>7.1f}")
+        lines.append(f"{'total (process start to ready)':<58}{total * 1000:>10.1f}")
+        lines.append("asset times are summed over the loader threads, so they can add up to more than the wall time.")
+        return "\n".join(lines)
+
+    def write_json(self, file_path: str) -> None:
+        """
+        Writes the phases to a json file, to compare the startup of different builds.
+        Args:
+        file_path (str): The path of the json file.
+        """
+        import pygame as pg
+
+        data = {"timestamp": strftime("%Y-%m-%dT%H:%M:%S"), "python": platform.python_version(), "pygame": pg.version.ver,
+                "platform": platform.platform(), "total": perf_counter() - self.start,
+                "phases": [{"name": name, "category": category, "seconds": seconds} for name, (category, seconds) in self.times.items()]}
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+
+
+profiler = StartupProfiler()
+if "--startup-profile" in sys.argv:
+    profiler.enabled = True
+    profiler.enable_import_timing()
@@ -0,0 +1,82 @@
+import settings as stgs
+from atlas import build_sheets
+
+import pygame as pg
+from typing import Final
+
+
+class TextCache:
+    def __init__(self, font: pg.font.Font, color: tuple[int], max_size: int = stgs.TEXT_CACHE_SIZE) -> None:
+        """
+        Keeps rendered texts, so a text is only rendered again if it changed.
+        The oldest text is dropped when the cache is full.
+        Args:
+        font (pg.font.Font): The font.
+        color (tuple[int]): The text color.
+        max_size (int): The maximum number of cached texts.
+        """
+        self.font: pg.font.Font = font
+        self.color: tuple[int] = color
+        self.max_size: int = max_size
+        self.texts: dict[str, pg.Surface] = {}
+        self.renders: int = 0  # calls of font.render
+
+    def render(self, text: str) -> pg.Surface:
+        """
+        Returns the rendered (antialiased) text.
+        Args:
+        text (str): The text.
+        Returns:
+        pg.Surface: The rendered text.
+        """
+        surf: pg.Surface | None = self.texts.get(text)
+        if surf is None:
+            if len(self.texts) >= self.max_size:
+                del self.texts[next(iter(self.texts))]
+            surf = self.texts[text] = self.font.render(text, True, self.color)
+            self.renders += 1
+        return surf
+
+
+class GlyphAtlas:
+    GLYPHS: Final[str] = "0123456789.-/"
+
+    def __init__(self, font: pg.font.Font, color: tuple[int], text_cache: TextCache | None = None) -> None:
+        """
+        Renders the glyphs of numbers once into an atlas sheet, so changing numbers are composed
+        from the cached glyphs instead of being rendered by the font every time.
+        Args:
+        font (pg.font.Font): The font.
+        color (tuple[int]): The text color.
+        text_cache (TextCache | None): Renders texts with other characters. Defaults to a new cache for the font and color.
+        """
+        self.font: pg.font.Font = font
+        self.text_cache: TextCache = TextCache(font, color) if text_cache is None else text_cache
+        sources = build_sheets([font.render(glyph, True, color) for glyph in self.GLYPHS])
+        self.sheet: pg.Surface = sources[0][0]
+        self.glyph_rects: dict[str, pg.Rect] = {glyph: rect for glyph, (_, rect) in zip(self.GLYPHS, sources)}
+        self.advances: dict[str, int] = {glyph: metrics[4] for glyph, metrics in zip(self.GLYPHS, font.metrics(self.GLYPHS))}
+
+    def draw(self, surf: pg.Surface, text: str, pos: tuple[int, int]) -> pg.Rect:
+        """
+        Draws a text, it is composed from the glyphs if it only contains characters of the atlas.
+        The glyphs are placed at whole pixel advances, so the digits have a fixed width and a changing number doesn't jitter.
+        Args:
+        surf (pg.Surface): The surface to draw on.
+        text (str): The text, e.g. a number.
+        pos (tuple[int, int]): The top left position.
+        Returns:
+        pg.Rect: The drawn area.
+        """
+        if not all(char in self.glyph_rects for char in text):
+            return surf.blit(self.text_cache.render(text), pos)
+        x, y = pos
+        right: int = x
+        blit_sequence: list[tuple[pg.Surface, tuple[int, int], pg.Rect]] = []
+        for char in text:
+            rect = self.glyph_rects[char]
+            blit_sequence.append((self.sheet, (x, y), rect))
+            right = max(right, x + rect.width)  # a glyph can be wider than its advance
+            x += self.advances[char]
+        surf.blits(blit_sequence, doreturn=False)
+        return pg.Rect(pos, (right - pos[0], self.font.get_height())).clip(surf.get_rect())
@@ -1,15 +1,17 @@
 import settings as stgs
+from pool import Pooled
+from utils import get_mask
 
 import pygame as pg
-from random import randint
 from typing import Final, TypeVar
 
 Game = TypeVar("Game")
 
 
-class Upgrade(pg.sprite.Sprite):
+class Upgrade(Pooled, pg.sprite.Sprite):
     TRANSPARENT_BACKGROUND: Final[tuple[int]] = (0, 0, 0, 0)
     SPEED: Final[int] = 50
+    images: dict[tuple[int, int], pg.Surface] = {}  # (background number, upgrade number) -> image, shared by all upgrades
 
     def __init__(self, game: Game, pos: tuple[int]) -> None:
         """
@@ -19,15 +21,47 @@ class Upgrade(pg.sprite.Sprite):
         pos: The position of the upgrade.
         """
         super().__init__(game.upgrade_group)
-        background_number: int = randint(0, 6)
-        self.upgrade_number: int = randint(0, 10)
-        self.image: pg.Surface = pg.Surface((50, 50), pg.SRCALPHA)  # depends on the scale factor
-        self.image.fill(self.TRANSPARENT_BACKGROUND)
-        self.image.blit(game.assets["upgrade/background"][background_number], (0, 0))
-        self.image.blit(game.assets["upgrade/image"][int(self.upgrade_number)], (0, 0))
+        background_number: int = game.rng.fx.randint(0, 6)  # only the color
+        self.upgrade_number: int = game.rng.upgrades.randint(0, 10)
+        self.image: pg.Surface = self.get_image(game, background_number, self.upgrade_number)
         self.rect: pg.Rect = self.image.get_rect(center = pos)
         self.pos: pg.Vector2 = pg.Vector2(self.rect.topleft)
-        self.mask: pg.mask = pg.mask.from_surface(self.image)
+        self.mask: pg.mask.Mask = get_mask(self.image)
+
+    @classmethod
+    def get_image(cls, game: Game, background_number: int, upgrade_number: int) -> pg.Surface:
+        """
+        Returns the image of an upgrade, it is only put together once per background and upgrade.
+        Args:
+        game (Game): The game instance.
+        background_number (int): The number of the background.
+        upgrade_number (int): The number of the upgrade.
+        Returns:
+        pg.Surface: The image.
+        """
+        key = (background_number, upgrade_number)
+        if key not in cls.images:
+            image = pg.Surface((50, 50), pg.SRCALPHA)  # depends on the scale factor
+            image.fill(cls.TRANSPARENT_BACKGROUND)
+            image.blit(game.assets["upgrade/background"][background_number], (0, 0))
+            image.blit(game.assets["upgrade/image"][upgrade_number], (0, 0))
+            cls.images[key] = image
+        return cls.images[key]
+
+    def kill(self) -> None:
+        """ Removes the upgrade from its groups and puts it back into the pool. """
+        super().kill()
+        self.release_to_pool()
+
+    def remove_internal(self, group: pg.sprite.AbstractGroup) -> None:
+        """
+        Called by a group the upgrade is removed from, e.g. by empty(), it goes back into the pool when it is in no group anymore.
+        Args:
+        group (pg.sprite.AbstractGroup): The group.
+        """
+        super().remove_internal(group)
+        if not self.alive():
+            self.release_to_pool()
 
     def update(self, dt: float) -> None:
         """
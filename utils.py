@@ -1,8 +1,9 @@
 import settings as stgs
+from asset_cache import read_cached_image, write_cached_image
 
 import os
+import weakref
 import pygame as pg
-from random import randint
 from typing import Final, TypeVar
 
 Game = TypeVar("Game")
@@ -13,6 +14,29 @@ BASE_PATH: Final[str] = "images/"
 TRANSPARENT_BACKGROUND: Final[tuple[int]] = (0, 0, 0, 0)
 WHITE: Final[tuple[int]] = (247, 247, 247)
 
+mask_cache: dict[bool, weakref.WeakKeyDictionary] = {False: weakref.WeakKeyDictionary(), True: weakref.WeakKeyDictionary()}  # flip_x -> pg.Surface -> pg.mask.Mask
+transform_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # pg.Surface -> (angle, scale, flip_x) -> pg.Surface
+composite_cache: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()  # top pg.Surface -> (bottom pg.Surface, flip_x) -> pg.Surface
+
+def decode_image(file_path: str, scale_factor: float) -> pg.Surface:
+    """
+    Decode an image file and scale it by a factor, without converting it to the display format.
+    Doesn't touch the display, so it can run on a worker thread.
+    The scaled pixels are cached on disk, so a warm start neither decodes nor scales the image.
+    Args:
+    file_path (str): The path to the image file.
+    scale_factor (float): The factor by which to scale the image.
+    Returns:
+    pg.Surface: The decoded and scaled image.
+    """
+    cached_img: pg.Surface | None = read_cached_image(file_path, scale_factor, convert=False)
+    if cached_img is not None:
+        return cached_img
+    img: pg.Surface = pg.image.load(file_path)
+    img = pg.transform.scale(img, (img.get_width() * scale_factor, img.get_height() * scale_factor))
+    write_cached_image(file_path, scale_factor, img)
+    return img
+
 def load_image(path: str, imagename: str, scale_factor: float) -> pg.Surface:
     """
     Load an image from a file and scale it by a factor.
@@ -23,8 +47,7 @@ def load_image(path: str, imagename: str, scale_factor: float) -> pg.Surface:
     Returns:
     pg.Surface: The loaded and scaled image.
     """
-    img: pg.Surface = pg.image.load(BASE_PATH + path + "/" + imagename).convert_alpha()
-    return pg.transform.scale(img, (img.get_width() * scale_factor, img.get_height() * scale_factor))
+    return decode_image(BASE_PATH + path + "/" + imagename, scale_factor).convert_alpha()
 
 def load_images(path: str, scale_factor: float) -> list[pg.Surface]:
     """
@@ -41,6 +64,89 @@ def load_images(path: str, scale_factor: float) -> list[pg.Surface]:
         images.append(load_image(path + '/', img_name, scale_factor))
     return images
 
+def get_mask(img: pg.Surface, flip_x: bool = False) -> pg.mask.Mask:
+    """
+    Returns the collision mask of an image, it is only created once per image.
+    Args:
+    img (pg.Surface): The image.
+    flip_x (bool): Whether to return the mask of the horizontally flipped image. Defaults to False.
+    Returns:
+    pg.mask.Mask: The mask of the image.
+    """
+    mask: pg.mask.Mask | None = mask_cache[flip_x].get(img)
+    if mask is None:
+        mask = mask_cache[flip_x][img] = pg.mask.from_surface(pg.transform.flip(img, True, False) if flip_x else img)
+    return mask
+
+def get_transformed(img: pg.Surface, angle: int | float = 0, scale: float = 1, flip_x: bool = False) -> pg.Surface:
+    """
+    Returns a flipped, scaled and rotated (in this order) variant of an image, every variant is only created once per image.
+    Args:
+    img (pg.Surface): The image, a frame of an asset.
+    angle (int | float): The rotation in degrees counterclockwise, like pg.transform.rotate. Defaults to 0.
+    scale (float): The scale factor, the size is rounded down. Defaults to 1.
+    flip_x (bool): Whether to flip the image horizontally. Defaults to False.
+    Returns:
+    pg.Surface: The transformed image, the image itself if nothing is transformed.
+    """
+    if not angle and scale == 1 and not flip_x:
+        return img
+    variants: dict[tuple[int | float, float, bool], pg.Surface] = transform_cache.setdefault(img, {})
+    variant: pg.Surface | None = variants.get((angle, scale, flip_x))
+    if variant is None:
+        variant = pg.transform.flip(img, True, False) if flip_x else img
+        if scale != 1:
+            variant = pg.transform.scale(variant, (int(variant.get_width() * scale), int(variant.get_height() * scale)))
+        if angle:
+            variant = pg.transform.rotate(variant, angle)
+        variants[(angle, scale, flip_x)] = variant
+    return variant
+
+def get_composite(bottom: pg.Surface, top: pg.Surface, flip_x: bool = False) -> pg.Surface:
+    """
+    Returns an image with the top image blitted over the bottom image (maybe flipped horizontally afterwards),
+    every composite is only created once per pair of images.
+    Args:
+    bottom (pg.Surface): The bottom image, e.g. the weapon.
+    top (pg.Surface): The top image, e.g. the ship frame, the composite has its size.
+    flip_x (bool): Whether to flip the composite horizontally. Defaults to False.
+    Returns:
+    pg.Surface: The composite image.
+    """
+    composites: dict[tuple[pg.Surface, bool], pg.Surface] = composite_cache.setdefault(top, {})
+    composite: pg.Surface | None = composites.get((bottom, flip_x))
+    if composite is None:
+        composite = pg.Surface(top.get_size(), pg.SRCALPHA)
+        composite.fill(TRANSPARENT_BACKGROUND)
+        composite.blit(bottom, (0, 0))
+        composite.blit(top, (0, 0))
+        if flip_x:
+            composite = pg.transform.flip(composite, True, False)
+        composites[(bottom, flip_x)] = composite
+    return composite
+
+def cached_variants() -> list[pg.Surface]:
+    """
+    Returns every transformed and composite image that was created so far, e.g. after prewarming the frames.
+    Returns:
+    list[pg.Surface]: The cached images.
+    """
+    return ([variant for variants in list(transform_cache.values()) for variant in variants.values()]
+            + [composite for composites in list(composite_cache.values()) for composite in composites.values()])
+
+def coalesce_mouse_motion(events: list[pg.event.Event]) -> list[pg.event.Event]:
+    """
+    Drops every mouse motion event but the last one, the mouse position is all the game needs.
+    Args:
+    events (list[pg.event.Event]): The events.
+    Returns:
+    list[pg.event.Event]: The events without the outdated mouse motions.
+    """
+    motions = [index for index, event in enumerate(events) if event.type == pg.MOUSEMOTION]
+    if len(motions) < 2:
+        return events
+    return [event for index, event in enumerate(events) if event.type != pg.MOUSEMOTION or index == motions[-1]]
+
 def create_highscores_screen(font: pg.font.Font) -> tuple[pg.Surface, list[str]]:
     """
     Creates a highscores screen with the current highscores.
@@ -105,15 +211,17 @@ def sort_and_write_highscores(highscores_list: list[str], name: str, score: int)
 
 
 class Animation:
-    def __init__(self, image_list: list[pg.Surface], animation_duration: int | float, loop: bool = True) -> None:
+    def __init__(self, image_list: list[pg.Surface], animation_duration: int | float, loop: bool = True, mask_list: list[pg.mask.Mask] | None = None) -> None:
         """
         Initializes an animation object.
         Args:
         image_list (list[pg.Surface]): The list of images to animate.
         animation_duration (int | float): The duration of the animation in seconds.
         loop (bool): Whether the animation should loop or not. Defaults to True.
+        mask_list (list[pg.mask.Mask] | None): The masks of the images, they are created if not given. Defaults to None.
         """
         self.img_list: list[pg.Surface] = list(image_list)
+        self.mask_list: list[pg.mask.Mask] = mask_list if mask_list is not None else [get_mask(img) for img in self.img_list]
         self.anim_dur: int | float = animation_duration
         self.loop: bool = loop
         self.done: bool = False
@@ -127,7 +235,7 @@ class Animation:
         Returns:
         Animation_object: The copied animation object.
         """
-        return Animation(self.img_list, self.anim_dur, self.loop)
+        return Animation(self.img_list, self.anim_dur, self.loop, self.mask_list)
 
     def update(self, dt: float) -> None:
         """
@@ -155,6 +263,28 @@ class Animation:
             return self.img_list[self.current_frame]
         else:
             return None
+
+    def get_source(self) -> tuple[pg.Surface, pg.Rect] | None:
+        """
+        Gets the surface and the area of the current frame, e.g. for batched Surface.blits calls.
+        Returns:
+        tuple[pg.Surface, pg.Rect] | None: The current image and its whole area, or None if the animation is done.
+        """
+        img = self.get_img()
+        return None if img is None else (img, img.get_rect())
+
+    def get_mask(self, flip_x: bool = False) -> pg.mask.Mask | None:
+        """
+        Gets the collision mask of the current image of the animation.
+        Args:
+        flip_x (bool): Whether to return the mask of the horizontally flipped image. Defaults to False.
+        Returns:
+        pg.mask.Mask | None: The mask of the current image, or None if the animation is done
+        """
+        if 0 <= self.current_frame < len(self.mask_list):
+            return get_mask(self.img_list[self.current_frame], True) if flip_x else self.mask_list[self.current_frame]
+        else:
+            return None
         
 
 class Helpsite:
@@ -184,7 +314,7 @@ class Helpsite:
 
     def generate_background_numbers(self) -> None:
         """ Generate a list of 11 numbers from 0 to 6 for the upgrade background colors. """
-        self.background_numbers = [randint(0, 6) for _ in range(11)]
+        self.background_numbers = [self.game.rng.ui.randint(0, 6) for _ in range(11)]
 
     def draw_help_text(self) -> None:
         """ Opens the help_text.txt and draws its content on the help site surface. """
@@ -222,9 +352,13 @@ class Helpsite:
     def handle_upgrade_texts(self) -> None:
         """
         Gets the upgrade text number from the check_rect_collision-method,
-        loads it from self.text_list, renders it and blits the result to self.text_surf. 
+        loads it from self.text_list, renders it and blits the result to self.text_surf.
+        The text is only rendered again if the mouse moved to another upgrade.
         """
-        self.text_number = self.check_rect_collision()
+        text_number = self.check_rect_collision()
+        if text_number == self.text_number:
+            return
+        self.text_number = text_number
         self.text_surf.fill(self.TRANSPARENT_BACKGROUND)
         for i, line in enumerate(self.text_list[self.text_number]):
             line_to_blit = self.font.render(line, True, (247, 247, 247))
@@ -247,11 +381,8 @@ class Helpsite:
             self.text_list.append(help_list)
 
     def update(self) -> None:
-        """ Updates the help site. """
-        self.surface.fill(self.TRANSPARENT_BACKGROUND)
+        """ Updates the help site, the help text and the upgrades on self.surface are static and only drawn once. """
         self.handle_upgrade_texts()
-        self.draw_help_text()
-        self.draw_upgrades()
 
     def render(self, surf: pg.Surface) -> None:
         """
@@ -259,10 +390,20 @@ class Helpsite:
         Args:
         surf: The surface to render the help site to.
         """ 
-        if self.text_number != -1:
-            if self.mouse_pos[0] + self.text_surf.get_width() > stgs.MAIN_WINDOW_RESOLUTION[0]:
-                
-                self.mouse_pos = (stgs.MAIN_WINDOW_RESOLUTION[0] - self.text_surf.get_width(), self.mouse_pos[1])
-            self.surface.blit(self.text_surf, self.mouse_pos)
         surf.blit(self.surface, (0, 0))
+        self.render_upgrade_text(surf)
+
+    def render_upgrade_text(self, surf: pg.Surface) -> list[pg.Rect]:
+        """
+        Renders the text of the upgrade under the mouse to the given surface.
+        Args:
+        surf: The surface to render the text to.
+        Returns:
+        list[pg.Rect]: The drawn area, empty if the mouse isn't over an upgrade.
+        """
+        if self.text_number == -1:
+            return []
+        if self.mouse_pos[0] + self.text_surf.get_width() > stgs.MAIN_WINDOW_RESOLUTION[0]:
+            self.mouse_pos = (stgs.MAIN_WINDOW_RESOLUTION[0] - self.text_surf.get_width(), self.mouse_pos[1])
+        return [surf.blit(self.text_surf, self.mouse_pos)]
         
\ No newline at end of file